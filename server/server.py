@@ -1,24 +1,40 @@
 #!/usr/bin/env python3
 
+import collections
+import concurrent.futures
+import ctypes
+import ctypes.util
+import gzip
+import hashlib
+import http.client
+import json
 import os
+import re
+import shutil
 import signal
 import socket
+import sqlite3
+import struct
 import subprocess
 import sys
 import threading
 import time
 from datetime import datetime
+from urllib.parse import urljoin, urlsplit
 
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, Response, jsonify, render_template, request
 
 app = Flask(__name__)
 
+# Static assets are served with a content-hash query string (see STATIC_VERSION),
+# so browsers can cache them long-term and revalidate with ETags
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
+
 # Repository path (set by start_server.sh)
 REPO_DIR = os.environ.get("REPO_DIR", "/workspace/runpod-ggs")
 
-# User process log file for streaming tool startup logs
-USER_LOG_FILE = "/tmp/comfystudio_user_log.txt"
-user_process_running = False
+# Tool session logs, one file per tool and artist (see Session.log_path)
+SESSION_LOG_DIR = "/tmp/comfystudio-sessions"
 
 
 def parse_users_from_script():
@@ -99,14 +115,15 @@ def get_setup_script(tool_id, script_type):
     return None
 
 
-def parse_model_destinations(script_path):
+def parse_model_downloads(script_path):
     """
-    Parse a download script to extract destination model filenames.
-    Returns list of full destination file paths.
+    Parse a download script to extract model downloads.
+    Returns list of dicts with 'url' (None if not found on the same command)
+    and 'dest' (destination file path, as written in the script).
     """
     import re
 
-    destinations = []
+    downloads = []
     try:
         with open(script_path, "r") as f:
             content = f.read()
@@ -128,6 +145,10 @@ def parse_model_destinations(script_path):
         for line in joined_lines:
             line_stripped = line.strip()
 
+            # Skip commented-out commands
+            if line_stripped.startswith("#"):
+                continue
+
             # Track cd commands to know current directory
             # Match: cd "$MODELS_DIR/subdir" or cd /workspace/models/subdir
             cd_match = re.match(r'cd\s+["\']?([^"\';\s]+)["\']?', line_stripped)
@@ -139,59 +160,352 @@ def parse_model_destinations(script_path):
                 current_dir = cd_path
                 continue
 
+            url_match = re.search(r'(https?://[^"\'\s]+)', line_stripped)
+            url = url_match.group(1) if url_match else None
+
             # Pattern 1: -O filename (wget) - just filename, need to combine with current_dir
+            # The extension must end the name (or precede .incomplete), so .pth
+            # isn't cut short to .pt
             o_match = re.search(
-                r"-[Oo]\s+([^\s\\]+\.(?:safetensors|gguf|bin|pt|pth|ckpt))",
+                r"-[Oo]\s+([^\s\\]+\.(?:safetensors|gguf|bin|pth|pt|ckpt))"
+                r"(?=\.incomplete\b|\s|\"|$)",
                 line_stripped,
             )
             if o_match:
                 filename = o_match.group(1)
                 if current_dir and not filename.startswith("/"):
-                    destinations.append(os.path.join(current_dir, filename))
+                    dest = os.path.join(current_dir, filename)
                 else:
-                    destinations.append(filename)
+                    dest = filename
+                downloads.append({"url": url, "dest": dest})
                 continue
 
             # Pattern 2: download "url" "dest" function calls (full path in dest)
-            dl_match = re.search(r'download\s+"[^"]+"\s+"([^"]+)"', line_stripped)
+            dl_match = re.search(r'download\s+"([^"]+)"\s+"([^"]+)"', line_stripped)
             if dl_match:
-                dest = dl_match.group(1)
+                dest = dl_match.group(2)
                 if any(
                     ext in dest
                     for ext in [".safetensors", ".gguf", ".bin", ".pt", ".pth", ".ckpt"]
                 ):
-                    destinations.append(dest)
+                    downloads.append({"url": dl_match.group(1), "dest": dest})
 
     except Exception as e:
         print(f"Error parsing script {script_path}: {e}")
 
+    return downloads
+
+
+def parse_model_destinations(script_path):
+    """
+    Parse a download script to extract destination model filenames.
+    Returns list of full destination file paths.
+    """
+    return [download["dest"] for download in parse_model_downloads(script_path)]
+
+
+# Filesystem inventory cache. Parsed destinations are kept per download script
+# and only re-parsed when the script's mtime changes. Presence of model files,
+# custom node directories and tool installs is tracked in memory, since every
+# stat on the /workspace network volume is a slow remote metadata call. An
+# inotify watcher applies changes as they happen; a background thread also
+# re-scans periodically, which is the only update path without inotify.
+INVENTORY_REFRESH_INTERVAL = 60  # Seconds between background rescans
+CUSTOM_NODES_DIR = "/workspace/ComfyUI/custom_nodes"
+model_inventory = {}  # {script_path: {"mtime": float, "destinations": [full_path]}}
+model_presence = {}  # {full_path: bool}
+custom_node_dirs = None  # Directory names in CUSTOM_NODES_DIR (None until scanned)
+install_presence = {}  # {install_path: bool}
+inventory_version = 0  # Bumped whenever any tracked presence changes
+inventory_lock = threading.Lock()
+inventory_wakeup = threading.Event()
+
+
+def normalize_model_path(dest):
+    """Resolve a destination parsed from a download script to an absolute path"""
+    if dest.startswith("/"):
+        return dest
+    # Relative paths (e.g. ComfyUI/models/...) are relative to /workspace
+    return os.path.join("/workspace", dest)
+
+
+def get_script_destinations(script_path):
+    """
+    Get the normalized destination paths for a download script.
+    Uses the cached parse unless the script changed since it was last read.
+    """
+    try:
+        mtime = os.path.getmtime(script_path)
+    except OSError:
+        return []
+
+    with inventory_lock:
+        cached = model_inventory.get(script_path)
+        if cached and cached["mtime"] == mtime:
+            return cached["destinations"]
+
+    destinations = [
+        normalize_model_path(d) for d in parse_model_destinations(script_path)
+    ]
+    with inventory_lock:
+        model_inventory[script_path] = {"mtime": mtime, "destinations": destinations}
     return destinations
 
 
+def update_presence(index, updates):
+    """Apply {key: present} updates to a presence index, bumping the version on change"""
+    global inventory_version
+    with inventory_lock:
+        version = inventory_version
+        for key, present in updates.items():
+            if index.get(key) != present:
+                index[key] = present
+                inventory_version += 1
+        changed = inventory_version != version
+    if changed:
+        notify_dashboard()
+
+
 def check_models_installed(destinations):
     """
     Check how many model files from a script are installed.
+    Answers from the in-memory presence index; paths not seen before are
+    stat'ed once and then kept up to date by the watcher and refresher.
     Returns tuple of (installed_count, total_count).
     """
     if not destinations:
         return (0, 0)
 
-    installed = 0
-    for dest in destinations:
-        # Normalize paths
-        if dest.startswith("/"):
-            full_path = dest
-        elif dest.startswith("ComfyUI/"):
-            full_path = os.path.join("/workspace", dest)
-        else:
-            full_path = os.path.join("/workspace", dest)
+    with inventory_lock:
+        unknown = [p for p in destinations if p not in model_presence]
+    if unknown:
+        update_presence(model_presence, {p: os.path.exists(p) for p in unknown})
 
-        if os.path.exists(full_path):
-            installed += 1
+    with inventory_lock:
+        installed = sum(1 for p in destinations if model_presence.get(p))
 
     return (installed, len(destinations))
 
 
+def scan_custom_node_dirs():
+    """List installed custom node directories (one listdir instead of a stat per node)"""
+    global custom_node_dirs, inventory_version
+    try:
+        names = {
+            name
+            for name in os.listdir(CUSTOM_NODES_DIR)
+            if os.path.isdir(os.path.join(CUSTOM_NODES_DIR, name))
+        }
+    except OSError:
+        names = set()
+
+    with inventory_lock:
+        changed = names != custom_node_dirs
+        if changed:
+            custom_node_dirs = names
+            inventory_version += 1
+    if changed:
+        notify_dashboard()
+    return names
+
+
+def is_custom_node_installed(repo_name):
+    """Check whether a custom node directory exists, using the cached listing"""
+    with inventory_lock:
+        names = custom_node_dirs
+    if names is None:
+        names = scan_custom_node_dirs()
+    return repo_name in names
+
+
+def refresh_inventory():
+    """Re-check presence of every tracked model file, custom node and tool install"""
+    with inventory_lock:
+        model_paths = {
+            p for entry in model_inventory.values() for p in entry["destinations"]
+        }
+        model_paths.update(model_presence)
+        install_paths = list(install_presence)
+
+    update_presence(model_presence, {p: os.path.exists(p) for p in model_paths})
+    update_presence(install_presence, {p: os.path.isdir(p) for p in install_paths})
+    scan_custom_node_dirs()
+
+
+def inventory_worker():
+    """Background thread keeping the inventory fresh"""
+    while True:
+        try:
+            get_download_scripts()  # Picks up new or edited scripts
+            refresh_inventory()
+            sync_inotify_watches()  # Watch directories of newly parsed scripts
+        except Exception as e:
+            print(f"Error refreshing inventory: {e}")
+        inventory_wakeup.wait(INVENTORY_REFRESH_INTERVAL)
+        inventory_wakeup.clear()
+
+
+def request_inventory_refresh():
+    """Wake the background refresher, e.g. after a download finishes"""
+    inventory_wakeup.set()
+
+
+# inotify(7) event flags
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+INOTIFY_WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+inotify_libc = None
+inotify_fd = None
+inotify_watches = {}  # {wd: directory}
+inotify_lock = threading.Lock()
+
+
+def get_watch_targets():
+    """Directories whose entries the inventory tracks"""
+    with inventory_lock:
+        targets = {
+            os.path.dirname(p)
+            for entry in model_inventory.values()
+            for p in entry["destinations"]
+        }
+    targets.add(CUSTOM_NODES_DIR)
+    for tool in TOOLS.values():
+        if tool.get("install_path"):
+            targets.add(os.path.dirname(tool["install_path"]))
+    return targets
+
+
+def sync_inotify_watches():
+    """
+    Add inotify watches for every target directory. Targets that don't exist
+    yet are covered by watching their nearest existing ancestor, so their
+    creation triggers another sync.
+    """
+    if inotify_fd is None:
+        return
+
+    with inotify_lock:
+        watched = set(inotify_watches.values())
+        for target in get_watch_targets():
+            path = target
+            while path != "/" and not os.path.isdir(path):
+                path = os.path.dirname(path)
+            if path in watched:
+                continue
+            wd = inotify_libc.inotify_add_watch(
+                inotify_fd, os.fsencode(path), INOTIFY_WATCH_MASK
+            )
+            if wd >= 0:
+                inotify_watches[wd] = path
+                watched.add(path)
+
+
+def handle_inotify_event(path, mask):
+    """Apply a single inotify event to the in-memory inventory"""
+    global inventory_version
+    present = not mask & (IN_DELETE | IN_MOVED_FROM)
+
+    with inventory_lock:
+        tracked_model = path in model_presence
+        tracked_install = path in install_presence
+    if tracked_model:
+        update_presence(model_presence, {path: present})
+    if tracked_install:
+        update_presence(install_presence, {path: present})
+
+    if mask & IN_ISDIR and os.path.dirname(path) == CUSTOM_NODES_DIR:
+        name = os.path.basename(path)
+        with inventory_lock:
+            if custom_node_dirs is not None and (name in custom_node_dirs) != present:
+                if present:
+                    custom_node_dirs.add(name)
+                else:
+                    custom_node_dirs.discard(name)
+                inventory_version += 1
+                notify_dashboard()
+
+    # A new directory may be (an ancestor of) a directory we need to watch
+    if mask & IN_ISDIR and present:
+        if any(t == path or t.startswith(path + "/") for t in get_watch_targets()):
+            sync_inotify_watches()
+            request_inventory_refresh()
+
+
+def inotify_watcher():
+    """Background thread reading inotify events"""
+    while True:
+        try:
+            data = os.read(inotify_fd, 64 * 1024)
+        except OSError as e:
+            print(f"inotify watcher stopped: {e}")
+            return
+
+        pos = 0
+        while pos + INOTIFY_EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = INOTIFY_EVENT_HEADER.unpack_from(data, pos)
+            pos += INOTIFY_EVENT_HEADER.size
+            name = data[pos : pos + length].rstrip(b"\0")
+            pos += length
+
+            try:
+                if mask & IN_Q_OVERFLOW:
+                    request_inventory_refresh()
+                elif mask & IN_IGNORED:
+                    # Watched directory was removed; re-anchor and rescan
+                    with inotify_lock:
+                        inotify_watches.pop(wd, None)
+                    sync_inotify_watches()
+                    request_inventory_refresh()
+                elif name:
+                    with inotify_lock:
+                        directory = inotify_watches.get(wd)
+                    if directory:
+                        handle_inotify_event(
+                            os.path.join(directory, os.fsdecode(name)), mask
+                        )
+            except Exception as e:
+                print(f"Error handling inotify event: {e}")
+
+
+def start_inventory_watcher():
+    """Start the inventory refresher and, where supported, the inotify watcher"""
+    global inotify_libc, inotify_fd
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd >= 0:
+            inotify_libc, inotify_fd = libc, fd
+    except (OSError, AttributeError):
+        pass
+
+    if inotify_fd is not None:
+        sync_inotify_watches()
+        threading.Thread(target=inotify_watcher, daemon=True).start()
+    else:
+        print("inotify unavailable, falling back to periodic inventory scans")
+
+    threading.Thread(target=inventory_worker, daemon=True).start()
+
+
 def get_download_scripts():
     """
     Scan setup/download-models/ directory and return available download scripts.
@@ -215,7 +529,7 @@ def get_download_scripts():
                 name = name.title()
 
                 script_path = os.path.join(download_dir, filename)
-                destinations = parse_model_destinations(script_path)
+                destinations = get_script_destinations(script_path)
                 installed, total = check_models_installed(destinations)
 
                 scripts.append(
@@ -243,7 +557,6 @@ def get_custom_nodes():
     """
     nodes = []
     nodes_config = os.path.join(REPO_DIR, "setup", "custom-nodes", "nodes.txt")
-    custom_nodes_dir = "/workspace/ComfyUI/custom_nodes"
 
     if not os.path.exists(nodes_config):
         return nodes
@@ -259,14 +572,13 @@ def get_custom_nodes():
                 repo_url = line
                 # Extract repo name from URL
                 repo_name = os.path.basename(repo_url.replace(".git", ""))
-                node_path = os.path.join(custom_nodes_dir, repo_name)
 
                 nodes.append(
                     {
                         "name": repo_name,
                         "repo_url": repo_url,
                         "repo_name": repo_name,
-                        "installed": os.path.isdir(node_path),
+                        "installed": is_custom_node_installed(repo_name),
                     }
                 )
     except Exception as e:
@@ -277,35 +589,70 @@ def get_custom_nodes():
     return nodes
 
 
-# Tool configuration
+# Tool configuration. Every tool is launched and supervised the same way from
+# its entry: command (default: bash setup/<tool>/start_<tool>.sh), cwd, env
+# and make_dirs ({artist} and {repo_dir} are filled in), the port freed before
+# launch, health_path probed for readiness, restart policy ("never",
+# "on-failure" or "always", see below) and log (False discards output instead
+# of capturing it in the session log). A new tool needs no new code.
 TOOLS = {
     "ai-toolkit": {
         "name": "AI-Toolkit",
         "port": 8675,
+        "health_path": "/",
+        "cwd": "/workspace/ai-toolkit",
+        "restart": "on-failure",
         "install_path": "/workspace/ai-toolkit",
         "admin_only": False,
     },
     "lora-tool": {
         "name": "LoRA-Tool",
         "port": 3000,
+        "health_path": "/",
+        "cwd": "{repo_dir}/setup/lora-tool",
         "install_path": None,  # Runs directly from repo, no install needed
         "admin_only": False,
     },
     "swarm-ui": {
         "name": "SwarmUI",
         "port": 7861,
+        "health_path": "/",
+        "cwd": "/workspace/SwarmUI",
+        "restart": "on-failure",
         "install_path": "/workspace/SwarmUI",
         "admin_only": False,
     },
     "comfy-ui": {
         "name": "ComfyUI",
         "port": 8188,
+        "health_path": "/system_stats",
+        "cwd": "/workspace/ComfyUI",
+        "restart": "on-failure",
+        "env": {
+            "HF_HOME": "/workspace",
+            "HF_HUB_ENABLE_HF_TRANSFER": "1",
+            "COMFY_OUTPUT_DIR": "/workspace/ComfyUI/output/{artist}",
+        },
+        "make_dirs": ["/workspace/ComfyUI/output/{artist}"],
         "install_path": "/workspace/ComfyUI",
         "admin_only": False,
     },
     "jupyter-lab": {
         "name": "JupyterLab",
         "port": 8888,
+        "health_path": "/api",
+        "command": [
+            "jupyter",
+            "lab",
+            "--ip=0.0.0.0",
+            "--port=8888",
+            "--no-browser",
+            "--allow-root",
+            "--NotebookApp.token=",
+            "--NotebookApp.password=",
+        ],
+        "cwd": "/workspace",
+        "restart": "on-failure",
         "install_path": None,  # Always available (part of base image)
         "admin_only": False,
         "user_only": True,  # Only show in user mode, not admin mode
@@ -313,1996 +660,1755 @@ TOOLS = {
 }
 
 # Global state
-active_sessions = {}  # {tool_id: {"process": proc, "start_time": datetime, "artist": name}}
-current_artist = None
-admin_mode = False
-LOG_FILE = "/tmp/comfystudio.log"
-running_process = None  # Track the currently running admin process
-
-# HTML Template
-HTML_TEMPLATE = r"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>ComfyStudio</title>
-    <style>
-        * { box-sizing: border-box; margin: 0; padding: 0; }
-
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            padding: 20px;
-        }
-
-        .container {
-            background: white;
-            padding: 2.5rem;
-            border-radius: 20px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-            max-width: 450px;
-            width: 100%;
-        }
-
-        .header {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 12px;
-            margin-bottom: 1.5rem;
-        }
+active_sessions = {}  # {tool_id: Session}
+
+# Shared dashboard state (current artist, admin mode) lives in SQLite in WAL
+# mode instead of module globals: every server thread (and any other process)
+# sees the same values, readers never block the writer, and it survives a
+# restart of the dashboard. Kept on local disk, as SQLite locking isn't safe
+# on the network volume.
+STATE_DB = os.environ.get("STATE_DB", "/tmp/comfystudio/state.db")
+state_local = threading.local()  # One connection per thread
+
+
+def get_state_db():
+    """This thread's connection to the state database"""
+    conn = getattr(state_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(STATE_DB), exist_ok=True)
+        conn = sqlite3.connect(STATE_DB, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions"
+            " (tool_id TEXT PRIMARY KEY, id TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        state_local.conn = conn
+    return conn
 
-        .logo {
-            width: 40px;
-            height: 40px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 8px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-            font-size: 18px;
-        }
 
-        h1 {
-            color: #333;
-            font-size: 1.8rem;
-            font-weight: 600;
-        }
+def get_state(key, default=None):
+    row = (
+        get_state_db()
+        .execute("SELECT value FROM state WHERE key = ?", (key,))
+        .fetchone()
+    )
+    return json.loads(row[0]) if row else default
 
-        .profile-row {
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 1.5rem;
-        }
 
-        .profile-select {
-            flex: 1;
-            min-width: 0;
-            max-width: calc(100% - 60px);
-            padding: 12px 16px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            font-size: 15px;
-            background: white;
-            cursor: pointer;
-            transition: border-color 0.2s;
-        }
+def set_state(key, value):
+    get_state_db().execute(
+        "INSERT INTO state (key, value) VALUES (?, ?)"
+        " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, json.dumps(value)),
+    )
+    notify_dashboard()
 
-        .profile-select:focus {
-            outline: none;
-            border-color: #667eea;
-        }
 
-        .admin-toggle {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            visibility: hidden;
-            flex-shrink: 0;
-        }
+def get_current_artist():
+    return get_state("current_artist")
 
-        .admin-toggle.visible {
-            visibility: visible;
-        }
 
-        .toggle-switch {
-            position: relative;
-            width: 44px;
-            height: 24px;
-        }
+def get_admin_mode():
+    return get_state("admin_mode", False)
 
-        .toggle-switch input {
-            opacity: 0;
-            width: 0;
-            height: 0;
-        }
 
-        .toggle-slider {
-            position: absolute;
-            cursor: pointer;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background-color: #ccc;
-            transition: 0.3s;
-            border-radius: 24px;
-        }
+def get_static_version():
+    """Fingerprint static assets so their URLs change whenever their content does"""
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(app.static_folder)):
+        with open(os.path.join(app.static_folder, filename), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
 
-        .toggle-slider:before {
-            position: absolute;
-            content: "";
-            height: 18px;
-            width: 18px;
-            left: 3px;
-            bottom: 3px;
-            background-color: white;
-            transition: 0.3s;
-            border-radius: 50%;
-        }
 
-        input:checked + .toggle-slider {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        }
+STATIC_VERSION = get_static_version()
 
-        input:checked + .toggle-slider:before {
-            transform: translateX(20px);
-        }
+# Compile the dashboard template once at startup; Jinja keeps it cached and,
+# outside debug mode, never re-checks the file on later renders
+app.jinja_env.get_template("index.html")
 
-        .tools-list {
-            display: flex;
-            flex-direction: column;
-            gap: 10px;
-        }
+# Incremental log reads: max bytes returned per poll. Every job and session log
+# is a LogStore: a ring buffer of its newest LOG_BUFFER_BYTES, addressed by
+# byte offset, so reads never touch the disk and memory stays bounded during
+# chatty installs. Each log is also written to its file, which is rotated to
+# gzip-compressed backups past LOG_FILE_MAX_BYTES. A per-log generation
+# counter is bumped whenever a log is reset so clients can detect rotation.
+LOG_CHUNK_SIZE = 256 * 1024
+LOG_BUFFER_BYTES = 1024 * 1024
+LOG_FILE_MAX_BYTES = 16 * 1024 * 1024
+LOG_FILE_BACKUPS = 3  # Compressed rotations kept per log, .1.gz the newest
+LOG_DRAIN_TIMEOUT = 5  # Seconds to wait for piped output when a log is closed
+LOG_FOLLOW_INTERVAL = 0.25  # Seconds between checks of a followed log file
+log_stores = {}  # {path: LogStore}
+log_stores_lock = threading.Lock()
 
-        .tool-row {
-            display: flex;
-            gap: 10px;
-            align-items: center;
-        }
+# Server-Sent Events log streaming
+STREAM_POLL_INTERVAL = 0.25  # Seconds between log file checks
+STREAM_HEARTBEAT_INTERVAL = 15  # Keep proxies from closing idle streams
 
-        .tool-btn {
-            flex: 1;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            padding: 14px 18px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            background: white;
-            cursor: pointer;
-            transition: all 0.2s;
-            font-size: 15px;
-            font-weight: 500;
-            color: #333;
-        }
 
-        .tool-btn:hover {
-            border-color: #667eea;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(102, 126, 234, 0.2);
-        }
+def get_runpod_id():
+    """Get RunPod instance ID from environment"""
+    return os.environ.get("RUNPOD_POD_ID", "localhost")
 
-        .tool-btn.active {
-            background: linear-gradient(135deg, #4ade80 0%, #22c55e 100%);
-            border-color: #22c55e;
-            color: white;
-            cursor: pointer;
-        }
 
-        .tool-btn.starting {
-            background: linear-gradient(135deg, #fbbf24 0%, #f59e0b 100%);
-            border-color: #f59e0b;
-            color: white;
-            cursor: not-allowed;
-            pointer-events: none;
-        }
+def is_installed(path):
+    """Check if a tool is installed by checking directory existence (cached)"""
+    if path is None:
+        return True
+    with inventory_lock:
+        present = install_presence.get(path)
+    if present is None:
+        present = os.path.isdir(path)
+        update_presence(install_presence, {path: present})
+    return present
 
-        .tool-btn:disabled {
-            cursor: not-allowed;
-            opacity: 0.8;
-        }
 
-        .tool-btn.active:hover {
-            border-color: #16a34a;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(34, 197, 94, 0.3);
-        }
+def get_all_users():
+    """Get list of users for dropdown from artist_names.sh"""
+    return sorted(USERS)
 
-        .tool-btn.starting:hover {
-            transform: none;
-            box-shadow: none;
-        }
 
-        .tool-info {
-            display: flex;
-            align-items: center;
-            gap: 10px;
+@app.route("/debug")
+def debug():
+    """Debug endpoint to check parsed users and admins"""
+    current_artist = get_current_artist()
+    return jsonify(
+        {
+            "USERS": USERS,
+            "ADMINS": ADMINS,
+            "REPO_DIR": REPO_DIR,
+            "current_artist": current_artist,
+            "is_current_admin": is_admin(current_artist) if current_artist else None,
+            "state_db": STATE_DB,
         }
+    )
 
-        .tool-timer {
-            font-size: 13px;
-            opacity: 0.9;
-            font-family: monospace;
-        }
 
-        .tool-stop-btn {
-            padding: 10px 20px;
-            border: 2px solid #ef4444;
-            border-radius: 10px;
-            background: white;
-            color: #ef4444;
-            font-size: 14px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.2s;
-            white-space: nowrap;
-        }
+@app.route("/")
+def index():
+    artists = get_all_users()
+    with session_cond:
+        sessions = list(active_sessions.items())
+    return render_template(
+        "index.html",
+        static_version=STATIC_VERSION,
+        artists=artists,
+        admins=ADMINS,
+        tools=TOOLS,
+        current_artist=get_current_artist(),
+        admin_mode=get_admin_mode(),
+        active_sessions={
+            k: {"start_time": v.start_time.isoformat() + "Z", "state": v.state}
+            for k, v in sessions
+            if v.state != "failed"
+        },
+        runpod_id=get_runpod_id(),
+        is_installed=is_installed,
+        download_scripts=get_download_scripts(),
+        custom_nodes=get_custom_nodes(),
+    )
 
-        .tool-stop-btn:hover {
-            background: #ef4444;
-            color: white;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(239, 68, 68, 0.3);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 14px;
-            transition: background 0.2s;
-        }
 
-        .tool-stop:hover {
-            background: rgba(255,255,255,0.5);
-        }
+@app.route("/set_artist", methods=["POST"])
+def set_artist():
+    data = request.get_json()
+    current_artist = data.get("artist", "")
+    set_state("current_artist", current_artist)
 
-        .admin-tool-row {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
+    # Reset admin mode if not an admin
+    if not is_admin(current_artist):
+        set_state("admin_mode", False)
 
-        .admin-tool-btn {
-            flex: 1;
-            padding: 14px 18px;
-            border: 2px solid #f59e0b;
-            border-radius: 10px;
-            background: #fffbeb;
-            cursor: pointer;
-            transition: all 0.2s;
-            font-size: 15px;
-            font-weight: 500;
-            color: #92400e;
-        }
+    return jsonify({"success": True})
 
-        .admin-tool-btn:hover {
-            background: #fef3c7;
-            transform: translateY(-2px);
-        }
 
-        .admin-tool-btn.update {
-            border-color: #667eea;
-            background: #eef2ff;
-            color: #4338ca;
-        }
+@app.route("/set_admin_mode", methods=["POST"])
+def set_admin_mode():
+    data = request.get_json()
 
-        .admin-tool-btn.update:hover {
-            background: #e0e7ff;
-        }
+    # Only allow admin mode for admins
+    if is_admin(get_current_artist()):
+        set_state("admin_mode", bool(data.get("admin_mode", False)))
 
-        .admin-tool-btn:disabled {
-            opacity: 0.5;
-            cursor: not-allowed;
-            transform: none;
-        }
+    return jsonify({"success": True})
 
-        .admin-tool-btn:disabled:hover {
-            background: #fffbeb;
-            transform: none;
-        }
 
-        .admin-checkbox {
-            width: 22px;
-            height: 22px;
-            cursor: pointer;
-            accent-color: #667eea;
-        }
+# Tool sessions. /start_session returns straight away with a session id; the
+# launch runs on a short-lived thread. A single supervisor thread then watches
+# every session: it probes each starting tool's health URL with exponential
+# backoff and notices when a process exits. A session goes from starting to
+# ready, or to failed when the launch errors, the process exits or the tool
+# never answers. /tool_status and the user log stream report that state
+# instead of probing the port on every request. Each session has its own
+# state and log file (per tool and artist), so several tools can run side by
+# side without one launch truncating another's output.
+#
+# When a process exits unexpectedly, the tool's restart policy decides what
+# happens: "never" (the default) marks the session failed, "on-failure"
+# relaunches it after a non-zero exit and "always" after any exit. Restarts
+# back off exponentially; a tool that keeps crashing soon after launch is a
+# crash loop and is given up on.
+SESSION_PROBE_INITIAL = 0.25  # Seconds before the second probe, doubled after each miss
+SESSION_PROBE_MAX = 2  # Longest wait between probes
+SESSION_PROBE_TIMEOUT = 2  # Seconds per health check request
+SESSION_READY_TIMEOUT = 900  # First starts (model loading, Next.js builds) can be slow
+SESSION_SUPERVISOR_INTERVAL = 0.5  # Seconds between checks for exited processes
+RESTART_BACKOFF_INITIAL = 2  # Seconds before the first restart, doubled each time
+RESTART_BACKOFF_MAX = 120
+RESTART_STABLE_AFTER = 600  # A process that ran this long resets the backoff
+RESTART_LOOP_LIMIT = 5  # Restarts within RESTART_LOOP_WINDOW that count as a crash loop
+RESTART_LOOP_WINDOW = 900
+# What SIGTERM does to running tools: "detach" leaves them running for the
+# next server to reattach (a control plane upgrade), "stop" terminates them.
+# SIGINT, or a second signal during shutdown, always stops them.
+SHUTDOWN_MODE = os.environ.get("SHUTDOWN_MODE", "detach")
+RESTART_EXIT_CODE = (
+    75  # Exit status after detaching; start_server.sh syncs and restarts
+)
+session_cond = threading.Condition()  # Notified on every session state change
+supervised_sessions = []  # Sessions with a live process or a pending restart
+session_supervisor = None
+
+
+class Session:
+    """A launched tool: state is starting, ready, restarting, failed or stopped"""
+
+    def __init__(self, tool_id, artist):
+        self.id = os.urandom(4).hex()
+        self.tool_id = tool_id
+        self.artist = artist
+        self.process = None
+        self.state = "starting"
+        self.error = None
+        self.start_time = datetime.utcnow()
+        self.started = time.time()
+        self.process_started = None  # When the current process was launched
+        self.pid_start = (
+            None  # Process start time in clock ticks, tells a reused pid apart
+        )
+        self.probe_deadline = None
+        self.ready_after = None  # Seconds from launch to the first healthy probe
+        self.restarts = 0
+        self.restart_times = collections.deque(maxlen=RESTART_LOOP_LIMIT)
+        self.restart_delay = RESTART_BACKOFF_INITIAL
+        self.restart_at = None
+        self.timed_out = False
+        artist_key = re.sub(r"[^A-Za-z0-9_.-]+", "_", artist).strip("_") or "artist"
+        self.log_path = os.path.join(SESSION_LOG_DIR, f"{tool_id}-{artist_key}.log")
+        self.next_probe = 0
+        self.probe_delay = SESSION_PROBE_INITIAL
+        self.exit_handled = False
+
+    def poll(self):
+        """Exit code once the process has exited and its footer is written"""
+        return self.process.returncode if self.exit_handled else None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "tool_id": self.tool_id,
+            "artist": self.artist,
+            "state": self.state,
+            "running": self.process is not None and not self.exit_handled,
+            "error": self.error,
+            "started": self.started,
+            "ready_after": self.ready_after,
+            "uptime": self.get_uptime(),
+            "restarts": self.restarts,
+            "restart_at": self.restart_at,
+            "exit_code": self.process.poll() if self.process else None,
+        }
+
+    def to_record(self):
+        """What the session registry keeps to reattach after a server restart"""
+        return {
+            "id": self.id,
+            "tool_id": self.tool_id,
+            "artist": self.artist,
+            "pid": self.process.pid if self.process else None,
+            "pid_start": self.pid_start,
+            "port": TOOLS[self.tool_id]["port"],
+            "start_time": self.start_time.isoformat(),
+            "started": self.started,
+            "process_started": self.process_started,
+            "ready_after": self.ready_after,
+            "restarts": self.restarts,
+        }
+
+    def get_uptime(self):
+        """Seconds the current process has been running (None if it isn't)"""
+        if self.process is None or self.process_started is None or self.exit_handled:
+            return None
+        return round(time.time() - self.process_started, 1)
+
+
+def set_session_state(session, state, error=None):
+    """Move a session to a new state (a stopped session stays stopped)"""
+    with session_cond:
+        if session.state in (state, "stopped"):
+            return
+        session.state = state
+        session.error = error
+        if state == "ready" and session.ready_after is None:
+            session.ready_after = round(time.time() - session.process_started, 2)
+        session_cond.notify_all()
+    save_session(session)
+    notify_dashboard()
+
+    name = TOOLS[session.tool_id]["name"]
+    if state == "ready":
+        print(f"{name} ready after {format_duration(session.ready_after)}")
+    elif state == "restarting":
+        print(f"{name} {error}, restarting in {format_duration(session.restart_delay)}")
+    elif state == "failed":
+        print(f"{name} failed: {error}")
+
+
+# Session registry. Sessions are saved to the state database with their pid,
+# port, artist and start times, so a restarted server can reattach to tools
+# that are still running instead of reporting them stopped while they hold
+# their port and GPU memory (and cold-starting them again).
+class AttachedProcess:
+    """Popen-like handle for a tool process started by an earlier server run"""
+
+    def __init__(self, pid, pid_start):
+        self.pid = pid
+        self.pid_start = pid_start
+        self.returncode = None
+
+    def poll(self):
+        # Not our child, so the real exit code is unknown
+        if self.returncode is None and get_process_start(self.pid) != self.pid_start:
+            self.returncode = -1
+        return self.returncode
+
+    def wait(self):
+        while self.poll() is None:
+            time.sleep(SESSION_SUPERVISOR_INTERVAL)
+        return self.returncode
+
+    def send_signal(self, sig):
+        try:
+            os.kill(self.pid, sig)
+        except ProcessLookupError:
+            pass
 
-        .models-btn {
-            width: 100%;
-            padding: 14px 18px;
-            border: 2px solid #667eea;
-            border-radius: 10px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            cursor: pointer;
-            transition: all 0.2s;
-            font-size: 15px;
-            font-weight: 600;
-            margin-top: 10px;
-        }
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
 
-        .models-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(102, 126, 234, 0.4);
-        }
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
 
-        /* Models Download Page */
-        .models-page {
-            display: none;
-        }
 
-        .models-page.visible {
-            display: block;
-        }
+def signal_tool(process, sig=signal.SIGTERM):
+    """Signal a tool's whole process group, so its bash wrapper's children get it too"""
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        process.send_signal(sig)  # Not a group leader (started before process groups)
 
-        .back-btn {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            background: none;
-            border: none;
-            color: #667eea;
-            cursor: pointer;
-            padding: 8px;
-            border-radius: 8px;
-            transition: background-color 0.2s;
-        }
 
-        .back-btn:hover {
-            background-color: rgba(102, 126, 234, 0.1);
-        }
+def get_process_start(pid):
+    """Start time of a live process from /proc (None if it's gone or a zombie)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError, TypeError):
+        return None
+    if fields[0] in ("Z", "X"):
+        return None
+    return int(fields[19])
 
-        .token-input {
-            width: 100%;
-            padding: 12px 16px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            font-size: 14px;
-            margin-bottom: 10px;
-            transition: border-color 0.2s;
-        }
 
-        .token-input:focus {
-            outline: none;
-            border-color: #667eea;
-        }
+def save_session(session):
+    """Record a live session in the registry, or drop it once it's over"""
+    try:
+        db = get_state_db()
+        if session.state in ("failed", "stopped"):
+            db.execute(
+                "DELETE FROM sessions WHERE tool_id = ? AND id = ?",
+                (session.tool_id, session.id),
+            )
+        elif session.process is not None:
+            db.execute(
+                "INSERT OR REPLACE INTO sessions (tool_id, id, data) VALUES (?, ?, ?)",
+                (session.tool_id, session.id, json.dumps(session.to_record())),
+            )
+    except sqlite3.Error as e:
+        print(f"Error saving session {session.tool_id}: {e}")
 
-        .model-checkboxes {
-            margin: 1rem 0;
-        }
 
-        .model-option {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            padding: 10px 0;
-            border-bottom: 1px solid #f0f0f0;
-        }
+def restore_sessions():
+    """Reattach to tool processes that outlived the previous server run"""
+    db = get_state_db()
+    for tool_id, data in db.execute("SELECT tool_id, data FROM sessions").fetchall():
+        record = json.loads(data)
+        tool = TOOLS.get(tool_id)
+        pid_start = get_process_start(record["pid"])
+        if tool is None or pid_start is None or pid_start != record["pid_start"]:
+            print(f"Session {tool_id} ended while the server was down")
+            db.execute("DELETE FROM sessions WHERE tool_id = ?", (tool_id,))
+            continue
 
-        .model-option:last-child {
-            border-bottom: none;
-        }
+        session = Session(tool_id, record["artist"])
+        session.id = record["id"]
+        session.start_time = datetime.fromisoformat(record["start_time"])
+        session.started = record["started"]
+        session.process_started = record["process_started"]
+        session.ready_after = record["ready_after"]
+        session.restarts = record["restarts"]
+        session.pid_start = pid_start
+        session.process = AttachedProcess(record["pid"], pid_start)
+
+        # Re-probed before it counts as ready; the port may belong to it still
+        session.probe_deadline = time.time() + SESSION_READY_TIMEOUT
+        if tool.get("log", True):
+            os.close(get_log_store(session.log_path).follow())
+
+        active_sessions[tool_id] = session
+        supervised_sessions.append(session)
+        print(
+            f"Reattached to {tool['name']} (pid {record['pid']}, port {record['port']})"
+        )
 
-        .model-checkbox {
-            width: 20px;
-            height: 20px;
-            accent-color: #667eea;
-            cursor: pointer;
-        }
+    if supervised_sessions:
+        start_session_supervisor()
 
-        .model-label {
-            font-size: 15px;
-            color: #333;
-            cursor: pointer;
-        }
 
-        .done-btn {
-            width: 100%;
-            padding: 14px 18px;
-            border: none;
-            border-radius: 10px;
-            background: linear-gradient(135deg, #4ade80 0%, #22c55e 100%);
-            color: white;
-            cursor: pointer;
-            transition: all 0.2s;
-            font-size: 15px;
-            font-weight: 600;
-            margin-top: 1rem;
-        }
+def check_tool_health(tool):
+    """True once the tool answers HTTP on its port with a non-5xx response"""
+    try:
+        conn = http.client.HTTPConnection(
+            "127.0.0.1", tool["port"], timeout=SESSION_PROBE_TIMEOUT
+        )
+        try:
+            conn.request("GET", tool.get("health_path", "/"))
+            return conn.getresponse().status < 500
+        finally:
+            conn.close()
+    except (OSError, http.client.HTTPException):
+        return False
 
-        .done-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(34, 197, 94, 0.4);
-        }
 
-        .hidden {
-            display: none !important;
-        }
+def launch_tool(session, restart=False):
+    """Start a session's process from its TOOLS entry (raises if it can't be started)"""
+    tool_id = session.tool_id
+    tool = TOOLS[tool_id]
+    fields = {"artist": session.artist, "repo_dir": REPO_DIR}
+
+    command = tool.get("command")
+    start_script = None
+    if command is None:
+        start_script = get_setup_script(tool_id, "start")
+        if not start_script:
+            raise Exception(f"{tool['name']} start script not found")
+        command = ["bash", start_script]
+
+    for path in tool.get("make_dirs", []):
+        os.makedirs(path.format(**fields), exist_ok=True)
+
+    # Free the port from an earlier run; give the old process a moment to exit
+    killed = subprocess.run(["fuser", "-k", f"{tool['port']}/tcp"], capture_output=True)
+    if killed.returncode == 0:
+        time.sleep(1)
+
+    env = os.environ.copy()
+    env.update(
+        {key: value.format(**fields) for key, value in tool.get("env", {}).items()}
+    )
 
-        .main-page {
-            display: block;
-        }
+    if not tool.get("log", True):
+        return subprocess.Popen(
+            command,
+            cwd=tool["cwd"].format(**fields),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
 
-        .status-message {
-            text-align: center;
-            padding: 10px;
-            margin-top: 10px;
-            border-radius: 8px;
-            font-size: 14px;
-        }
+    if restart:
+        # Appended, so the output of the crash stays visible
+        log_file = get_log_store(session.log_path)
+        log_file.write(
+            f"=== Restarting {tool['name']} (restart {session.restarts}) ===\n"
+        )
+    else:
+        log_file = reset_log(session.log_path)
+        log_file.write(f"=== Starting {tool['name']} ===\n")
+    log_file.write(f"Artist: {session.artist}\n")
+    if start_script:
+        log_file.write(f"Script: {start_script}\n")
+    log_file.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
+    log_file.write("=" * 40 + "\n\n")
+
+    # Output goes straight to the log file and the tool gets its own session
+    # and process group, so it outlives the server and signals reach all of it
+    log_fd = log_file.follow()
+    try:
+        return subprocess.Popen(
+            command,
+            cwd=tool["cwd"].format(**fields),
+            env=env,
+            stdout=log_fd,
+            stderr=log_fd,
+            start_new_session=True,
+        )
+    finally:
+        os.close(log_fd)
 
-        .status-message.success {
-            background: #f0fdf4;
-            color: #166534;
-        }
 
-        .status-message.error {
-            background: #fef2f2;
-            color: #991b1b;
-        }
+def run_session(session, restart=False):
+    """Launch (or relaunch) a session's process, then hand over to the supervisor"""
+    try:
+        process = launch_tool(session, restart)
+    except Exception as e:
+        set_session_state(session, "failed", f"Failed to start: {str(e)}")
+        return
+
+    with session_cond:
+        session.process = process
+        session.pid_start = get_process_start(process.pid)
+        session.process_started = time.time()
+        session.probe_deadline = session.process_started + SESSION_READY_TIMEOUT
+        session.ready_after = None
+        session.exit_handled = False
+        session.timed_out = False
+        session.next_probe = 0
+        session.probe_delay = SESSION_PROBE_INITIAL
+        if session not in supervised_sessions:
+            supervised_sessions.append(session)
+        stopped = session.state == "stopped"
+        session_cond.notify_all()
+    if stopped:
+        signal_tool(process)  # Stopped while it was launching
+    else:
+        save_session(session)
+        notify_dashboard()
+
+
+def handle_session_exit(session, tool, now):
+    """Apply the tool's restart policy to a process that just exited"""
+    returncode = session.process.returncode
+    if session.timed_out:
+        waited = format_duration(SESSION_READY_TIMEOUT)
+        reason = f"No response on port {tool['port']} after {waited}"
+    else:
+        reason = f"Process exited with code {returncode}"
+
+    policy = tool.get("restart", "never")
+    clean_exit = returncode == 0 and not session.timed_out
+    if (
+        session.state == "stopped"
+        or policy == "never"
+        or (policy == "on-failure" and clean_exit)
+    ):
+        set_session_state(session, "failed", reason)
+        return
+
+    # A long, healthy run means this crash isn't part of a loop
+    if now - session.process_started >= RESTART_STABLE_AFTER:
+        session.restart_delay = RESTART_BACKOFF_INITIAL
+        session.restart_times.clear()
+
+    recent = [t for t in session.restart_times if now - t < RESTART_LOOP_WINDOW]
+    if len(recent) >= RESTART_LOOP_LIMIT:
+        set_session_state(
+            session,
+            "failed",
+            f"{reason}; crash loop ({len(recent)} restarts in "
+            f"{format_duration(RESTART_LOOP_WINDOW)}), not restarting",
+        )
+        return
 
-        /* Terminal styles */
-        .terminal-container {
-            display: none;
-            margin-top: 15px;
-        }
+    session.restart_at = now + session.restart_delay
+    set_session_state(session, "restarting", reason)
+    if tool.get("log", True):
+        get_log_store(session.log_path).write(
+            f"=== Restarting in {format_duration(session.restart_delay)} ===\n"
+        )
 
-        .terminal-container.visible {
-            display: block;
-        }
 
-        .terminal-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            background: #1e1e1e;
-            padding: 8px 12px;
-            border-radius: 8px 8px 0 0;
-        }
+def restart_session(session):
+    """Relaunch a session whose restart delay is over"""
+    with session_cond:
+        if session.state != "restarting":
+            return
+        session.state = "starting"
+        session.process = None
+        session.restart_at = None
+        session.restarts += 1
+        session.restart_times.append(time.time())
+        session.restart_delay = min(session.restart_delay * 2, RESTART_BACKOFF_MAX)
+        session_cond.notify_all()
+    save_session(session)
+    notify_dashboard()
+    threading.Thread(target=run_session, args=(session, True), daemon=True).start()
+
+
+def supervise_session(session, now):
+    """One supervisor pass over a session: exits, restarts and readiness probing"""
+    tool = TOOLS[session.tool_id]
+    process = session.process
+
+    if session.state == "restarting":
+        if now >= session.restart_at:
+            restart_session(session)
+        return
+    if process is None or session.exit_handled:
+        return  # Still launching, or done
+
+    if process.poll() is not None:
+        if tool.get("log", True):
+            log_file = get_log_store(session.log_path)
+            log_file.close()
+            log_file.write(
+                f"\n=== Process exited with code: {process.returncode} ===\n"
+            )
+        session.exit_handled = True
+        handle_session_exit(session, tool, now)
+        return
+
+    if session.state != "starting" or now < session.next_probe or session.timed_out:
+        return
+    if check_tool_health(tool):
+        set_session_state(session, "ready")
+    elif now >= session.probe_deadline:
+        # Hung on startup: stop it and let the restart policy decide
+        session.timed_out = True
+        signal_tool(process)
+    else:
+        session.next_probe = time.time() + session.probe_delay
+        session.probe_delay = min(session.probe_delay * 2, SESSION_PROBE_MAX)
+
+
+def supervise_sessions():
+    """Supervisor thread: one loop for every tool session"""
+    while True:
+        with session_cond:
+            sessions = list(supervised_sessions)
+        now = time.time()
+        for session in sessions:
+            supervise_session(session, now)
+
+        # Sleep until the next probe is due, or a session changes
+        wait = SESSION_SUPERVISOR_INTERVAL
+        with session_cond:
+            supervised_sessions[:] = [
+                s
+                for s in supervised_sessions
+                if not s.exit_handled or s.state == "restarting"
+            ]
+            for session in supervised_sessions:
+                if session.state == "starting" and session.process:
+                    wait = min(wait, max(session.next_probe - time.time(), 0))
+                elif session.state == "restarting":
+                    wait = min(wait, max(session.restart_at - time.time(), 0))
+            session_cond.wait(wait)
+
+
+def start_session_supervisor():
+    """Start the supervisor thread on first use"""
+    global session_supervisor
+    with session_cond:
+        if session_supervisor is None:
+            session_supervisor = threading.Thread(
+                target=supervise_sessions, daemon=True
+            )
+            session_supervisor.start()
 
-        .terminal-title {
-            color: #4ade80;
-            font-size: 12px;
-            font-weight: 600;
-        }
 
-        .terminal-timer {
-            color: #fbbf24;
-            font-size: 12px;
-            font-weight: 600;
-            font-family: monospace;
-            margin-left: 10px;
-        }
+@app.route("/start_session", methods=["POST"])
+def start_session():
+    """Start a tool in the background; returns its session id straight away"""
+    data = request.get_json()
+    tool_id = data.get("tool_id")
+    artist = data.get("artist")
 
-        .tool-status {
-            color: #888;
-            font-size: 11px;
-            font-style: italic;
-        }
+    if not tool_id or tool_id not in TOOLS:
+        return jsonify({"success": False, "message": "Invalid tool"})
 
-        .tool-btn.disabled {
-            opacity: 0.5;
-            cursor: not-allowed;
-        }
+    if not artist:
+        return jsonify({"success": False, "message": "No artist selected"})
 
-        .terminal-controls {
-            display: flex;
-            gap: 8px;
-        }
+    tool = TOOLS[tool_id]
 
-        .terminal-btn {
-            background: #333;
-            border: none;
-            color: #888;
-            padding: 4px 8px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 11px;
-        }
+    with session_cond:
+        session = active_sessions.get(tool_id)
+        if session and session.state in ("starting", "ready", "restarting"):
+            return jsonify(
+                {
+                    "success": True,
+                    "tool_name": tool["name"],
+                    "session_id": session.id,
+                    "state": session.state,
+                    "message": f"{tool['name']} is already {session.state}",
+                }
+            )
+        session = Session(tool_id, artist)
+        active_sessions[tool_id] = session
+    notify_dashboard()
 
-        .terminal-btn:hover {
-            background: #444;
-            color: #fff;
-        }
+    start_session_supervisor()
+    threading.Thread(target=run_session, args=(session,), daemon=True).start()
 
-        .terminal {
-            background: #1e1e1e;
-            color: #d4d4d4;
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-            font-size: 12px;
-            line-height: 1.5;
-            padding: 12px;
-            border-radius: 0 0 8px 8px;
-            height: 250px;
-            overflow-y: auto;
-            white-space: pre-wrap;
-            word-wrap: break-word;
+    return jsonify(
+        {
+            "success": True,
+            "tool_name": tool["name"],
+            "session_id": session.id,
+            "state": session.state,
+            "message": f"{tool['name']} session starting",
         }
+    )
 
-        .terminal::-webkit-scrollbar {
-            width: 8px;
-        }
 
-        .terminal::-webkit-scrollbar-track {
-            background: #1e1e1e;
-        }
+@app.route("/stop_session", methods=["POST"])
+def stop_session():
+    data = request.get_json()
+    tool_id = data.get("tool_id")
 
-        .terminal::-webkit-scrollbar-thumb {
-            background: #444;
-            border-radius: 4px;
-        }
+    if not tool_id or tool_id not in TOOLS:
+        return jsonify({"success": False, "message": "Invalid tool"})
 
-        .terminal .error {
-            color: #f87171;
-        }
+    tool = TOOLS[tool_id]
 
-        .terminal .success {
-            color: #4ade80;
-        }
+    with session_cond:
+        session = active_sessions.pop(tool_id, None)
+        if session:
+            session.state = "stopped"
+            session_cond.notify_all()
+    notify_dashboard()
 
-        .terminal .info {
-            color: #60a5fa;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- Main Page -->
-        <div id="mainPage" class="main-page">
-            <div class="header">
-                <div class="logo">CS</div>
-                <h1>ComfyStudio</h1>
-            </div>
-
-            <div class="profile-row">
-                <select class="profile-select" id="profileSelect">
-                    <option value="">Choose Profile</option>
-                    {% for artist in artists %}
-                    <option value="{{ artist }}" {% if artist == current_artist %}selected{% endif %}>{{ artist }}</option>
-                    {% endfor %}
-                </select>
-
-                <div class="admin-toggle" id="adminToggle">
-                    <label class="toggle-switch">
-                        <input type="checkbox" id="adminSwitch" {% if admin_mode %}checked{% endif %}>
-                        <span class="toggle-slider"></span>
-                    </label>
-                </div>
-            </div>
-
-            <!-- User Mode Tools -->
-            <div class="tools-list" id="userTools">
-                {% for tool_id, tool in tools.items() %}
-                {% if not tool.get('user_only', False) or not admin_mode %}
-                <div class="tool-row">
-                    {% set installed = is_installed(tool.get('install_path')) %}
-                    <button class="tool-btn {% if tool_id in active_sessions %}active{% endif %}{% if not installed %} disabled{% endif %}"
-                            data-tool="{{ tool_id }}"
-                            onclick="handleToolClick('{{ tool_id }}')"
-                            {% if not installed %}disabled{% endif %}>
-                        <span class="tool-info">
-                            <span class="tool-name">{{ tool.name }}</span>
-                            {% if not installed %}
-                            <span class="tool-status">Not Installed</span>
-                            {% elif tool_id in active_sessions %}
-                            <span class="tool-timer" data-start="{{ active_sessions[tool_id].start_time }}">00:00</span>
-                            {% endif %}
-                        </span>
-                    </button>
-                    {% if tool_id in active_sessions %}
-                    <button class="tool-stop-btn" onclick="stopToolSession('{{ tool_id }}')">Stop</button>
-                    {% endif %}
-                </div>
-                {% endif %}
-                {% endfor %}
-
-                <!-- Terminal output for user mode -->
-                <div class="terminal-container" id="userTerminalContainer">
-                    <div class="terminal-header">
-                        <div style="display: flex; align-items: center; gap: 10px; margin-right: auto;">
-                            <button class="terminal-btn" onclick="minimizeUserTerminal()">−</button>
-                            <span class="terminal-title">Starting...</span>
-                        </div>
-                        <div class="terminal-controls">
-                            <button class="terminal-btn" onclick="copyUserTerminal()">Copy</button>
-                            <button class="terminal-btn" onclick="clearUserTerminal()">Clear</button>
-                        </div>
-                    </div>
-                    <div class="terminal" id="userTerminal"></div>
-                </div>
-            </div>
-
-            <!-- Admin Mode Tools -->
-            <div class="tools-list hidden" id="adminTools">
-                {% for tool_id, tool in tools.items() %}
-                {% if not tool.get('user_only', False) %}
-                <div class="admin-tool-row">
-                    {% if tool.install_path %}
-                        {% if is_installed(tool.install_path) %}
-                        <!-- Tool is installed - show Reinstall and Update buttons -->
-                        <button class="admin-tool-btn"
-                                id="reinstall-btn-{{ tool_id }}"
-                                data-tool="{{ tool_id }}"
-                                data-action="reinstall"
-                                onclick="handleAdminAction('{{ tool_id }}', 'reinstall')">
-                            Reinstall {{ tool.name }}
-                        </button>
-                        <button class="admin-tool-btn update"
-                                id="update-btn-{{ tool_id }}"
-                                data-tool="{{ tool_id }}"
-                                data-action="update"
-                                onclick="handleAdminAction('{{ tool_id }}', 'update')">
-                            Update {{ tool.name }}
-                        </button>
-                        {% else %}
-                        <!-- Tool is not installed - show Install button -->
-                        <button class="admin-tool-btn"
-                                id="install-btn-{{ tool_id }}"
-                                data-tool="{{ tool_id }}"
-                                data-action="install"
-                                onclick="handleAdminAction('{{ tool_id }}', 'install')">
-                            Install {{ tool.name }}
-                        </button>
-                        {% endif %}
-                    {% else %}
-                        <!-- Built-in tool (like JupyterLab) -->
-                        <button class="admin-tool-btn" disabled>
-                            {{ tool.name }} (Built-in)
-                        </button>
-                    {% endif %}
-                </div>
-                {% endif %}
-                {% endfor %}
-
-                <button class="models-btn" onclick="showModelsPage()">
-                    Models Download
-                </button>
-
-                <button class="models-btn" onclick="showCustomNodesPage()">
-                    Custom Nodes
-                </button>
-
-                <!-- Terminal output -->
-                <div class="terminal-container" id="terminalContainer">
-                    <div class="terminal-header">
-                        <div style="display: flex; align-items: center; gap: 10px; margin-right: auto;">
-                            <button class="terminal-btn" onclick="minimizeTerminal()">−</button>
-                            <span class="terminal-title">Terminal Output</span>
-                            <span class="terminal-timer" id="terminalTimer"></span>
-                        </div>
-                        <div class="terminal-controls">
-                            <button class="terminal-btn" onclick="copyTerminal()">Copy</button>
-                            <button class="terminal-btn" onclick="clearTerminal()">Clear</button>
-                        </div>
-                    </div>
-                    <div class="terminal" id="terminal"></div>
-                </div>
-            </div>
-
-            <div id="statusMessage" class="status-message hidden"></div>
-        </div>
-
-        <!-- Models Download Page -->
-        <div id="modelsPage" class="models-page">
-            <div class="header" style="position: relative;">
-                <button class="back-btn" onclick="hideModelsPage()" style="position: absolute; left: 0; top: 50%; transform: translateY(-50%);">
-                    <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <path d="M19 12H5M12 19l-7-7 7-7"/>
-                    </svg>
-                </button>
-                <div class="logo">CS</div>
-                <h1>ComfyStudio</h1>
-            </div>
-
-            <input type="text" class="token-input" id="hfToken" placeholder="HuggingFace Token">
-            <input type="text" class="token-input" id="civitToken" placeholder="CivitAI Token">
-
-            <div class="model-checkboxes">
-                <div class="model-option" style="border-bottom: 2px solid #e5e7eb; padding-bottom: 10px; margin-bottom: 10px;">
-                    <input type="checkbox" class="model-checkbox" id="downloadAllModels" onchange="toggleAllModels(this)">
-                    <label class="model-label" for="downloadAllModels" style="font-weight: bold;">
-                        Download All
-                    </label>
-                </div>
-                {% for script in download_scripts %}
-                <div class="model-option">
-                    <input type="checkbox" class="model-checkbox" id="model_{{ script.id }}" value="{{ script.filename }}">
-                    <label class="model-label" for="model_{{ script.id }}">
-                        {{ script.name }}
-                        {% if script.total > 0 %}
-                            {% if script.installed == script.total %}
-                                <span style="color: #10b981; font-size: 12px;"> ✓ Installed</span>
-                            {% elif script.installed > 0 %}
-                                <span style="color: #f59e0b; font-size: 12px;"> ({{ script.installed }}/{{ script.total }})</span>
-                            {% else %}
-                                <span style="color: #6b7280; font-size: 12px;"> (new)</span>
-                            {% endif %}
-                        {% endif %}
-                    </label>
-                </div>
-                {% endfor %}
-            </div>
-
-            <button class="done-btn" onclick="downloadModels()" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
-                Download
-            </button>
-
-            <div id="modelsStatusMessage" class="status-message hidden"></div>
-
-            <!-- Terminal output for models page -->
-            <div class="terminal-container" id="modelsTerminalContainer">
-                <div class="terminal-header">
-                    <div style="display: flex; align-items: center; gap: 10px; margin-right: auto;">
-                        <button class="terminal-btn" onclick="minimizeModelsTerminal()">−</button>
-                        <span class="terminal-title">Download Progress</span>
-                        <span class="terminal-timer" id="modelsTerminalTimer"></span>
-                    </div>
-                    <div class="terminal-controls">
-                        <button class="terminal-btn" onclick="copyModelsTerminal()">Copy</button>
-                        <button class="terminal-btn" onclick="clearModelsTerminal()">Clear</button>
-                    </div>
-                </div>
-                <div class="terminal" id="modelsTerminal"></div>
-            </div>
-        </div>
-
-        <!-- Custom Nodes Page -->
-        <div id="customNodesPage" class="models-page">
-            <div class="header" style="position: relative;">
-                <button class="back-btn" onclick="hideCustomNodesPage()" style="position: absolute; left: 0; top: 50%; transform: translateY(-50%);">
-                    <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <path d="M19 12H5M12 19l-7-7 7-7"/>
-                    </svg>
-                </button>
-                <div class="logo">CS</div>
-                <h1>ComfyStudio</h1>
-            </div>
-
-            <div class="model-checkboxes">
-                <div class="model-option" style="border-bottom: 2px solid #e5e7eb; padding-bottom: 10px; margin-bottom: 10px;">
-                    <input type="checkbox" class="model-checkbox" id="installAllNodes" onchange="toggleAllNodes(this)">
-                    <label class="model-label" for="installAllNodes" style="font-weight: bold;">
-                        Install All
-                    </label>
-                </div>
-                {% for node in custom_nodes %}
-                <div class="model-option">
-                    <input type="checkbox" class="model-checkbox" id="node_{{ loop.index }}" value="{{ node.repo_name }}" {% if node.installed %}checked{% endif %}>
-                    <label class="model-label" for="node_{{ loop.index }}">
-                        {{ node.name }}
-                        {% if node.installed %}<span style="color: #10b981; font-size: 12px;"> ✓ Installed</span>{% endif %}
-                    </label>
-                </div>
-                {% endfor %}
-            </div>
-
-            <div style="display: flex; gap: 10px; max-width: 600px; margin: 20px auto;">
-                <button class="done-btn" onclick="installCustomNodes()" style="flex: 1;">
-                    Install Selected
-                </button>
-                <button class="done-btn" onclick="updateCustomNodes()" style="flex: 1; background: #667eea;">
-                    Update Installed
-                </button>
-            </div>
-
-            <div id="customNodesStatusMessage" class="status-message hidden"></div>
-
-            <!-- Terminal output for custom nodes page -->
-            <div class="terminal-container" id="customNodesTerminalContainer">
-                <div class="terminal-header">
-                    <div style="display: flex; align-items: center; gap: 10px; margin-right: auto;">
-                        <button class="terminal-btn" onclick="minimizeCustomNodesTerminal()">−</button>
-                        <span class="terminal-title">Installation Progress</span>
-                        <span class="terminal-timer" id="customNodesTerminalTimer"></span>
-                    </div>
-                    <div class="terminal-controls">
-                        <button class="terminal-btn" onclick="copyCustomNodesTerminal()">Copy</button>
-                        <button class="terminal-btn" onclick="clearCustomNodesTerminal()">Clear</button>
-                    </div>
-                </div>
-                <div class="terminal" id="customNodesTerminal"></div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        var admins = {{ admins | tojson | safe }};
-        var currentArtist = "{{ current_artist | default('', true) | e }}";
-        var adminMode = {% if admin_mode %}true{% else %}false{% endif %};
-        var sessionTimers = {};
-
-        // Initialize on load
-        document.addEventListener('DOMContentLoaded', function() {
-            updateUI();
-            startTimers();
-        });
-
-        // Profile selection change
-        document.getElementById('profileSelect').addEventListener('change', function() {
-            currentArtist = this.value;
-
-            // Update server with new artist
-            fetch('/set_artist', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ artist: currentArtist })
-            });
-
-            updateUI();
-        });
-
-        // Admin toggle change
-        document.getElementById('adminSwitch').addEventListener('change', function() {
-            adminMode = this.checked;
-
-            fetch('/set_admin_mode', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ admin_mode: adminMode })
-            });
-
-            updateUI();
-        });
-
-        function updateUI() {
-            const adminToggle = document.getElementById('adminToggle');
-            const userTools = document.getElementById('userTools');
-            const adminTools = document.getElementById('adminTools');
-
-            // Check if current user is admin (with safety checks)
-            let isAdmin = false;
-            if (currentArtist && Array.isArray(admins) && admins.length > 0) {
-                const currentLower = currentArtist.trim().toLowerCase();
-                isAdmin = admins.some(function(admin) {
-                    return admin && admin.trim().toLowerCase() === currentLower;
-                });
-            }
+    # Kill the process group if running
+    if session:
+        save_session(session)
+        if session.process:
+            signal_tool(session.process)
 
-            if (isAdmin) {
-                adminToggle.classList.add('visible');
-            } else {
-                adminToggle.classList.remove('visible');
-                adminMode = false;
-                document.getElementById('adminSwitch').checked = false;
-            }
+        # Kill by port
+        port = tool["port"]
+        subprocess.run(["fuser", "-k", f"{port}/tcp"], capture_output=True)
 
-            // Toggle between user and admin tools
-            if (adminMode) {
-                userTools.classList.add('hidden');
-                adminTools.classList.remove('hidden');
-            } else {
-                userTools.classList.remove('hidden');
-                adminTools.classList.add('hidden');
-            }
+    return jsonify(
+        {
+            "success": True,
+            "tool_name": tool["name"],
+            "message": f"{tool['name']} stopped",
         }
+    )
 
-        function handleToolClick(toolId) {
-            if (!currentArtist) {
-                showStatus('Please select a profile first', 'error');
-                return;
-            }
 
-            var btn = document.querySelector('[data-tool="' + toolId + '"]');
-            if (btn.classList.contains('active')) {
-                // Tool is running - open it in new tab
-                var runpodId = '{{ runpod_id | e }}';
-                var tool = {{ tools | tojson }}[toolId];
-                var url = 'https://' + runpodId + '-' + tool.port + '.proxy.runpod.net';
-                window.open(url, '_blank');
-            } else if (!btn.classList.contains('starting')) {
-                // Start the tool (only if not already starting)
-                btn.classList.add('starting');
-                // Update button text to show starting state
-                var toolNameSpan = btn.querySelector('.tool-name');
-                if (toolNameSpan) {
-                    toolNameSpan.setAttribute('data-original-text', toolNameSpan.textContent);
-                    toolNameSpan.textContent = 'Starting ' + toolNameSpan.textContent + '...';
-                }
-                startSession(toolId, btn);
-            }
-        }
+class LogStore:
+    """
+    A log kept as a bounded in-memory buffer, persisted to its file on disk.
+    Sequence numbers are byte offsets since the last reset; the buffer holds
+    the newest bytes [start, end). Works as a file for write() calls and, via
+    fileno(), as stdout/stderr for subprocesses: their output goes through a
+    pipe drained by a pump thread, so it stays in order with write() calls.
+    Long-running tools use follow() instead, see there.
+    """
 
-        function startSession(toolId, btn) {
-            var tools = {{ tools | tojson }};
-            var toolName = tools[toolId] ? tools[toolId].name : toolId;
-
-            // Show terminal
-            clearUserTerminal();
-            showUserTerminal(toolName);
-
-            fetch('/start_session', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ tool_id: toolId, artist: currentArtist })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    // Start polling for ready status and logs
-                    startPollingUserLogs(toolId, toolName);
-                } else {
-                    showStatus(data.message, 'error');
-                    // Reset button state on error
-                    if (btn) {
-                        btn.classList.remove('starting');
-                        var toolNameSpan = btn.querySelector('.tool-name');
-                        if (toolNameSpan && toolNameSpan.getAttribute('data-original-text')) {
-                            toolNameSpan.textContent = toolNameSpan.getAttribute('data-original-text');
-                        }
-                    }
-                }
-            })
-            .catch(function(error) {
-                showStatus('Error: ' + error, 'error');
-                // Reset button state on error
-                if (btn) {
-                    btn.classList.remove('starting');
-                    var toolNameSpan = btn.querySelector('.tool-name');
-                    if (toolNameSpan && toolNameSpan.getAttribute('data-original-text')) {
-                        toolNameSpan.textContent = toolNameSpan.getAttribute('data-original-text');
-                    }
-                }
-            });
-        }
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        # Held while writing to the pipe or follow fd, and by close() before
+        # closing them, so a write never lands on a closed (and reused) fd
+        # number. Separate from lock: a write to a full pipe waits for the pump,
+        # which needs lock.
+        self.write_lock = threading.Lock()
+        self.generation = 0
+        self.chunks = collections.deque()
+        self.start = 0
+        self.end = 0
+        self.file = None
+        self.pipe = None  # Write end handed to subprocesses
+        self.pump = None
+        self.follow_fd = None  # Append-only fd on the log file while following it
+        self.follow_pos = 0  # Bytes of the log file already in the buffer
+        self.follower = None
+        self.follower_stop = None
+        self.load_tail()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
 
-        function stopSession(toolId) {
-            fetch('/stop_session', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ tool_id: toolId })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showStatus(data.tool_name + ' stopped', 'success');
-                    setTimeout(() => location.reload(), 1000);
-                } else {
-                    showStatus(data.message, 'error');
-                }
-            });
-        }
+    def load_tail(self):
+        """Seed the buffer from the end of an existing log file (e.g. after a restart)"""
+        try:
+            with open(self.path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(size - LOG_BUFFER_BYTES, 0))
+                data = f.read()
+        except OSError:
+            return
+        if data:
+            self.chunks.append(data)
+        self.start, self.end = size - len(data), size
+
+    def append(self, data):
+        """Add bytes to the buffer and the file"""
+        with self.lock:
+            self.buffer(data)
+            self.persist(data)
+
+    def buffer(self, data):
+        """Add bytes to the buffer, evicting the oldest beyond the cap (lock held)"""
+        self.chunks.append(data)
+        self.end += len(data)
+        excess = self.end - self.start - LOG_BUFFER_BYTES
+        while excess > 0:
+            first = self.chunks[0]
+            if len(first) <= excess:
+                self.chunks.popleft()
+                self.start += len(first)
+                excess -= len(first)
+            else:
+                self.chunks[0] = first[excess:]
+                self.start += excess
+                excess = 0
 
-        function handleAdminAction(toolId, action) {
-            // Get the button and disable it
-            var btnId = action + '-btn-' + toolId;
-            var btn = document.getElementById(btnId);
-            // Get tool name from tools object
-            var tools = {{ tools | tojson | safe }};
-            var toolName = tools[toolId] ? tools[toolId].name : toolId;
-
-            if (btn) {
-                btn.disabled = true;
-                btn.textContent = action.charAt(0).toUpperCase() + action.slice(1) + 'ing ' + toolName + '...';
-                // Track active button globally so we can re-enable it when done
-                activeAdminButton = btn;
-                activeAdminAction = action;
-                activeAdminToolId = toolId;
-            }
-
-            // Update terminal title based on action
-            var terminalTitle = document.querySelector('#terminalContainer .terminal-title');
-            if (terminalTitle) {
-                var actionText = action.charAt(0).toUpperCase() + action.slice(1) + 'ing';
-                terminalTitle.textContent = actionText + ' ' + toolName;
-            }
-
-            // Clear and show terminal, start timer
-            clearTerminal();
-            showTerminal();
-            startTerminalTimer('terminalTimer');
-
-            fetch('/admin_action', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ tool_id: toolId, action: action })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showStatus(data.message, 'success');
-                    // Start polling for logs
-                    startPollingLogs();
-                } else {
-                    showStatus(data.message, 'error');
-                    appendToTerminal('Error: ' + data.message + '\n', 'error');
-                    // Re-enable button on error
-                    if (btn) {
-                        btn.disabled = false;
-                        btn.textContent = action.charAt(0).toUpperCase() + action.slice(1) + ' ' + toolId;
-                    }
-                }
-            });
-        }
-
-        function stopToolSession(toolId) {
-            fetch('/stop_session', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ tool_id: toolId })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showStatus(data.message, 'success');
-                    // Reload page to update UI
-                    setTimeout(function() {
-                        location.reload();
-                    }, 1000);
-                } else {
-                    showStatus(data.message, 'error');
-                }
-            });
-        }
-
-        function showModelsPage() {
-            document.getElementById('mainPage').classList.add('hidden');
-            document.getElementById('modelsPage').classList.add('visible');
-        }
-
-        function hideModelsPage() {
-            document.getElementById('modelsPage').classList.remove('visible');
-            document.getElementById('mainPage').classList.remove('hidden');
-        }
-
-        function showCustomNodesPage() {
-            document.getElementById('mainPage').classList.add('hidden');
-            document.getElementById('customNodesPage').classList.add('visible');
-
-            // Reset custom nodes terminal title
-            var terminalTitle = document.querySelector('#customNodesTerminalContainer .terminal-title');
-            if (terminalTitle) {
-                terminalTitle.textContent = 'Installation Progress';
-            }
-        }
-
-        function hideCustomNodesPage() {
-            document.getElementById('customNodesPage').classList.remove('visible');
-            document.getElementById('mainPage').classList.remove('hidden');
-        }
-
-        function toggleAllModels(checkbox) {
-            var modelCheckboxes = document.querySelectorAll('#modelsPage .model-checkbox:not(#downloadAllModels)');
-            modelCheckboxes.forEach(function(cb) {
-                cb.checked = checkbox.checked;
-            });
-        }
-
-        function toggleAllNodes(checkbox) {
-            var nodeCheckboxes = document.querySelectorAll('#customNodesPage .model-checkbox:not(#installAllNodes)');
-            nodeCheckboxes.forEach(function(cb) {
-                cb.checked = checkbox.checked;
-            });
-        }
-
-        function installCustomNodes() {
-            // Update terminal title and start timer
-            var terminalTitle = document.querySelector('#customNodesTerminalContainer .terminal-title');
-            if (terminalTitle) {
-                terminalTitle.textContent = 'Installing Custom Nodes';
-            }
-            startTerminalTimer('customNodesTerminalTimer');
-
-            clearCustomNodesTerminal();
-            showCustomNodesTerminal();
-            appendToCustomNodesTerminal('Starting custom nodes installation...\\n', 'info');
-
-            fetch('/custom_nodes_action', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ action: 'install' })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showCustomNodesStatus(data.message, 'success');
-                    startPollingCustomNodesLogs();
-                } else {
-                    showCustomNodesStatus(data.message, 'error');
-                    appendToCustomNodesTerminal('Error: ' + data.message + '\\n', 'error');
-                }
-            });
-        }
-
-        function updateCustomNodes() {
-            // Update terminal title and start timer
-            var terminalTitle = document.querySelector('#customNodesTerminalContainer .terminal-title');
-            if (terminalTitle) {
-                terminalTitle.textContent = 'Updating Custom Nodes';
-            }
-            startTerminalTimer('customNodesTerminalTimer');
-
-            clearCustomNodesTerminal();
-            showCustomNodesTerminal();
-            appendToCustomNodesTerminal('Starting custom nodes update...\\n', 'info');
-
-            fetch('/custom_nodes_action', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ action: 'update' })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showCustomNodesStatus(data.message, 'success');
-                    startPollingCustomNodesLogs();
-                } else {
-                    showCustomNodesStatus(data.message, 'error');
-                    appendToCustomNodesTerminal('Error: ' + data.message + '\\n', 'error');
-                }
-            });
-        }
-
-        function showCustomNodesStatus(message, type) {
-            var statusDiv = document.getElementById('customNodesStatusMessage');
-            statusDiv.textContent = message;
-            statusDiv.className = 'status-message ' + type;
-            statusDiv.classList.remove('hidden');
-            setTimeout(function() {
-                statusDiv.classList.add('hidden');
-            }, 5000);
-        }
-
-        function showCustomNodesTerminal() {
-            document.getElementById('customNodesTerminalContainer').style.display = 'block';
-        }
-
-        function minimizeCustomNodesTerminal() {
-            var terminal = document.getElementById('customNodesTerminal');
-            if (terminal.style.display === 'none') {
-                terminal.style.display = 'block';
-            } else {
-                terminal.style.display = 'none';
-            }
-        }
-
-        function copyCustomNodesTerminal() {
-            var terminal = document.getElementById('customNodesTerminal');
-            navigator.clipboard.writeText(terminal.textContent).then(function() {
-                showCustomNodesStatus('Terminal content copied to clipboard', 'success');
-            }).catch(function(err) {
-                showCustomNodesStatus('Failed to copy: ' + err, 'error');
-            });
-        }
-
-        function clearCustomNodesTerminal() {
-            document.getElementById('customNodesTerminal').textContent = '';
-        }
-
-        function appendToCustomNodesTerminal(text, type) {
-            var terminal = document.getElementById('customNodesTerminal');
-            var span = document.createElement('span');
-            span.textContent = text;
-            if (type === 'error') {
-                span.style.color = '#ef4444';
-            } else if (type === 'success') {
-                span.style.color = '#10b981';
-            } else if (type === 'info') {
-                span.style.color = '#3b82f6';
-            }
-            terminal.appendChild(span);
-            terminal.scrollTop = terminal.scrollHeight;
-        }
-
-        function startPollingCustomNodesLogs() {
-            var pollInterval = setInterval(function() {
-                fetch('/logs')
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.content) {
-                            document.getElementById('customNodesTerminal').textContent = data.content;
-                            var terminal = document.getElementById('customNodesTerminal');
-                            terminal.scrollTop = terminal.scrollHeight;
-                        }
-                        if (!data.running) {
-                            clearInterval(pollInterval);
-                            appendToCustomNodesTerminal('\\n=== Process completed ===\\n', 'success');
-                            stopTerminalTimer();
-                        }
-                    });
-            }, 1000);
-        }
-
-        function downloadModels() {
-            const hfToken = document.getElementById('hfToken').value;
-            const civitToken = document.getElementById('civitToken').value;
-
-            const selectedModels = [];
-            document.querySelectorAll('.model-checkbox:checked').forEach(cb => {
-                selectedModels.push(cb.value);
-            });
-
-            if (selectedModels.length === 0) {
-                showModelsStatus('Please select at least one model set', 'error');
-                return;
-            }
-
-            // Update terminal title and start timer
-            var terminalTitle = document.querySelector('#modelsTerminalContainer .terminal-title');
-            if (terminalTitle) {
-                terminalTitle.textContent = 'Downloading Models';
-            }
-            startTerminalTimer('modelsTerminalTimer');
-
-            // Clear and show terminal
-            clearModelsTerminal();
-            showModelsTerminal();
-            appendToModelsTerminal('Starting download for: ' + selectedModels.join(', ') + '...\\n', 'info');
-
-            fetch('/download_models', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    models: selectedModels,
-                    hf_token: hfToken,
-                    civit_token: civitToken
-                })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    showModelsStatus(data.message, 'success');
-                    // Start polling for logs
-                    startPollingModelsLogs();
-                } else {
-                    showModelsStatus(data.message, 'error');
-                    appendToModelsTerminal('Error: ' + data.message + '\\n', 'error');
-                }
-            });
-        }
-
-        // Models page terminal functions
-        function showModelsTerminal() {
-            document.getElementById('modelsTerminalContainer').classList.add('visible');
-        }
-
-        function minimizeModelsTerminal() {
-            var terminal = document.getElementById('modelsTerminal');
-            if (terminal.style.display === 'none') {
-                terminal.style.display = 'block';
-            } else {
-                terminal.style.display = 'none';
-            }
-        }
-
-        function copyModelsTerminal() {
-            var terminal = document.getElementById('modelsTerminal');
-            navigator.clipboard.writeText(terminal.textContent).then(function() {
-                showModelsStatus('Terminal content copied to clipboard', 'success');
-            }).catch(function(err) {
-                showModelsStatus('Failed to copy: ' + err, 'error');
-            });
-        }
-
-        function clearModelsTerminal() {
-            document.getElementById('modelsTerminal').innerHTML = '';
-            lastLogLength = 0;
-            fetch('/clear_logs', { method: 'POST' });
-        }
-
-        function minimizeTerminal() {
-            var terminal = document.getElementById('terminal');
-            if (terminal.style.display === 'none') {
-                terminal.style.display = 'block';
-            } else {
-                terminal.style.display = 'none';
-            }
-        }
-
-        function copyTerminal() {
-            var terminal = document.getElementById('terminal');
-            navigator.clipboard.writeText(terminal.textContent).then(function() {
-                showStatus('Terminal content copied to clipboard', 'success');
-            }).catch(function(err) {
-                showStatus('Failed to copy: ' + err, 'error');
-            });
-        }
-
-        function clearTerminal() {
-            document.getElementById('terminal').innerHTML = '';
-            lastLogLength = 0;
-        }
-
-        function appendToModelsTerminal(text, className) {
-            const terminal = document.getElementById('modelsTerminal');
-            const span = document.createElement('span');
-            if (className) span.className = className;
-            span.textContent = text;
-            terminal.appendChild(span);
-            terminal.scrollTop = terminal.scrollHeight;
-        }
-
-        function pollModelsLogs() {
-            fetch('/logs')
-                .then(response => response.json())
-                .then(data => {
-                    if (data.content && data.content.length > lastLogLength) {
-                        const newContent = data.content.substring(lastLogLength);
-                        appendToModelsTerminal(newContent);
-                        lastLogLength = data.content.length;
-                    }
-                    if (data.running === false && logPollingInterval) {
-                        appendToModelsTerminal('\\n--- Download completed ---\\n', 'success');
-                        stopTerminalTimer();
-                        stopPollingLogs();
-                    }
-                })
-                .catch(err => console.error('Error polling logs:', err));
-        }
-
-        function startPollingModelsLogs() {
-            lastLogLength = 0;
-            if (logPollingInterval) clearInterval(logPollingInterval);
-            logPollingInterval = setInterval(pollModelsLogs, 1000);
-            pollModelsLogs(); // Initial poll
-        }
-
-        function showStatus(message, type) {
-            const el = document.getElementById('statusMessage');
-            el.textContent = message;
-            el.className = 'status-message ' + type;
-            el.classList.remove('hidden');
-            setTimeout(() => el.classList.add('hidden'), 3000);
-        }
-
-        function showModelsStatus(message, type) {
-            const el = document.getElementById('modelsStatusMessage');
-            el.textContent = message;
-            el.className = 'status-message ' + type;
-            el.classList.remove('hidden');
-            setTimeout(() => el.classList.add('hidden'), 3000);
-        }
-
-        function startTimers() {
-            document.querySelectorAll('.tool-timer').forEach(timer => {
-                const startTime = new Date(timer.dataset.start);
-                setInterval(() => {
-                    const elapsed = Math.floor((new Date() - startTime) / 1000);
-                    const minutes = Math.floor(elapsed / 60);
-                    const seconds = elapsed % 60;
-                    timer.textContent = minutes.toString().padStart(2, '0') + ':' + seconds.toString().padStart(2, '0');
-                }, 1000);
-            });
-        }
-
-        // Terminal functions
-        var logPollingInterval = null;
-        var lastLogLength = 0;
-        var activeAdminButton = null;
-        var activeAdminAction = null;
-        var activeAdminToolId = null;
-
-        function showTerminal() {
-            document.getElementById('terminalContainer').classList.add('visible');
-        }
-
-        function minimizeTerminal() {
-            var terminal = document.getElementById('terminal');
-            if (terminal.style.display === 'none') {
-                terminal.style.display = 'block';
-            } else {
-                terminal.style.display = 'none';
-            }
-        }
-
-        function clearTerminal() {
-            document.getElementById('terminal').innerHTML = '';
-            lastLogLength = 0;
-            // Also clear server-side log
-            fetch('/clear_logs', { method: 'POST' });
-        }
+    def persist(self, data):
+        """Append to the log file, rotating it once it's too large (lock held)"""
+        try:
+            if self.file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self.file = open(self.path, "ab")
+            self.file.write(data)
+            self.file.flush()
+            if self.file.tell() >= LOG_FILE_MAX_BYTES:
+                self.file.close()
+                self.file = None
+                rotate_log_file(self.path)
+        except OSError as e:
+            print(f"Error writing log {self.path}: {e}")
+
+    def write(self, text):
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        with self.write_lock:
+            if self.follow_fd is not None:
+                try:
+                    os.write(
+                        self.follow_fd, data
+                    )  # Picked up by the follower, in order
+                    return len(text)
+                except OSError:
+                    pass
+            if self.pipe is not None:
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(self.pipe, view) :]
+                    return len(text)
+                except OSError:
+                    pass
+            self.append(data)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def fileno(self):
+        """Write end of a pipe whose output is pumped into the buffer"""
+        with self.lock:
+            if self.pipe is None:
+                read_fd, self.pipe = os.pipe()
+                self.pump = threading.Thread(
+                    target=self.drain, args=(read_fd,), daemon=True
+                )
+                self.pump.start()
+            return self.pipe
+
+    def drain(self, read_fd):
+        with os.fdopen(read_fd, "rb", buffering=0) as pipe:
+            while True:
+                data = pipe.read(65536)
+                if not data:
+                    return
+                self.append(data)
+
+    def follow(self):
+        """
+        Give a subprocess an fd on the log file itself and tail the file into
+        the buffer. Unlike the pipe from fileno(), the process keeps a working
+        stdout if the server exits, so a restarted server can reattach to it
+        (call follow() again and close the returned fd). The caller closes the
+        returned fd once the subprocess has it.
+        """
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+            if self.follow_fd is None:
+                self.follow_fd = os.open(self.path, flags, 0o644)
+                self.follow_pos = os.fstat(self.follow_fd).st_size
+                self.follower_stop = threading.Event()
+                self.follower = threading.Thread(
+                    target=self.tail, args=(self.follower_stop,), daemon=True
+                )
+                self.follower.start()
+            return os.open(self.path, flags, 0o644)
+
+    def tail(self, stop):
+        """Follower thread: move bytes appended to the log file into the buffer"""
+        while not stop.wait(LOG_FOLLOW_INTERVAL):
+            self.ingest()
+        self.ingest()
+
+    def ingest(self):
+        """Buffer what was appended to the followed file, rotating it when large"""
+        with self.lock:
+            if self.follow_fd is None:
+                return
+            try:
+                with open(self.path, "rb") as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size < self.follow_pos:
+                        self.follow_pos = 0  # Truncated by someone else
+                    f.seek(self.follow_pos)
+                    data = f.read(size - self.follow_pos)
+            except OSError:
+                return
+            if data:
+                self.follow_pos += len(data)
+                self.buffer(data)
+
+            # The writer holds the file open, so rotate by copy and truncate
+            if self.follow_pos >= LOG_FILE_MAX_BYTES:
+                rotate_log_file(self.path, truncate=True)
+                self.follow_pos = 0
+
+    def close(self):
+        """
+        Stop following and close the pipe, waiting for its output (a leftover
+        grandchild may hold it open)
+        """
+        with self.lock:
+            pipe, pump = self.pipe, self.pump
+            follower, stop = self.follower, self.follower_stop
+            self.pipe = self.pump = self.follower = self.follower_stop = None
+        if follower is not None:
+            stop.set()
+            follower.join(LOG_DRAIN_TIMEOUT)
+            with self.write_lock, self.lock:
+                os.close(self.follow_fd)
+                self.follow_fd = None
+        if pipe is not None:
+            with self.write_lock:
+                os.close(pipe)
+            pump.join(LOG_DRAIN_TIMEOUT)
+
+    def reset(self):
+        """Start a new generation: empty the buffer and rotate the old file away"""
+        self.close()
+        with self.lock:
+            self.generation += 1
+            self.chunks.clear()
+            self.start = self.end = 0
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            if os.path.isfile(self.path) and os.path.getsize(self.path) > 0:
+                rotate_log_file(self.path)
+        return self
+
+    def read(self, offset, generation):
+        """Buffered bytes from offset; see read_log_chunk"""
+        with self.lock:
+            reset = generation is not None and generation != self.generation
+            if reset or offset < 0 or offset > self.end:
+                reset = reset or offset != 0
+                offset = 0
+            skipped = max(self.start - offset, 0)
+            offset += skipped
+            stop = min(self.end, offset + LOG_CHUNK_SIZE)
+            parts = []
+            position = self.start
+            for chunk in self.chunks:
+                if position >= stop:
+                    break
+                chunk_end = position + len(chunk)
+                if chunk_end > offset:
+                    parts.append(chunk[max(offset - position, 0) : stop - position])
+                position = chunk_end
+            return b"".join(parts), offset, self.end, self.generation, reset, skipped
+
+
+def rotate_log_file(path, truncate=False):
+    """
+    Compress a log file to path.1.gz, shifting older backups up. With
+    truncate the file is emptied in place instead of removed, for files a
+    process still writes to.
+    """
+    for index in range(LOG_FILE_BACKUPS - 1, 0, -1):
+        older = f"{path}.{index}.gz"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{index + 1}.gz")
+    try:
+        with open(path, "rb") as src, gzip.open(f"{path}.1.gz", "wb") as dest:
+            shutil.copyfileobj(src, dest)
+        if truncate:
+            os.truncate(path, 0)
+        else:
+            os.remove(path)
+    except OSError as e:
+        print(f"Error rotating log {path}: {e}")
+
+
+def get_log_store(path):
+    """The log store for a path, created (and seeded from disk) on first use"""
+    with log_stores_lock:
+        store = log_stores.get(path)
+        if store is None:
+            store = log_stores[path] = LogStore(path)
+        return store
+
+
+def drop_log_store(path):
+    """Forget a log and delete its files"""
+    with log_stores_lock:
+        store = log_stores.pop(path, None)
+    if store:
+        store.close()
+        with store.lock:
+            if store.file is not None:
+                store.file.close()
+                store.file = None
+    for name in [path] + [f"{path}.{i}.gz" for i in range(1, LOG_FILE_BACKUPS + 1)]:
+        try:
+            os.remove(name)
+        except OSError:
+            pass
 
-        function appendToTerminal(text, className) {
-            const terminal = document.getElementById('terminal');
-            const span = document.createElement('span');
-            if (className) span.className = className;
-            span.textContent = text;
-            terminal.appendChild(span);
-            terminal.scrollTop = terminal.scrollHeight;
-        }
 
-        function pollLogs() {
-            fetch('/logs')
-                .then(response => response.json())
-                .then(data => {
-                    if (data.content && data.content.length > lastLogLength) {
-                        const newContent = data.content.substring(lastLogLength);
-                        appendToTerminal(newContent);
-                        lastLogLength = data.content.length;
-                    }
-                    if (data.running === false && logPollingInterval) {
-                        appendToTerminal('\n--- Process completed ---\n', 'success');
-                        stopPollingLogs();
-                        // Re-enable the admin button
-                        resetAdminButton();
-                        // Don't auto-reload - let user see any errors
-                    }
-                })
-                .catch(err => console.error('Error polling logs:', err));
-        }
+def reset_log(path):
+    """Start a new run of a log (clients see a generation change)"""
+    return get_log_store(path).reset()
 
-        function startPollingLogs() {
-            lastLogLength = 0;
-            if (logPollingInterval) clearInterval(logPollingInterval);
-            logPollingInterval = setInterval(pollLogs, 1000);
-            pollLogs(); // Initial poll
-        }
 
-        function stopPollingLogs() {
-            if (logPollingInterval) {
-                clearInterval(logPollingInterval);
-                logPollingInterval = null;
-            }
-            stopTerminalTimer();
-        }
+def trim_partial_utf8(data):
+    """Drop an incomplete multi-byte UTF-8 sequence from the end of a byte string"""
+    for i in range(1, min(4, len(data)) + 1):
+        byte = data[-i]
+        if byte & 0xC0 == 0x80:
+            continue  # Continuation byte, keep looking for the lead byte
+        if byte >= 0xF0:
+            needed = 4
+        elif byte >= 0xE0:
+            needed = 3
+        elif byte >= 0xC0:
+            needed = 2
+        else:
+            needed = 1
+        return data if needed <= i else data[:-i]
+    return data
 
-        // Terminal timer functions
-        var terminalTimerInterval = null;
-        var terminalTimerStart = null;
-
-        function startTerminalTimer(timerId) {
-            stopTerminalTimer();
-            terminalTimerStart = Date.now();
-            var timerElement = document.getElementById(timerId || 'terminalTimer');
-            if (timerElement) {
-                timerElement.textContent = '0:00';
-                terminalTimerInterval = setInterval(function() {
-                    var elapsed = Math.floor((Date.now() - terminalTimerStart) / 1000);
-                    var minutes = Math.floor(elapsed / 60);
-                    var seconds = elapsed % 60;
-                    timerElement.textContent = minutes + ':' + (seconds < 10 ? '0' : '') + seconds;
-                }, 1000);
-            }
-        }
 
-        function stopTerminalTimer() {
-            if (terminalTimerInterval) {
-                clearInterval(terminalTimerInterval);
-                terminalTimerInterval = null;
-            }
-        }
+def read_log_chunk(path, offset, generation):
+    """
+    Read new bytes of a log starting at a client-supplied byte offset.
+    Returns dict with 'content', 'offset' (next offset to request), 'generation',
+    'more' (True when output beyond the per-read cap is already waiting),
+    'reset' (True when the client must clear its view and start over, e.g. the
+    log was reset since the client's last read) and 'skipped' (bytes already
+    evicted from the buffer before the client got to read them).
+    """
+    data, offset, end, current_generation, reset, skipped = get_log_store(path).read(
+        offset, generation
+    )
 
-        function resetAdminButton() {
-            if (activeAdminButton && activeAdminAction && activeAdminToolId) {
-                activeAdminButton.disabled = false;
-                activeAdminButton.textContent = activeAdminAction.charAt(0).toUpperCase() + activeAdminAction.slice(1);
-                activeAdminButton = null;
-                activeAdminAction = null;
-                activeAdminToolId = null;
-            }
-        }
+    # After a gap, start at the next full line
+    if skipped:
+        newline = data.find(b"\n")
+        if newline != -1:
+            data = data[newline + 1 :]
+            offset += newline + 1
+            skipped += newline + 1
+
+    # Don't hand out a partial line or a split UTF-8 sequence when capped;
+    # the remainder is picked up on the next poll
+    if len(data) == LOG_CHUNK_SIZE:
+        newline = data.rfind(b"\n")
+        if newline != -1:
+            data = data[: newline + 1]
+    data = trim_partial_utf8(data)
+
+    return {
+        "content": data.decode("utf-8", errors="replace"),
+        "offset": offset + len(data),
+        "generation": current_generation,
+        "reset": reset,
+        "skipped": skipped,
+        "more": offset + len(data) < end,
+    }
 
-        // User terminal functions
-        var userLogPollingInterval = null;
 
-        function showUserTerminal(toolName) {
-            var container = document.getElementById('userTerminalContainer');
-            var title = container.querySelector('.terminal-title');
-            title.textContent = 'Starting ' + (toolName || '...');
-            container.classList.add('visible');
-        }
+def get_log_cursor():
+    """Parse offset/generation query parameters for incremental log reads"""
+    offset = request.args.get("offset", default=0, type=int)
+    generation = request.args.get("generation", default=None, type=int)
+    return offset, generation
 
-        function minimizeUserTerminal() {
-            var terminal = document.getElementById('userTerminal');
-            if (terminal.style.display === 'none') {
-                terminal.style.display = 'block';
-            } else {
-                terminal.style.display = 'none';
-            }
-        }
 
-        function copyUserTerminal() {
-            var terminal = document.getElementById('userTerminal');
-            navigator.clipboard.writeText(terminal.textContent).then(function() {
-                showStatus('Terminal content copied to clipboard', 'success');
-            }).catch(function(err) {
-                showStatus('Failed to copy: ' + err, 'error');
-            });
-        }
+def get_session(tool_id=None):
+    """A tool's session, or the most recently started one when tool_id is None"""
+    if tool_id is not None:
+        return active_sessions.get(tool_id)
+    with session_cond:
+        sessions = list(active_sessions.values())
+    return max(sessions, key=lambda s: s.started, default=None)
 
-        function clearUserTerminal() {
-            document.getElementById('userTerminal').innerHTML = '';
-        }
 
-        function appendToUserTerminal(text, className) {
-            var terminal = document.getElementById('userTerminal');
-            var span = document.createElement('span');
-            if (className) span.className = className;
-            // Handle literal backslash-n from raw Python strings (\\\\n becomes \\n in JS regex)
-            span.innerHTML = text.replace(/\\\\n/g, '<br>').replace(/\n/g, '<br>');
-            terminal.appendChild(span);
-            terminal.scrollTop = terminal.scrollHeight;
-        }
+@app.route("/sessions")
+def list_sessions():
+    """All tool sessions with their state"""
+    with session_cond:
+        sessions = list(active_sessions.values())
+    return jsonify({"sessions": [s.to_dict() for s in sessions]})
 
-        function startPollingUserLogs(toolId, toolName) {
-            var tools = {{ tools | tojson }};
-            var tool = tools[toolId];
-            var port = tool ? tool.port : null;
-            var checkCount = 0;
-            var maxChecks = 300; // 300 seconds timeout (5 minutes)
-            var lastLogLength = 0;
-            var processExited = false;
-
-            if (userLogPollingInterval) clearInterval(userLogPollingInterval);
-
-            userLogPollingInterval = setInterval(function() {
-                checkCount++;
-
-                // Fetch actual logs from the process
-                fetch('/user_logs')
-                    .then(function(response) { return response.json(); })
-                    .then(function(logData) {
-                        // Show new log content
-                        if (logData.content && logData.content.length > lastLogLength) {
-                            var newContent = logData.content.substring(lastLogLength);
-                            appendToUserTerminal(newContent);
-                            lastLogLength = logData.content.length;
-
-                            // Auto-scroll
-                            var terminal = document.getElementById('userTerminal');
-                            terminal.scrollTop = terminal.scrollHeight;
-                        }
-
-                        // Check if process exited (look for exit message in logs)
-                        if (logData.content && logData.content.includes('=== Process exited with code:')) {
-                            processExited = true;
-                        }
-                    });
-
-                // Check if service is ready by polling tool_status
-                fetch('/tool_status/' + toolId)
-                    .then(function(response) { return response.json(); })
-                    .then(function(data) {
-                        if (data.running && data.port_ready) {
-                            stopPollingUserLogs();
-                            // Open the tool
-                            var runpodId = '{{ runpod_id | e }}';
-                            var url = 'https://' + runpodId + '-' + port + '.proxy.runpod.net';
-                            window.open(url, '_blank');
-                            setTimeout(function() { location.reload(); }, 1000);
-                        } else if (processExited) {
-                            stopPollingUserLogs();
-                            showStatus(toolName + ' process exited unexpectedly', 'error');
-                        } else if (checkCount >= maxChecks) {
-                            stopPollingUserLogs();
-                            showStatus('Timeout waiting for ' + toolName + ' to start', 'error');
-                        }
-                    })
-                    .catch(function(err) {
-                        console.error('Error checking status:', err);
-                    });
-            }, 1000);
-        }
 
-        function stopPollingUserLogs() {
-            if (userLogPollingInterval) {
-                clearInterval(userLogPollingInterval);
-                userLogPollingInterval = null;
+@app.route("/user_logs")
+def user_logs():
+    """Get new log output of a tool session since the client's last offset"""
+    offset, generation = get_log_cursor()
+    session = get_session(request.args.get("tool"))
+    try:
+        chunk = read_log_chunk(
+            session.log_path if session else os.devnull, offset, generation
+        )
+        chunk["session"] = session.to_dict() if session else None
+        chunk["running"] = session is not None and session.poll() is None
+        return jsonify(chunk)
+    except Exception as e:
+        return jsonify(
+            {
+                "content": f"Error reading logs: {str(e)}",
+                "offset": offset,
+                "generation": generation,
+                "reset": False,
+                "more": False,
+                "running": False,
             }
-        }
-    </script>
-</body>
-</html>
-"""
+        )
 
 
-def get_runpod_id():
-    """Get RunPod instance ID from environment"""
-    return os.environ.get("RUNPOD_POD_ID", "localhost")
+def describe_tool(tool_id, session):
+    """A tool's session state as last seen by the readiness prober (no probing here)"""
+    tool = TOOLS[tool_id]
+    return {
+        "tool_id": tool_id,
+        "name": tool["name"],
+        "running": session is not None
+        and session.state in ("starting", "ready", "restarting"),
+        "port_ready": session is not None and session.state == "ready",
+        "session": session.to_dict() if session else None,
+        "installed": is_installed(tool.get("install_path")),
+    }
 
 
-def is_installed(path):
-    """Check if a tool is installed by checking directory existence"""
-    if path is None:
+@app.route("/tool_status/<tool_id>")
+def tool_status(tool_id):
+    """Session state of one tool"""
+    if tool_id not in TOOLS:
+        return jsonify({"error": "Invalid tool"})
+    return jsonify(describe_tool(tool_id, active_sessions.get(tool_id)))
+
+
+# Batched status: one /status request returns every tool with its session,
+# readiness and install state. Tools with a session get their readiness from
+# the supervisor; the ports of the others are probed concurrently (results
+# cached for STATUS_PROBE_TTL) so a port held by a process the dashboard
+# didn't start shows up. Responses carry an ETag and leave out the session
+# uptime, so polling an unchanged state is answered with a bodiless 304.
+STATUS_PROBE_TIMEOUT = 0.5  # Seconds per TCP connect; a local port answers at once
+STATUS_PROBE_TTL = 2  # Seconds a probe result is reused
+port_probes = {}  # {port: (checked_at, open)}
+port_probes_lock = threading.Lock()
+port_probe_pool = concurrent.futures.ThreadPoolExecutor(
+    8, thread_name_prefix="port-probe"
+)
+
+
+def is_port_open(port):
+    """True if something accepts TCP connections on the local port"""
+    try:
+        socket.create_connection(
+            ("127.0.0.1", port), timeout=STATUS_PROBE_TIMEOUT
+        ).close()
         return True
-    return os.path.isdir(path)
+    except OSError:
+        return False
 
 
-def get_all_users():
-    """Get list of users for dropdown from artist_names.sh"""
-    return sorted(USERS)
+def probe_ports(ports):
+    """{port: open} for the given ports, probing the ones not checked recently in parallel"""
+    now = time.time()
+    with port_probes_lock:
+        results = {
+            port: port_probes[port][1]
+            for port in ports
+            if port in port_probes and now - port_probes[port][0] < STATUS_PROBE_TTL
+        }
+    stale = [port for port in set(ports) if port not in results]
+    if stale:
+        results.update(zip(stale, port_probe_pool.map(is_port_open, stale)))
+        with port_probes_lock:
+            port_probes.update((port, (now, results[port])) for port in stale)
+    return results
+
+
+@app.route("/status")
+def status():
+    """Every tool's session, readiness and install state in one (conditional) response"""
+    with session_cond:
+        sessions = dict(active_sessions)
+    ports_open = probe_ports(
+        [t["port"] for tool_id, t in TOOLS.items() if tool_id not in sessions]
+    )
 
+    tools = {}
+    for tool_id, tool in TOOLS.items():
+        info = describe_tool(tool_id, sessions.get(tool_id))
+        if info["session"]:
+            del info["session"]["uptime"]  # Changes every second; clients use "started"
+        info["port_in_use"] = info["running"] or ports_open.get(tool["port"], False)
+        tools[tool_id] = info
 
-@app.route("/debug")
-def debug():
-    """Debug endpoint to check parsed users and admins"""
-    return jsonify(
+    response = jsonify(
         {
-            "USERS": USERS,
-            "ADMINS": ADMINS,
-            "REPO_DIR": REPO_DIR,
-            "current_artist": current_artist,
-            "is_current_admin": is_admin(current_artist) if current_artist else None,
+            "tools": tools,
+            "current_artist": get_current_artist(),
+            "admin_mode": get_admin_mode(),
         }
     )
-
-
-@app.route("/")
-def index():
-    artists = get_all_users()
-    return render_template_string(
-        HTML_TEMPLATE,
-        artists=artists,
-        admins=ADMINS,
-        tools=TOOLS,
-        current_artist=current_artist,
-        admin_mode=admin_mode,
-        active_sessions={
-            k: {"start_time": v["start_time"].isoformat() + "Z"}
-            for k, v in active_sessions.items()
-        },
-        runpod_id=get_runpod_id(),
-        is_installed=is_installed,
-        download_scripts=get_download_scripts(),
-        custom_nodes=get_custom_nodes(),
+    response.headers["Cache-Control"] = "no-cache"
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+# Dashboard state feed. What the page shows (tool sessions, jobs, model and
+# custom node inventory, per-node progress of the latest custom node install,
+# current artist) is kept as a set of fields, each
+# stamped with the version at which it last changed. Whatever changes one of
+# them calls notify_dashboard(); /dashboard long-polls until the version
+# passes the client's and returns only the fields changed since, so the page
+# patches itself instead of reloading. Versions start over with each server
+# run, so clients send back the epoch too and get the full state on a
+# mismatch. Each poll also recomputes the state once, which catches changes
+# nobody notified about within a poll cycle.
+DASHBOARD_POLL_TIMEOUT = 25  # Seconds a long poll waits; well below proxy idle timeouts
+DASHBOARD_EPOCH = os.urandom(4).hex()
+dashboard_cond = threading.Condition()  # Notified when the state may have changed
+dashboard_refresh_lock = threading.Lock()  # One recompute at a time
+dashboard_stale = True
+dashboard_version = 0
+dashboard_fields = {}  # {(section, key): (version, value, present)}
+dashboard_inventory_version = (
+    None  # inventory_version the model and node fields reflect
+)
+
+
+def notify_dashboard():
+    """Mark the dashboard state stale and wake long polls to recompute it"""
+    global dashboard_stale
+    with dashboard_cond:
+        dashboard_stale = True
+        dashboard_cond.notify_all()
+
+
+def collect_dashboard_fields(with_inventory):
+    """The current dashboard state as {(section, key): value}"""
+    with session_cond:
+        sessions = dict(active_sessions)
+    fields = {}
+    for tool_id in TOOLS:
+        info = describe_tool(tool_id, sessions.get(tool_id))
+        if info["session"]:
+            del info["session"]["uptime"]  # The page counts up from "started"
+        fields[("tools", tool_id)] = info
+    with jobs_cond:
+        for job in jobs.values():
+            fields[("jobs", job.id)] = job.to_dict()
+    fields[("artist", "current_artist")] = get_current_artist()
+    fields[("artist", "admin_mode")] = get_admin_mode()
+    task = custom_node_task
+    if task is not None:
+        progress = task.get_progress()
+        for name, entry in progress["nodes"].items():
+            fields[("node_progress", name)] = dict(entry, running=progress["running"])
+    if with_inventory:
+        for script in get_download_scripts():
+            fields[("models", script["id"])] = {
+                "installed": script["installed"],
+                "total": script["total"],
+            }
+        for node in get_custom_nodes():
+            fields[("nodes", node["repo_name"])] = node["installed"]
+    return fields
+
+
+def refresh_dashboard(force=False):
+    """Recompute the dashboard state when stale, stamping fields that changed"""
+    global dashboard_stale, dashboard_version, dashboard_inventory_version
+    with dashboard_refresh_lock:
+        with dashboard_cond:
+            if not (dashboard_stale or force):
+                return
+            dashboard_stale = False
+        # Inventory fields are only rebuilt when the inventory changed
+        seen_inventory = inventory_version
+        with_inventory = seen_inventory != dashboard_inventory_version
+        fields = collect_dashboard_fields(with_inventory)
+
+        with dashboard_cond:
+            changed = [
+                key
+                for key, value in fields.items()
+                if dashboard_fields.get(key, (None, None, False))[1:] != (value, True)
+            ]
+            removed = [
+                key
+                for key, (version, value, present) in dashboard_fields.items()
+                if present
+                and key not in fields
+                and (with_inventory or key[0] not in ("models", "nodes"))
+            ]
+            if changed or removed:
+                dashboard_version += 1
+                for key in changed:
+                    dashboard_fields[key] = (dashboard_version, fields[key], True)
+                for key in removed:
+                    dashboard_fields[key] = (dashboard_version, None, False)
+                dashboard_cond.notify_all()
+        dashboard_inventory_version = seen_inventory
+
+
+def get_dashboard_changes(since):
+    """(version, {section: {key: value}}) for fields changed after version since"""
+    changes = {}
+    with dashboard_cond:
+        for (section, key), (version, value, present) in dashboard_fields.items():
+            if version > since and (since or present):
+                changes.setdefault(section, {})[key] = value
+        return dashboard_version, changes
+
+
+@app.route("/dashboard")
+def dashboard():
+    """
+    Long poll for dashboard state changes. Pass ?epoch=E&since=N from the
+    previous response to get the fields changed since version N, as soon as
+    there are any (or none after DASHBOARD_POLL_TIMEOUT). Without them, or
+    after a server restart, the full state is returned ("full": true).
+    Removed fields (e.g. pruned jobs) come back as null.
+    """
+    since = request.args.get("since", default=0, type=int)
+    if request.args.get("epoch") != DASHBOARD_EPOCH:
+        since = 0
+
+    deadline = time.time() + DASHBOARD_POLL_TIMEOUT
+    refresh_dashboard(force=True)
+    while True:
+        with dashboard_cond:
+            if dashboard_version > since:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if not dashboard_stale:
+                dashboard_cond.wait(remaining)
+        refresh_dashboard()
+
+    version, changes = get_dashboard_changes(since)
+    response = jsonify(
+        {
+            "epoch": DASHBOARD_EPOCH,
+            "version": version,
+            "full": since == 0,
+            "changes": changes,
+        }
     )
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 
-@app.route("/set_artist", methods=["POST"])
-def set_artist():
-    global current_artist, admin_mode
-    data = request.get_json()
-    current_artist = data.get("artist", "")
-
-    # Reset admin mode if not an admin
-    if not is_admin(current_artist):
-        admin_mode = False
-
-    return jsonify({"success": True})
-
-
-@app.route("/set_admin_mode", methods=["POST"])
-def set_admin_mode():
-    global admin_mode
-    data = request.get_json()
-
-    # Only allow admin mode for admins
-    if is_admin(current_artist):
-        admin_mode = data.get("admin_mode", False)
-
-    return jsonify({"success": True})
-
-
-@app.route("/start_session", methods=["POST"])
-def start_session():
-    global active_sessions, user_process_running
-
-    data = request.get_json()
-    tool_id = data.get("tool_id")
-    artist = data.get("artist")
-
-    if not tool_id or tool_id not in TOOLS:
-        return jsonify({"success": False, "message": "Invalid tool"})
-
-    if not artist:
-        return jsonify({"success": False, "message": "No artist selected"})
-
-    tool = TOOLS[tool_id]
-    process = None
-
-    # Create artist output directory if ComfyUI
-    if tool_id == "comfy-ui":
-        output_dir = f"/workspace/ComfyUI/output/{artist}"
-        os.makedirs(output_dir, exist_ok=True)
-
-    # Start the actual service
+@app.route("/logs")
+def get_logs():
+    """Get new log output of a job (default: the latest) since the client's last offset"""
+    offset, generation = get_log_cursor()
+    job = get_job(request.args.get("job"))
     try:
-        if tool_id == "jupyter-lab":
-            # Kill any existing jupyter on the port
-            subprocess.run(["fuser", "-k", "8888/tcp"], capture_output=True)
-            time.sleep(1)
-
-            # Setup log capture
-            user_process_running = True
-            with open(USER_LOG_FILE, "w") as f:
-                f.write(f"=== Starting JupyterLab ===\n")
-                f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-                f.write("=" * 40 + "\n\n")
-
-            log_file = open(USER_LOG_FILE, "a")
-            process = subprocess.Popen(
-                [
-                    "jupyter",
-                    "lab",
-                    "--ip=0.0.0.0",
-                    "--port=8888",
-                    "--no-browser",
-                    "--allow-root",
-                    "--NotebookApp.token=",
-                    "--NotebookApp.password=",
-                ],
-                cwd="/workspace",
-                stdout=log_file,
-                stderr=log_file,
-            )
+        chunk = read_log_chunk(job.log_path, offset, generation)
+    except:
+        chunk = {
+            "content": "",
+            "offset": offset,
+            "generation": generation,
+            "reset": False,
+            "more": False,
+        }
 
-            def monitor_process():
-                global user_process_running
-                process.wait()
-                with open(USER_LOG_FILE, "a") as f:
-                    f.write(
-                        f"\n=== Process exited with code: {process.returncode} ===\n"
-                    )
-                user_process_running = False
-
-            threading.Thread(target=monitor_process, daemon=True).start()
-
-        elif tool_id == "comfy-ui":
-            # Start ComfyUI using start script
-            start_script = get_setup_script("comfy-ui", "start")
-            if start_script:
-                # Setup log capture
-                user_process_running = True
-                with open(USER_LOG_FILE, "w") as f:
-                    f.write(f"=== Starting ComfyUI ===\n")
-                    f.write(f"Script: {start_script}\n")
-                    f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-                    f.write("=" * 40 + "\n\n")
-
-                log_file = open(USER_LOG_FILE, "a")
-                env = os.environ.copy()
-                env["HF_HOME"] = "/workspace"
-                env["HF_HUB_ENABLE_HF_TRANSFER"] = "1"
-                env["COMFY_OUTPUT_DIR"] = f"/workspace/ComfyUI/output/{artist}"
-                process = subprocess.Popen(
-                    ["bash", start_script],
-                    cwd="/workspace/ComfyUI",
-                    env=env,
-                    stdout=log_file,
-                    stderr=log_file,
-                )
+    chunk["job"] = job.to_dict() if job else None
+    chunk["running"] = job is not None and job.poll() is None
+    return jsonify(chunk)
 
-                def monitor_process():
-                    global user_process_running
-                    process.wait()
-                    with open(USER_LOG_FILE, "a") as f:
-                        f.write(
-                            f"\n=== Process exited with code: {process.returncode} ===\n"
-                        )
-                    user_process_running = False
 
-                threading.Thread(target=monitor_process, daemon=True).start()
-            else:
-                return jsonify(
-                    {"success": False, "message": "ComfyUI start script not found"}
-                )
+def format_sse(event, data, event_id=None):
+    """Format a Server-Sent Events message"""
+    message = ""
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    message += f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return message
 
-        elif tool_id == "ai-toolkit":
-            # Kill any existing ai-toolkit on the port
-            subprocess.run(["fuser", "-k", "8675/tcp"], capture_output=True)
-            time.sleep(1)
-            # Start AI-Toolkit using start script with log capture
-            start_script = get_setup_script("ai-toolkit", "start")
-            if start_script:
-                # Clear and open log file
-                user_process_running = True
-                with open(USER_LOG_FILE, "w") as f:
-                    f.write(f"=== Starting AI-Toolkit ===\n")
-                    f.write(f"Script: {start_script}\n")
-                    f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-                    f.write("=" * 40 + "\n\n")
-
-                log_file = open(USER_LOG_FILE, "a")
-                process = subprocess.Popen(
-                    ["bash", start_script],
-                    cwd="/workspace/ai-toolkit",
-                    stdout=log_file,
-                    stderr=log_file,
-                )
 
-                # Monitor process in background thread
-                def monitor_process():
-                    global user_process_running
-                    process.wait()
-                    with open(USER_LOG_FILE, "a") as f:
-                        f.write(
-                            f"\n=== Process exited with code: {process.returncode} ===\n"
-                        )
-                    user_process_running = False
+@app.route("/logs/stream")
+def stream_logs():
+    """
+    Stream log output as Server-Sent Events.
+    Query params: log ('admin' or 'user'), job (job id for admin logs, default
+    the latest job), tool (tool_id of a user session, default the latest),
+    offset/generation to resume. Emits 'log' events with new output and 'exit'
+    when the process finishes. User sessions also get a 'state' event on every session state
+    change, 'port_ready' once the readiness prober finds the tool healthy and
+    'exit' (with the error) when it fails. The stream ends after 'port_ready'
+    or 'exit'.
+    """
+    log_name = request.args.get("log", "admin")
+    if log_name not in ("admin", "user"):
+        return jsonify({"error": "Invalid log"})
 
-                threading.Thread(target=monitor_process, daemon=True).start()
-            else:
-                raise Exception("AI-Toolkit start script not found")
-
-        elif tool_id == "swarm-ui":
-            # Kill any existing swarm-ui on the port
-            subprocess.run(["fuser", "-k", "7861/tcp"], capture_output=True)
-            time.sleep(1)
-            # Start SwarmUI using start script with log capture
-            start_script = get_setup_script("swarm-ui", "start")
-            if start_script:
-                # Clear and open log file
-                user_process_running = True
-                with open(USER_LOG_FILE, "w") as f:
-                    f.write(f"=== Starting SwarmUI ===\n")
-                    f.write(f"Script: {start_script}\n")
-                    f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-                    f.write("=" * 40 + "\n\n")
-
-                log_file = open(USER_LOG_FILE, "a")
-                process = subprocess.Popen(
-                    ["bash", start_script],
-                    cwd="/workspace/SwarmUI",
-                    stdout=log_file,
-                    stderr=log_file,
-                )
+    tool_id = request.args.get("tool")
+    offset, generation = get_log_cursor()
 
-                # Monitor process in background thread
-                def monitor_process():
-                    global user_process_running
-                    process.wait()
-                    with open(USER_LOG_FILE, "a") as f:
-                        f.write(
-                            f"\n=== Process exited with code: {process.returncode} ===\n"
-                        )
-                    user_process_running = False
+    # EventSource reconnects send back the last event id as "generation:offset"
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    if ":" in last_event_id:
+        try:
+            generation, offset = (int(part) for part in last_event_id.split(":", 1))
+        except ValueError:
+            pass
 
-                threading.Thread(target=monitor_process, daemon=True).start()
-            else:
-                raise Exception("SwarmUI start script not found")
-
-        elif tool_id == "lora-tool":
-            # Kill any existing lora-tool on the port
-            subprocess.run(["fuser", "-k", "3000/tcp"], capture_output=True)
-            time.sleep(1)
-            # Start LoRA-Tool using start script (runs from repo directory)
-            start_script = get_setup_script("lora-tool", "start")
-            if start_script:
-                process = subprocess.Popen(
-                    ["bash", start_script],
-                    cwd=os.path.join(REPO_DIR, "setup", "lora-tool"),
-                )
+    if log_name == "admin":
+        process = get_job(request.args.get("job"))
+        path = process.log_path if process else os.devnull
+        session = None
+    else:
+        session = get_session(tool_id)
+        path = session.log_path if session else os.devnull
+        process = None
+
+    def generate():
+        cursor_offset, cursor_generation = offset, generation
+        last_sent = time.time()
+        last_state = None
+        exit_seen = False
+
+        while True:
+            if session is not None:
+                exited = session.state in ("failed", "stopped")
+                exit_info = {
+                    "exit_code": session.process.poll() if session.process else None,
+                    "error": session.error,
+                }
             else:
-                raise Exception("LoRA-Tool start script not found")
-
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Failed to start: {str(e)}"})
-
-    active_sessions[tool_id] = {
-        "process": process,
-        "start_time": datetime.utcnow(),
-        "artist": artist,
-    }
-
-    return jsonify(
-        {
-            "success": True,
-            "tool_name": tool["name"],
-            "message": f"{tool['name']} session started",
-        }
-    )
-
-
-@app.route("/stop_session", methods=["POST"])
-def stop_session():
-    global active_sessions
-
-    data = request.get_json()
-    tool_id = data.get("tool_id")
-
-    if not tool_id or tool_id not in TOOLS:
-        return jsonify({"success": False, "message": "Invalid tool"})
+                exited = process is None or process.poll() is not None
+                exit_info = {"exit_code": process.returncode if process else None}
+            chunk = read_log_chunk(path, cursor_offset, cursor_generation)
+            cursor_offset, cursor_generation = chunk["offset"], chunk["generation"]
+
+            if chunk["content"] or chunk["reset"]:
+                yield format_sse("log", chunk, f"{cursor_generation}:{cursor_offset}")
+                last_sent = time.time()
+                if chunk["more"]:
+                    continue  # Still catching up, skip the sleep
+
+            if exited and not chunk["content"]:
+                # Allow one extra tick for the exit footer written after wait()
+                if exit_seen:
+                    yield format_sse("exit", exit_info)
+                    return
+                exit_seen = True
+
+            if session is not None and session.state != last_state:
+                last_state = session.state
+                yield format_sse("state", session.to_dict())
+                if last_state == "ready":
+                    port = TOOLS[session.tool_id]["port"]
+                    yield format_sse(
+                        "port_ready",
+                        {
+                            "tool_id": session.tool_id,
+                            "port": port,
+                            "ready_after": session.ready_after,
+                        },
+                    )
+                    return
 
-    tool = TOOLS[tool_id]
+            now = time.time()
 
-    # Kill the process if running
-    if tool_id in active_sessions:
-        session = active_sessions[tool_id]
-        if session.get("process"):
-            session["process"].terminate()
+            if now - last_sent >= STREAM_HEARTBEAT_INTERVAL:
+                yield ": keepalive\n\n"
+                last_sent = now
 
-        # Kill by port
-        port = tool["port"]
-        subprocess.run(["fuser", "-k", f"{port}/tcp"], capture_output=True)
+            time.sleep(STREAM_POLL_INTERVAL)
 
-        del active_sessions[tool_id]
-
-    return jsonify(
-        {
-            "success": True,
-            "tool_name": tool["name"],
-            "message": f"{tool['name']} stopped",
-        }
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-@app.route("/user_logs")
-def user_logs():
-    """Get user process logs for streaming to terminal"""
+@app.route("/clear_logs", methods=["POST"])
+def clear_logs():
+    """Clear the log of a finished job (running jobs keep theirs)"""
+    data = request.get_json(silent=True) or {}
+    job = get_job(data.get("job_id")) if data.get("job_id") else None
+    if job is None or job.poll() is None:
+        return jsonify({"success": True})
     try:
-        if os.path.exists(USER_LOG_FILE):
-            with open(USER_LOG_FILE, "r") as f:
-                content = f.read()
-        else:
-            content = ""
-        return jsonify({"content": content, "running": user_process_running})
+        with reset_log(job.log_path) as f:
+            f.write("")
+        return jsonify({"success": True})
     except Exception as e:
-        return jsonify({"content": f"Error reading logs: {str(e)}", "running": False})
+        return jsonify({"success": False, "message": str(e)})
 
 
-def check_port_open(port, timeout=1):
-    """Check if a port is actually responding"""
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        result = sock.connect_ex(("127.0.0.1", port))
-        sock.close()
-        return result == 0
-    except:
-        return False
+# Background jobs. Admin operations (tool install/update, model downloads,
+# custom node installs) are queued as jobs, each with its own id and log file,
+# and run by a small worker pool. Jobs on the same resource (e.g. a ComfyUI
+# update and a custom node install) run one at a time in submission order;
+# unrelated jobs run side by side.
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "3"))
+JOB_LOG_DIR = "/tmp/comfystudio-jobs"
+JOB_HISTORY = 50  # Finished jobs kept for /jobs
+jobs = {}  # {job_id: Job} in submission order
+jobs_cond = threading.Condition()
+job_workers = []
+latest_job_id = None  # Job shown by /logs when the client doesn't name one
 
 
-@app.route("/tool_status/<tool_id>")
-def tool_status(tool_id):
-    if tool_id not in TOOLS:
-        return jsonify({"error": "Invalid tool"})
+class Job:
+    """
+    A queued admin operation. launch(log_file) starts the work and returns a
+    Popen-like object; the job itself exposes poll()/returncode so log
+    streaming can treat it like a process.
+    """
 
-    tool = TOOLS[tool_id]
-    is_running = tool_id in active_sessions
+    def __init__(self, kind, title, resource, launch, on_finish=None):
+        self.id = os.urandom(4).hex()
+        self.kind = kind
+        self.title = title
+        self.resource = resource
+        self.launch = launch
+        self.on_finish = on_finish
+        self.status = "queued"  # queued, running, done, failed, cancelled
+        self.returncode = None
+        self.process = None
+        self.cancel_requested = False
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.log_path = os.path.join(JOB_LOG_DIR, f"{self.id}.log")
+
+    def poll(self):
+        return self.returncode if self.finished else None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "title": self.title,
+            "resource": self.resource,
+            "status": self.status,
+            "exit_code": self.returncode,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def submit_job(kind, title, resource, header, launch, on_finish=None):
+    """Queue a job; header lines are written to its log straight away"""
+    global latest_job_id
+    os.makedirs(JOB_LOG_DIR, exist_ok=True)
+    job = Job(kind, title, resource, launch, on_finish)
+
+    with reset_log(job.log_path) as f:
+        f.write(f"=== {title} ===\n")
+        for line in header:
+            f.write(line + "\n")
+        f.write(f"Queued at: {datetime.utcnow().isoformat()}Z\n")
+        f.write("=" * 40 + "\n\n")
+
+    with jobs_cond:
+        jobs[job.id] = job
+        latest_job_id = job.id
+        while len(job_workers) < JOB_WORKERS:
+            worker = threading.Thread(target=job_worker, daemon=True)
+            worker.start()
+            job_workers.append(worker)
+        jobs_cond.notify_all()
+    notify_dashboard()
+    return job
+
+
+def next_runnable_job():
+    """Oldest queued job whose resource is free (call with jobs_cond held)"""
+    busy = {job.resource for job in jobs.values() if job.status == "running"}
+    for job in jobs.values():
+        if job.status == "queued" and job.resource not in busy:
+            return job
+    return None
 
-    # Also check if port is actually responding (service is ready)
-    port_ready = False
-    if is_running and tool.get("port"):
-        port_ready = check_port_open(tool["port"])
 
-    return jsonify(
-        {
-            "tool_id": tool_id,
-            "name": tool["name"],
-            "running": is_running,
-            "port_ready": port_ready,
-            "installed": is_installed(tool.get("install_path")),
-        }
-    )
+def job_worker():
+    """Worker thread running queued jobs"""
+    while True:
+        with jobs_cond:
+            job = next_runnable_job()
+            while job is None:
+                jobs_cond.wait()
+                job = next_runnable_job()
+            job.status = "running"
+            job.started = time.time()
+        notify_dashboard()
+        run_job(job)
+
+
+def run_job(job):
+    """Run a job to completion and record its outcome"""
+    returncode = 1
+    log_file = get_log_store(job.log_path)
+    try:
+        log_file.write(f"Started at: {datetime.utcnow().isoformat()}Z\n\n")
+        log_file.flush()
+        process = job.launch(log_file)
+        with jobs_cond:
+            job.process = process
+            cancelled = job.cancel_requested
+        if cancelled:
+            process.terminate()
+        returncode = process.wait()
+    except Exception as e:
+        log_file.write(f"Failed to run job: {e}\n")
+    finally:
+        log_file.close()
+        log_file.write(f"\n=== Process completed with exit code: {returncode} ===\n")
+        finish_job(job, returncode)
+
+
+def finish_job(job, returncode):
+    """Mark a job finished, wake workers waiting on its resource and prune history"""
+    with jobs_cond:
+        job.returncode = returncode
+        if job.cancel_requested:
+            job.status = "cancelled"
+        else:
+            job.status = "done" if returncode == 0 else "failed"
+        job.finished = time.time()
 
+        finished = [j for j in jobs.values() if j.finished]
+        pruned = finished[: max(len(finished) - JOB_HISTORY, 0)]
+        for old in pruned:
+            del jobs[old.id]
+        jobs_cond.notify_all()
+    notify_dashboard()
 
-@app.route("/logs")
-def get_logs():
-    """Get current log file contents"""
-    global running_process
+    # Outside the lock: closing a store can wait for its pump thread
+    for old in pruned:
+        drop_log_store(old.log_path)
 
-    content = ""
-    if os.path.exists(LOG_FILE):
+    if job.on_finish:
         try:
-            with open(LOG_FILE, "r") as f:
-                content = f.read()
-        except:
-            pass
-
-    # Check if process is still running
-    process_running = False
-    if running_process is not None:
-        poll_result = running_process.poll()
-        process_running = poll_result is None
-        if not process_running:
-            running_process = None
-
-    return jsonify({"content": content, "running": process_running})
-
-
-@app.route("/clear_logs", methods=["POST"])
-def clear_logs():
-    """Clear the log file"""
-    try:
-        with open(LOG_FILE, "w") as f:
-            f.write("")
-        return jsonify({"success": True})
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)})
+            job.on_finish()
+        except Exception as e:
+            print(f"Error after job {job.id}: {e}")
+
+
+def cancel_job(job):
+    """Cancel a queued job, or terminate a running one"""
+    with jobs_cond:
+        if job.finished:
+            return False
+        job.cancel_requested = True
+        queued = job.status == "queued"
+        if queued:
+            job.status = "cancelled"  # Keeps workers from picking it up
+        process = job.process
+
+    if queued:
+        get_log_store(job.log_path).write("\n=== Cancelled before it started ===\n")
+        finish_job(job, -signal.SIGTERM)
+    elif process:
+        process.terminate()
+    return True
+
+
+def get_job(job_id=None):
+    """Look up a job by id, defaulting to the most recently submitted one"""
+    with jobs_cond:
+        return jobs.get(job_id or latest_job_id)
+
+
+def describe_job_start(job):
+    """'queued' if the job waits behind another on its resource, else 'started'"""
+    with jobs_cond:
+        for other in jobs.values():
+            if other is job:
+                return "started"
+            if other.resource == job.resource and not other.finished:
+                return "queued"
+    return "started"
+
+
+@app.route("/jobs")
+def list_jobs():
+    """List queued, running and recently finished jobs"""
+    with jobs_cond:
+        job_list = [job.to_dict() for job in jobs.values()]
+    return jsonify({"success": True, "jobs": job_list})
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    """Status of a single job"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Unknown job"})
+    return jsonify({"success": True, "job": job.to_dict()})
+
+
+@app.route("/jobs/<job_id>/cancel", methods=["POST"])
+def job_cancel(job_id):
+    """Cancel a queued or running job"""
+    if not is_admin(get_current_artist()):
+        return jsonify({"success": False, "message": "Unauthorized"})
+
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Unknown job"})
+    if not cancel_job(job):
+        return jsonify({"success": False, "message": "Job already finished"})
+    return jsonify({"success": True, "message": f"Cancelling {job.title}"})
 
 
 @app.route("/admin_action", methods=["POST"])
 def admin_action():
     """Handle admin install/update actions"""
-    global current_artist
-
     # Check if user is admin
-    if not is_admin(current_artist):
+    if not is_admin(get_current_artist()):
         return jsonify({"success": False, "message": "Unauthorized"})
 
     data = request.get_json()
@@ -2336,21 +2442,8 @@ def admin_action():
             }
         )
 
-    try:
-        global running_process
-
-        # Clear log file first
-        with open(LOG_FILE, "w") as f:
-            f.write(f"=== {action.capitalize()} {tool['name']} ===\n")
-            f.write(f"Script: {script_path}\n")
-            f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-            f.write("=" * 40 + "\n\n")
-
-        # Open log file for appending
-        log_file = open(LOG_FILE, "a")
-
-        # Run the install script with output to log file
-        running_process = subprocess.Popen(
+    def launch(log_file):
+        return subprocess.Popen(
             ["bash", script_path],
             stdout=log_file,
             stderr=subprocess.STDOUT,
@@ -2358,23 +2451,23 @@ def admin_action():
             bufsize=1,  # Line buffered
         )
 
-        # Start a thread to close the log file when process completes
-        def wait_and_close():
-            running_process.wait()
-            log_file.write(
-                f"\n=== Process completed with exit code: {running_process.returncode} ===\n"
-            )
-            log_file.close()
-
-        thread = threading.Thread(target=wait_and_close, daemon=True)
-        thread.start()
+    try:
+        job = submit_job(
+            "tool",
+            f"{action.capitalize()} {tool['name']}",
+            tool_id,
+            [f"Script: {script_path}"],
+            launch,
+            on_finish=trim_wheel_cache,
+        )
 
-        # Return immediately - script runs in background
+        # Return immediately - the job runs in the background
         return jsonify(
             {
                 "success": True,
+                "job_id": job.id,
                 "tool_name": tool["name"],
-                "message": f"{action.capitalize()} started for {tool['name']}. Check terminal for progress.",
+                "message": f"{action.capitalize()} {describe_job_start(job)} for {tool['name']}. Check terminal for progress.",
                 "script": script_path,
             }
         )
@@ -2383,13 +2476,871 @@ def admin_action():
         return jsonify({"success": False, "message": f"Failed to run script: {str(e)}"})
 
 
+# Model download engine. Files listed in the selected download scripts are
+# fetched concurrently; large files are split into HTTP range requests spread
+# over pooled keep-alive connections, with a per-host connection limit. The
+# original scripts still run afterwards and skip whatever is already present,
+# so anything the engine can't handle falls back to wget/curl.
+DOWNLOAD_CONNECTIONS = int(os.environ.get("DOWNLOAD_CONNECTIONS", "16"))
+DOWNLOAD_HOST_CONNECTIONS = {"default": 8, "civitai.com": 4}  # Per-host limits
+DOWNLOAD_MAX_FILES = 4  # Files probed/assembled at the same time
+DOWNLOAD_SEGMENT_SIZE = 64 * 1024 * 1024  # Bytes per range request
+DOWNLOAD_READ_SIZE = 1024 * 1024
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_MAX_REDIRECTS = 10
+DOWNLOAD_PROGRESS_INTERVAL = 5  # Seconds between progress lines in the log
+DOWNLOAD_SAMPLE_INTERVAL = 1  # Seconds between throughput samples
+DOWNLOAD_RATE_SMOOTHING = 0.2  # Weight of the newest sample in the moving average
+DOWNLOAD_JOURNAL_INTERVAL = 10  # Seconds between resume journal writes
+
+download_task = (
+    None  # Latest DownloadTask, kept after it finishes for /download_progress
+)
+download_connections = threading.local()  # Per-thread {(scheme, netloc): conn}
+download_host_semaphores = {}
+download_host_lock = threading.Lock()
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class DownloadHTTPError(IOError):
+    def __init__(self, status, reason):
+        super().__init__(f"HTTP {status} {reason}")
+        self.status = status
+
+
+class DownloadChecksumError(IOError):
+    pass
+
+
+def is_retryable_download_error(error):
+    """Client errors (bad URL, missing auth) won't fix themselves on retry"""
+    if isinstance(error, DownloadHTTPError):
+        return error.status >= 500 or error.status in (408, 429)
+    return True
+
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_duration(seconds):
+    """Human readable duration, e.g. 1h02m or 4m05s"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def get_host_semaphore(host):
+    """Semaphore bounding concurrent connections to a host"""
+    with download_host_lock:
+        if host not in download_host_semaphores:
+            limit = DOWNLOAD_HOST_CONNECTIONS.get(
+                host, DOWNLOAD_HOST_CONNECTIONS["default"]
+            )
+            download_host_semaphores[host] = threading.BoundedSemaphore(limit)
+        return download_host_semaphores[host]
+
+
+def get_download_connection(scheme, netloc):
+    """Get this thread's pooled keep-alive connection to a host"""
+    pool = getattr(download_connections, "pool", None)
+    if pool is None:
+        pool = download_connections.pool = {}
+    conn = pool.get((scheme, netloc))
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=DOWNLOAD_TIMEOUT)
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=DOWNLOAD_TIMEOUT)
+        pool[(scheme, netloc)] = conn
+    return conn
+
+
+def drop_download_connection(url):
+    """Close and forget this thread's connection for a URL's host"""
+    parts = urlsplit(url)
+    pool = getattr(download_connections, "pool", {})
+    conn = pool.pop((parts.scheme, parts.netloc), None)
+    if conn:
+        conn.close()
+
+
+def get_download_headers(url, tokens):
+    """Auth headers for a download URL"""
+    host = urlsplit(url).netloc
+    if host.endswith("huggingface.co") and tokens.get("hf"):
+        return {"Authorization": f"Bearer {tokens['hf']}"}
+    if host.endswith("civitai.com") and tokens.get("civit"):
+        return {"Authorization": f"Bearer {tokens['civit']}"}
+    return {}
+
+
+def open_download(url, headers, byte_range=None, seen_headers=None):
+    """
+    GET a URL on a pooled connection, following redirects.
+    Credentials are dropped when redirected to another host (signed CDN URLs
+    reject them). Returns (response, final_url); the caller must read the
+    response fully or drop the connection. If seen_headers is a list, the
+    headers of every response along the redirect chain are appended to it.
+    """
+    headers = dict(headers)
+    headers.setdefault("User-Agent", "ComfyStudio")
+    if byte_range:
+        headers["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+
+    for _ in range(DOWNLOAD_MAX_REDIRECTS):
+        parts = urlsplit(url)
+        conn = get_download_connection(parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            drop_download_connection(url)
+            raise
+        if seen_headers is not None:
+            seen_headers.append(response.headers)
+
+        if response.status in (301, 302, 303, 307, 308):
+            response.read()
+            next_url = urljoin(url, response.getheader("Location", ""))
+            if urlsplit(next_url).netloc != parts.netloc:
+                headers.pop("Authorization", None)
+            url = next_url
+            continue
+
+        if response.status >= 400:
+            response.read()
+            raise DownloadHTTPError(response.status, response.reason)
+        return response, url
+
+    raise IOError("Too many redirects")
+
+
+def probe_download(url, headers):
+    """
+    Resolve redirects and find the file size, range support and, where the
+    server advertises it, the content SHA-256.
+    Returns (final_url, size or None, supports_ranges, sha256 or None).
+    """
+    seen_headers = []
+    response, final_url = open_download(url, headers, (0, 0), seen_headers)
+    sha256 = get_content_sha256(seen_headers)
+    if response.status == 206:
+        response.read()
+        content_range = response.getheader("Content-Range", "")
+        total = content_range.rpartition("/")[2]
+        return final_url, int(total) if total.isdigit() else None, True, sha256
+
+    length = response.getheader("Content-Length")
+    drop_download_connection(final_url)  # Don't pull the whole body here
+    return (
+        final_url,
+        int(length) if length and length.isdigit() else None,
+        False,
+        sha256,
+    )
+
+
+def fetch_segment(url, headers, fd, start, end, on_bytes, should_stop):
+    """
+    Download bytes [start, end] of a URL into fd, retrying from where it stopped.
+    Each request re-follows the redirect, so expiring signed CDN URLs are renewed.
+    on_bytes(offset, count) is called after every chunk is written.
+    """
+    offset = start
+    attempt = 0
+    host = urlsplit(url).netloc
+
+    with get_host_semaphore(host):
+        while offset <= end:
+            if should_stop():
+                raise DownloadCancelled()
+            final_url = url
+            try:
+                response, final_url = open_download(url, headers, (offset, end))
+                if response.status != 206:
+                    raise IOError(
+                        f"Expected partial content, got HTTP {response.status}"
+                    )
+                while offset <= end:
+                    if should_stop():
+                        drop_download_connection(final_url)
+                        raise DownloadCancelled()
+                    chunk = response.read(min(DOWNLOAD_READ_SIZE, end - offset + 1))
+                    if not chunk:
+                        raise IOError("Connection closed early")
+                    os.pwrite(fd, chunk, offset)
+                    on_bytes(offset, len(chunk))
+                    offset += len(chunk)
+            except (http.client.HTTPException, OSError) as e:
+                drop_download_connection(final_url)
+                attempt += 1
+                if attempt > DOWNLOAD_RETRIES or not is_retryable_download_error(e):
+                    raise IOError(f"bytes {offset}-{end}: {e}")
+                time.sleep(min(2**attempt, 30))
+
+
+def fetch_stream(url, headers, fd, on_bytes, on_restart, should_stop):
+    """Download a URL into fd in one stream (for servers without range support)"""
+    attempt = 0
+    while True:
+        if should_stop():
+            raise DownloadCancelled()
+        final_url = url
+        try:
+            response, final_url = open_download(url, headers)
+            os.ftruncate(fd, 0)
+            on_restart()
+            offset = 0
+            while True:
+                if should_stop():
+                    drop_download_connection(final_url)
+                    raise DownloadCancelled()
+                chunk = response.read(DOWNLOAD_READ_SIZE)
+                if not chunk:
+                    return
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                on_bytes(len(chunk))
+        except (http.client.HTTPException, OSError) as e:
+            drop_download_connection(final_url)
+            attempt += 1
+            if attempt > DOWNLOAD_RETRIES or not is_retryable_download_error(e):
+                raise
+            time.sleep(min(2**attempt, 30))
+
+
+def merge_byte_ranges(ranges):
+    """Merge inclusive [start, end] byte ranges into a sorted, non-overlapping list"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_byte_ranges(done, size):
+    """Inclusive byte ranges of a file of the given size not covered by done"""
+    missing = []
+    position = 0
+    for start, end in merge_byte_ranges(done):
+        if start > position:
+            missing.append((position, start - 1))
+        position = max(position, end + 1)
+    if position < size:
+        missing.append((position, size - 1))
+    return missing
+
+
+class DownloadJournal:
+    """
+    On-disk record of the byte ranges already written to a .part file, so an
+    interrupted download (pod stop, server restart, network drop) resumes
+    instead of starting over. Stored next to the .part file as JSON.
+    """
+
+    def __init__(self, path, url, size, done=None):
+        self.path = path
+        self.url = url
+        self.size = size
+        self.done = merge_byte_ranges(done or [])
+        self.lock = threading.Lock()
+        self.flushed_at = time.time()
+
+    @classmethod
+    def load(cls, path, url, size):
+        """Load a journal, or return an empty one if missing or for another file"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("url") == url and data.get("size") == size:
+                return cls(path, url, size, data.get("done"))
+        except (OSError, ValueError, TypeError):
+            pass
+        return cls(path, url, size)
+
+    def completed_bytes(self):
+        with self.lock:
+            return sum(end - start + 1 for start, end in self.done)
+
+    def missing(self):
+        with self.lock:
+            return missing_byte_ranges(self.done, self.size)
+
+    def add(self, start, end):
+        with self.lock:
+            self.done = merge_byte_ranges(self.done + [[start, end]])
+
+    def flush(self, fd):
+        """Persist the journal; data is fsync'ed first so the journal never runs ahead of it"""
+        os.fsync(fd)
+        with self.lock:
+            data = {"url": self.url, "size": self.size, "done": self.done}
+            self.flushed_at = time.time()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def maybe_flush(self, fd):
+        if time.time() - self.flushed_at >= DOWNLOAD_JOURNAL_INTERVAL:
+            self.flush(fd)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# Content-addressed model store. Downloaded files are kept once under
+# MODEL_STORE_DIR keyed by SHA-256 and hardlinked into each model folder that
+# needs them, so a VAE or text encoder shared by several model sets (or laid
+# out differently by different scripts) is only fetched and stored once.
+# URL -> hash lookups are kept in an index; Hugging Face also reports the
+# SHA-256 of LFS files before download, which catches the same file published
+# under different URLs.
+MODEL_STORE_DIR = "/workspace/.model-store"
+MODEL_STORE_INDEX = os.path.join(MODEL_STORE_DIR, "index.json")
+MODEL_STORE_HASH_HEADERS = ("X-Linked-Etag", "ETag")
+model_store_index = None  # {url: {"sha256": str, "size": int}} (None until loaded)
+model_store_lock = threading.Lock()
+
+
+def get_blob_path(sha256):
+    """Path of a blob in the model store"""
+    return os.path.join(MODEL_STORE_DIR, "sha256", sha256[:2], sha256)
+
+
+def get_content_sha256(header_list):
+    """Find a SHA-256 advertised in response headers (e.g. Hugging Face LFS ETags)"""
+    for headers in header_list:
+        for name in MODEL_STORE_HASH_HEADERS:
+            value = (headers.get(name) or "").strip()
+            if value.startswith("W/"):
+                value = value[2:]
+            value = value.strip('"').lower()
+            if len(value) == 64 and all(c in "0123456789abcdef" for c in value):
+                return value
+    return None
+
+
+def get_model_store_index():
+    """Load the URL -> hash index on first use"""
+    global model_store_index
+    with model_store_lock:
+        if model_store_index is None:
+            try:
+                with open(MODEL_STORE_INDEX) as f:
+                    model_store_index = json.load(f)
+            except (OSError, ValueError):
+                model_store_index = {}
+        return model_store_index
+
+
+def record_model_store_url(url, sha256, size):
+    """Remember which blob a URL resolved to"""
+    index = get_model_store_index()
+    with model_store_lock:
+        index[url] = {"sha256": sha256, "size": size}
+        os.makedirs(MODEL_STORE_DIR, exist_ok=True)
+        tmp_path = MODEL_STORE_INDEX + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, MODEL_STORE_INDEX)
+
+
+def hash_file(path):
+    """SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(DOWNLOAD_READ_SIZE * 4)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_blob(blob_path, dest):
+    """
+    Atomically point dest at a blob: a hardlink, or a symlink when the two
+    are on different filesystems.
+    """
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = dest + ".link"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(blob_path, tmp_path)
+    except OSError:
+        os.symlink(blob_path, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+def resolve_from_model_store(url, sha256=None):
+    """Blob path for a URL (or a known hash) if the store already has it"""
+    if not sha256:
+        entry = get_model_store_index().get(url)
+        sha256 = entry and entry.get("sha256")
+    if sha256:
+        blob_path = get_blob_path(sha256)
+        if os.path.exists(blob_path):
+            return blob_path
+    return None
+
+
+def add_to_model_store(path, url, expected_sha256=None):
+    """
+    Move a freshly downloaded file into the store and link it back in place.
+    If the store already has the same content, path becomes a link to the
+    existing blob. Raises DownloadChecksumError when the content doesn't match
+    the hash the server advertised.
+    """
+    sha256 = hash_file(path)
+    if expected_sha256 and sha256 != expected_sha256:
+        raise DownloadChecksumError(
+            f"checksum mismatch (expected {expected_sha256[:12]}, got {sha256[:12]})"
+        )
+
+    blob_path = get_blob_path(sha256)
+    try:
+        if os.path.exists(blob_path):
+            link_blob(blob_path, path)  # Duplicate content: drop this copy
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.link(path, blob_path)
+    except OSError:
+        return None  # Store unavailable (e.g. no hardlinks); keep the plain file
+    record_model_store_url(url, sha256, os.path.getsize(blob_path))
+    return blob_path
+
+
+def new_download_progress():
+    """Progress entry for one destination file"""
+    return {
+        "bytes": 0,
+        "total": None,
+        "status": "queued",  # queued, downloading, done, failed, cancelled
+        "rate": None,  # Moving-average bytes/s
+        "current_rate": 0.0,  # Bytes/s over the last sample interval
+        "eta": None,  # Seconds
+        "started": None,
+        "finished": None,
+    }
+
+
+class DownloadTask:
+    """
+    Background model download job: runs the parallel engine over the parsed
+    downloads, then the original scripts for anything left. Exposes the same
+    poll()/wait()/terminate()/returncode interface as subprocess.Popen so it can
+    be tracked like the other admin processes.
+    """
+
+    def __init__(self, downloads, tokens, script, env, log_file):
+        self.downloads = downloads
+        self.tokens = tokens
+        self.script = script
+        self.env = env
+        self.log_file = log_file
+        self.returncode = None
+        self.process = None
+        self.cancel = threading.Event()
+        self.progress = {}  # {dest: new_download_progress()}
+        self.samples = {}  # {dest: (time, bytes)} at the last rate sample
+        self.progress_lock = threading.Lock()
+        self.started = time.time()
+        self.log_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        self.thread.join()
+        return self.returncode
+
+    def terminate(self):
+        self.cancel.set()
+        if self.process:
+            self.process.terminate()
+
+    def log(self, message):
+        with self.log_lock:
+            self.log_file.write(message + "\n")
+            self.log_file.flush()
+
+    def set_progress(self, dest, **fields):
+        with self.progress_lock:
+            entry = self.progress.setdefault(dest, new_download_progress())
+            if (
+                fields.get("status") == "downloading"
+                and entry["status"] != "downloading"
+            ):
+                entry["started"] = time.time()
+                self.samples[dest] = (
+                    entry["started"],
+                    fields.get("bytes", entry["bytes"]),
+                )
+            elif fields.get("status") in ("done", "failed", "cancelled"):
+                fields.update(finished=time.time(), current_rate=0.0, eta=None)
+                self.samples.pop(dest, None)
+            entry.update(fields)
+
+    def add_bytes(self, dest, count):
+        with self.progress_lock:
+            self.progress[dest]["bytes"] += count
+
+    def sample_progress(self):
+        """Update instantaneous rate, moving-average rate and ETA of active files"""
+        now = time.time()
+        with self.progress_lock:
+            for dest, (sampled_at, sampled_bytes) in list(self.samples.items()):
+                entry = self.progress[dest]
+                elapsed = now - sampled_at
+                if elapsed <= 0:
+                    continue
+                current = max(entry["bytes"] - sampled_bytes, 0) / elapsed
+                if entry["rate"] is None:
+                    entry["rate"] = current
+                else:
+                    entry["rate"] += DOWNLOAD_RATE_SMOOTHING * (current - entry["rate"])
+                entry["current_rate"] = current
+                if entry["total"] and entry["rate"] > 0:
+                    entry["eta"] = (
+                        max(entry["total"] - entry["bytes"], 0) / entry["rate"]
+                    )
+                else:
+                    entry["eta"] = None
+                self.samples[dest] = (now, entry["bytes"])
+
+    def get_progress(self):
+        """JSON-friendly snapshot of per-file and whole-job progress"""
+        with self.progress_lock:
+            files = [dict(entry, dest=dest) for dest, entry in self.progress.items()]
+
+        active = [f for f in files if f["status"] == "downloading"]
+        pending = [f for f in files if f["status"] in ("queued", "downloading")]
+        rate = sum(f["rate"] or 0 for f in active)
+        remaining = sum(max(f["total"] - f["bytes"], 0) for f in pending if f["total"])
+        statuses = {}
+        for f in files:
+            statuses[f["status"]] = statuses.get(f["status"], 0) + 1
+
+        return {
+            "job": {
+                "started": self.started,
+                "elapsed": time.time() - self.started,
+                "running": self.returncode is None,
+                "stage": "script" if self.process else "engine",
+                "bytes": sum(f["bytes"] for f in files),
+                "total": sum(f["total"] or 0 for f in files),
+                "rate": rate,
+                "current_rate": sum(f["current_rate"] for f in active),
+                # Files still queued have no rate yet, so this is a lower bound
+                "eta": remaining / rate if rate > 0 else None,
+                "files": statuses,
+            },
+            "files": files,
+        }
+
+    def run(self):
+        returncode = 1
+        try:
+            self.download_all()
+            if self.cancel.is_set():
+                returncode = -signal.SIGTERM
+                return
+
+            self.log("\n=== Running download scripts for remaining files ===\n")
+            self.process = subprocess.Popen(
+                ["bash", "-c", self.script],
+                stdout=self.log_file,
+                stderr=subprocess.STDOUT,
+                cwd="/workspace",
+                env=self.env,
+            )
+            returncode = self.process.wait()
+        except Exception as e:
+            self.log(f"Download engine error: {e}")
+        finally:
+            self.returncode = returncode
+
+    def download_all(self):
+        self.log(f"Parallel download: checking {len(self.downloads)} file(s)")
+        if not self.downloads:
+            return
+
+        for download in self.downloads:
+            self.set_progress(download["dest"])
+
+        done = threading.Event()
+        reporter = threading.Thread(
+            target=self.report_progress, args=(done,), daemon=True
+        )
+        reporter.start()
+
+        groups = {}
+        for download in self.downloads:
+            groups.setdefault(download["url"], []).append(download)
+
+        counts = {"present": 0, "linked": 0, "resumed": 0, "downloaded": 0, "failed": 0}
+        with concurrent.futures.ThreadPoolExecutor(
+            DOWNLOAD_CONNECTIONS
+        ) as segment_pool:
+            with concurrent.futures.ThreadPoolExecutor(DOWNLOAD_MAX_FILES) as file_pool:
+                futures = {
+                    file_pool.submit(self.download_group, group, segment_pool): group
+                    for group in groups.values()
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        results = future.result()
+                    except DownloadCancelled:
+                        for download in futures[future]:
+                            self.set_progress(download["dest"], status="cancelled")
+                        continue
+                    for dest, status in results:
+                        if isinstance(status, Exception):
+                            counts["failed"] += 1
+                            self.set_progress(dest, status="failed")
+                            self.log(
+                                f"  ✗ {os.path.basename(dest)}: {status} (will retry via script)"
+                            )
+                            continue
+                        counts[status] += 1
+                        self.set_progress(dest, status="done")
+                        if status == "linked":
+                            self.log(
+                                f"  ✓ {os.path.basename(dest)} (linked from model store)"
+                            )
+                        elif status != "present":
+                            self.log(f"  ✓ {os.path.basename(dest)}")
+
+        done.set()
+        reporter.join()
+        self.log(
+            f"Parallel download: {counts['downloaded']} downloaded, {counts['resumed']} resumed, "
+            f"{counts['linked']} linked from model store, {counts['present']} already present, "
+            f"{counts['failed']} failed"
+        )
+
+    def download_group(self, group, segment_pool):
+        """
+        Download destinations sharing a URL one after another, so the first
+        fetches the file and the rest are linked to it from the model store.
+        Returns [(dest, status or exception)].
+        """
+        results = []
+        for download in group:
+            try:
+                results.append(
+                    (download["dest"], self.download_file(download, segment_pool))
+                )
+            except DownloadCancelled:
+                raise
+            except Exception as e:
+                results.append((download["dest"], e))
+        return results
+
+    def download_file(self, download, segment_pool):
+        """
+        Download one file through a .part file and its resume journal, or link
+        it from the model store when the content is already there.
+        Returns "present", "linked", "resumed" or "downloaded".
+        """
+        url, dest = download["url"], download["dest"]
+        headers = get_download_headers(url, self.tokens)
+        part_path = dest + ".part"
+        journal_path = part_path + ".json"
+
+        # Files left by an interrupted wget/curl run (truncated dest, or the
+        # scripts' .incomplete file) are resumed rather than fetched again
+        leftover = None
+        for path in (dest, dest + ".incomplete"):
+            if os.path.exists(path):
+                leftover = path
+                break
+
+        if not leftover:
+            blob_path = resolve_from_model_store(url)
+            if blob_path:
+                link_blob(blob_path, dest)
+                return "linked"
+
+        try:
+            _final_url, size, ranges, sha256 = probe_download(url, headers)
+        except Exception:
+            if leftover == dest:
+                return "present"  # Can't verify it, so trust what's on disk
+            raise
+
+        # Same content already stored under another URL
+        blob_path = None if leftover == dest else resolve_from_model_store(url, sha256)
+        if blob_path:
+            link_blob(blob_path, dest)
+            record_model_store_url(url, sha256, os.path.getsize(blob_path))
+            return "linked"
+
+        resumable = bool(ranges and size)
+        journal = None
+        if leftover:
+            local_size = os.path.getsize(leftover)
+            if leftover == dest and (not resumable or local_size >= size):
+                return "present"
+            if resumable and local_size == size:
+                os.replace(leftover, dest)  # Finished, but the script never renamed it
+                return "present"
+            if resumable and 0 < local_size < size:
+                os.replace(leftover, part_path)
+                journal = DownloadJournal(
+                    journal_path, url, size, [[0, local_size - 1]]
+                )
+        if journal is None and resumable and os.path.exists(part_path):
+            journal = DownloadJournal.load(journal_path, url, size)
+        if journal is None and resumable:
+            journal = DownloadJournal(journal_path, url, size)
+
+        completed = journal.completed_bytes() if journal else 0
+        status = "resumed" if completed else "downloaded"
+        if completed:
+            self.log(
+                f"  ↻ Resuming {os.path.basename(dest)} "
+                f"({format_bytes(completed)} / {format_bytes(size)})"
+            )
+        self.set_progress(dest, bytes=completed, total=size, status="downloading")
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+        # One failed segment stops the rest of the file before fd is closed
+        file_failed = threading.Event()
+
+        def should_stop():
+            return self.cancel.is_set() or file_failed.is_set()
+
+        def on_segment_bytes(offset, count):
+            self.add_bytes(dest, count)
+            journal.add(offset, offset + count - 1)
+            journal.maybe_flush(fd)
+
+        fd = os.open(part_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            if resumable:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, size)
+                segments = [
+                    (start, min(start + DOWNLOAD_SEGMENT_SIZE - 1, end))
+                    for gap_start, end in journal.missing()
+                    for start in range(gap_start, end + 1, DOWNLOAD_SEGMENT_SIZE)
+                ]
+                futures = [
+                    segment_pool.submit(
+                        fetch_segment,
+                        url,
+                        headers,
+                        fd,
+                        start,
+                        end,
+                        on_segment_bytes,
+                        should_stop,
+                    )
+                    for start, end in segments
+                ]
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()
+                except BaseException:
+                    file_failed.set()
+                    for future in futures:
+                        future.cancel()
+                    concurrent.futures.wait(futures)
+                    raise
+                finally:
+                    journal.flush(fd)
+            else:
+                # Without range support there is nothing to resume from
+                fetch_stream(
+                    url,
+                    headers,
+                    fd,
+                    lambda count: self.add_bytes(dest, count),
+                    lambda: self.set_progress(dest, bytes=0),
+                    should_stop,
+                )
+        finally:
+            os.close(fd)
+
+        if resumable and (journal.missing() or os.path.getsize(part_path) != size):
+            raise IOError("incomplete download, will resume on the next run")
+        if journal:
+            journal.remove()
+        try:
+            add_to_model_store(part_path, url, sha256)
+        except DownloadChecksumError:
+            os.remove(part_path)  # Corrupt; the script fallback fetches it again
+            raise
+        os.replace(part_path, dest)
+        return status
+
+    def report_progress(self, done):
+        last_logged = time.time()
+        while not done.wait(DOWNLOAD_SAMPLE_INTERVAL):
+            self.sample_progress()
+            if time.time() - last_logged < DOWNLOAD_PROGRESS_INTERVAL:
+                continue
+            last_logged = time.time()
+
+            with self.progress_lock:
+                active = [
+                    (dest, dict(p))
+                    for dest, p in self.progress.items()
+                    if p["status"] == "downloading"
+                ]
+            for dest, p in active:
+                rate = f"{format_bytes(p['rate'] or 0)}/s"
+                if p["total"]:
+                    percent = p["bytes"] * 100 // p["total"]
+                    eta = (
+                        f", ETA {format_duration(p['eta'])}"
+                        if p["eta"] is not None
+                        else ""
+                    )
+                    self.log(
+                        f"  {os.path.basename(dest)}: {percent}% "
+                        f"({format_bytes(p['bytes'])} / {format_bytes(p['total'])}, {rate}{eta})"
+                    )
+                else:
+                    self.log(
+                        f"  {os.path.basename(dest)}: {format_bytes(p['bytes'])} ({rate})"
+                    )
+
+
 @app.route("/download_models", methods=["POST"])
 def download_models():
     """Handle model download requests"""
-    global current_artist
-
     # Check if user is admin
-    if not is_admin(current_artist):
+    if not is_admin(get_current_artist()):
         return jsonify({"success": False, "message": "Unauthorized"})
 
     data = request.get_json()
@@ -2425,61 +3376,59 @@ def download_models():
     if not scripts_to_run:
         return jsonify({"success": False, "message": "No valid model scripts found"})
 
-    try:
-        global running_process
-
-        # Set environment variables
-        env = os.environ.copy()
-        if hf_token:
-            env["HUGGING_FACE_HUB_TOKEN"] = hf_token
-            env["HF_TOKEN"] = hf_token
-        if civit_token:
-            env["CIVITAI_API_TOKEN"] = civit_token
-        env["HF_HUB_ENABLE_HF_TRANSFER"] = "1"
-
-        # Clear log file first
-        with open(LOG_FILE, "w") as f:
-            f.write(f"=== Downloading Models: {', '.join(script_names)} ===\n")
-            f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-            f.write("=" * 40 + "\n\n")
-
-        # Create a combined script to run all downloads sequentially
-        combined_script = "#!/bin/bash\nset -e\n"
-        for script_path in scripts_to_run:
-            combined_script += (
-                f'\necho "\\n=== Running {os.path.basename(script_path)} ===\\n"\n'
-            )
-            combined_script += f'bash "{script_path}"\n'
-        combined_script += '\necho "\\n=== All downloads completed ===\\n"\n'
-
-        # Open log file for appending
-        log_file = open(LOG_FILE, "a")
-
-        # Run the combined script
-        running_process = subprocess.Popen(
-            ["bash", "-c", combined_script],
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            cwd="/workspace",
-            env=env,
-            bufsize=1,
+    # Set environment variables
+    env = os.environ.copy()
+    if hf_token:
+        env["HUGGING_FACE_HUB_TOKEN"] = hf_token
+        env["HF_TOKEN"] = hf_token
+    if civit_token:
+        env["CIVITAI_API_TOKEN"] = civit_token
+    env["HF_HUB_ENABLE_HF_TRANSFER"] = "1"
+
+    # Create a combined script to run all downloads sequentially
+    combined_script = "#!/bin/bash\nset -e\n"
+    for script_path in scripts_to_run:
+        combined_script += (
+            f'\necho "\\n=== Running {os.path.basename(script_path)} ===\\n"\n'
         )
+        combined_script += f'bash "{script_path}"\n'
+    combined_script += '\necho "\\n=== All downloads completed ===\\n"\n'
+
+    # Files the parallel engine fetches first (deduplicated across scripts)
+    downloads = {}
+    for script_path in scripts_to_run:
+        for download in parse_model_downloads(script_path):
+            if download["url"]:
+                dest = normalize_model_path(download["dest"])
+                downloads.setdefault(dest, {"url": download["url"], "dest": dest})
+
+    # Run the parallel downloads, then the combined script
+    def launch(log_file):
+        global download_task
+        download_task = DownloadTask(
+            list(downloads.values()),
+            {"hf": hf_token, "civit": civit_token},
+            combined_script,
+            env,
+            log_file,
+        ).start()
+        return download_task
 
-        # Start a thread to close the log file when process completes
-        def wait_and_close():
-            running_process.wait()
-            log_file.write(
-                f"\n=== Process completed with exit code: {running_process.returncode} ===\n"
-            )
-            log_file.close()
-
-        thread = threading.Thread(target=wait_and_close, daemon=True)
-        thread.start()
+    try:
+        job = submit_job(
+            "models",
+            f"Downloading Models: {', '.join(script_names)}",
+            "models",
+            [],
+            launch,
+            on_finish=request_inventory_refresh,
+        )
 
         return jsonify(
             {
                 "success": True,
-                "message": f"Download started for: {', '.join(script_names)}. Check terminal for progress.",
+                "job_id": job.id,
+                "message": f"Download {describe_job_start(job)} for: {', '.join(script_names)}. Check terminal for progress.",
                 "scripts": scripts_to_run,
             }
         )
@@ -2490,72 +3439,611 @@ def download_models():
         )
 
 
-@app.route("/custom_nodes_action", methods=["POST"])
-def custom_nodes_action():
-    """Handle custom nodes install/update actions"""
-    global current_artist
+@app.route("/download_progress")
+def download_progress():
+    """Per-file and overall progress (bytes, rate, ETA) of the latest model download"""
+    if download_task is None:
+        return jsonify({"success": False, "message": "No downloads started"})
+    return jsonify(dict(download_task.get_progress(), success=True))
+
+
+# Wheel cache on the network volume (see setup/wheel_cache.sh). Install
+# scripts fill it and read packages from it first; pip's and uv's own caches
+# live next to it. The server keeps it under WHEEL_CACHE_LIMIT by removing the
+# least recently used files after install jobs. uv's cache is counted but left
+# to uv, since it has its own internal layout.
+WHEEL_CACHE_DIR = os.environ.get("WHEEL_CACHE_DIR", "/workspace/.wheel-cache")
+WHEEL_CACHE_LIMIT = int(float(os.environ.get("WHEEL_CACHE_LIMIT_GB", "60")) * 1024**3)
+WHEEL_CACHE_EVICTABLE = ("wheels", "pip")
+WHEEL_CACHE_GRACE = 3600  # Seconds an .incomplete download is assumed to be in progress
+wheel_cache_lock = threading.Lock()
+
+
+def get_wheel_cache_env():
+    """Environment pointing pip and uv at the wheel cache (mirrors wheel_cache.sh)"""
+    wheels = os.path.join(WHEEL_CACHE_DIR, "wheels")
+    return {
+        "WHEEL_CACHE_DIR": WHEEL_CACHE_DIR,
+        "PIP_CACHE_DIR": os.path.join(WHEEL_CACHE_DIR, "pip"),
+        "UV_CACHE_DIR": os.path.join(WHEEL_CACHE_DIR, "uv"),
+        "PIP_FIND_LINKS": wheels,
+        "UV_FIND_LINKS": wheels,
+    }
 
-    # Check if user is admin
-    if not is_admin(current_artist):
+
+def scan_wheel_cache():
+    """List cache files as {subdir: [(path, size, last_used)]}"""
+    files = {}
+    try:
+        subdirs = os.listdir(WHEEL_CACHE_DIR)
+    except OSError:
+        return files
+
+    for subdir in subdirs:
+        entries = files.setdefault(subdir, [])
+        for root, _dirs, names in os.walk(os.path.join(WHEEL_CACHE_DIR, subdir)):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                # Scripts touch wheels they reuse, since volumes often skip atime
+                entries.append((path, st.st_size, max(st.st_atime, st.st_mtime)))
+    return files
+
+
+def get_wheel_cache_usage():
+    """Size accounting per cache directory"""
+    dirs = {
+        subdir: {
+            "bytes": sum(size for _path, size, _used in entries),
+            "files": len(entries),
+        }
+        for subdir, entries in scan_wheel_cache().items()
+    }
+    return {
+        "path": WHEEL_CACHE_DIR,
+        "bytes": sum(d["bytes"] for d in dirs.values()),
+        "limit": WHEEL_CACHE_LIMIT,
+        "dirs": dirs,
+    }
+
+
+def trim_wheel_cache(limit=None):
+    """
+    Remove least recently used cache files until the cache fits the limit.
+    Returns (files_removed, bytes_freed).
+    """
+    limit = WHEEL_CACHE_LIMIT if limit is None else limit
+    with wheel_cache_lock:
+        files = scan_wheel_cache()
+        total = sum(
+            size for entries in files.values() for _path, size, _used in entries
+        )
+        candidates = sorted(
+            (
+                entry
+                for subdir in WHEEL_CACHE_EVICTABLE
+                for entry in files.get(subdir, [])
+            ),
+            key=lambda entry: entry[2],
+        )
+
+        removed, freed = 0, 0
+        now = time.time()
+        for path, size, last_used in candidates:
+            if total - freed <= limit:
+                break
+            if path.endswith(".incomplete") and now - last_used < WHEEL_CACHE_GRACE:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            freed += size
+
+    if removed:
+        print(f"Wheel cache: evicted {removed} file(s), {format_bytes(freed)}")
+    return removed, freed
+
+
+@app.route("/wheel_cache")
+def wheel_cache_status():
+    """Wheel cache size, limit and per-directory usage"""
+    return jsonify(dict(get_wheel_cache_usage(), success=True))
+
+
+@app.route("/wheel_cache/trim", methods=["POST"])
+def wheel_cache_trim():
+    """Evict least recently used files; optional JSON limit_gb overrides the limit"""
+    if not is_admin(get_current_artist()):
         return jsonify({"success": False, "message": "Unauthorized"})
 
-    data = request.get_json()
-    action = data.get("action")  # 'install' or 'update'
+    data = request.get_json(silent=True) or {}
+    limit = None
+    if data.get("limit_gb") is not None:
+        try:
+            limit = int(float(data["limit_gb"]) * 1024**3)
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "message": "Invalid limit_gb"})
 
-    if action not in ["install", "update"]:
-        return jsonify({"success": False, "message": "Invalid action"})
+    removed, freed = trim_wheel_cache(limit)
+    return jsonify(
+        {
+            "success": True,
+            "message": f"Removed {removed} file(s), freed {format_bytes(freed)}",
+            "usage": get_wheel_cache_usage(),
+        }
+    )
 
-    # Get the appropriate script path
-    script_name = f"{action}_custom_nodes.sh"
-    script_path = os.path.join(REPO_DIR, "setup", "custom-nodes", script_name)
 
-    if not os.path.exists(script_path):
+# Backups made with setup/backup.py. Snapshots share unchanged files with each
+# other (and are reflinked where the filesystem allows), so these report how
+# much space was saved next to what the snapshots actually use.
+BACKUP_SCRIPT = os.path.join(REPO_DIR, "setup", "backup.py")
+
+
+def run_backup_script(*args):
+    """Run setup/backup.py with args, returns (ok, stdout, stderr)"""
+    try:
+        result = subprocess.run(
+            [sys.executable, BACKUP_SCRIPT, *args],
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return False, "", str(e)
+    return result.returncode == 0, result.stdout, result.stderr
+
+
+@app.route("/backups")
+def backups_status():
+    """Backup snapshots with their size, new bytes and bytes saved"""
+    ok, stdout, stderr = run_backup_script("list", "--json")
+    if not ok:
         return jsonify(
-            {
-                "success": False,
-                "message": f"Script not found: {script_path}",
-            }
+            {"success": False, "message": stderr.strip() or "Could not list backups"}
         )
+    try:
+        info = json.loads(stdout)
+    except ValueError:
+        return jsonify(
+            {"success": False, "message": "Invalid output from backup script"}
+        )
+    return jsonify(dict(info, success=True))
+
+
+@app.route("/backups/prune", methods=["POST"])
+def backups_prune():
+    """Apply the retention policy; optional JSON keep overrides snapshots kept per tool"""
+    if not is_admin(get_current_artist()):
+        return jsonify({"success": False, "message": "Unauthorized"})
+
+    data = request.get_json(silent=True) or {}
+    args = ["prune"]
+    if data.get("keep") is not None:
+        try:
+            args += ["--keep", str(max(int(data["keep"]), 0))]
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "message": "Invalid keep"})
 
+    ok, _stdout, stderr = run_backup_script(*args)
+    return jsonify({"success": ok, "message": stderr.strip() or "Nothing to prune"})
+
+
+# Custom node installer. Clones run in parallel (shallow, into a staging
+# directory so a half-finished clone never looks installed). Requirements of
+# all installed nodes are then resolved together in one uv/pip run instead of
+# one resolver run per node, which reinstalled shared packages and let nodes
+# downgrade each other. A node that fails is reported and skipped without
+# stopping the others.
+CUSTOM_NODE_WORKERS = 8  # Concurrent git clones/pulls
+CUSTOM_NODE_STAGING_DIR = "/workspace/ComfyUI/.custom_nodes_staging"
+COMFYUI_VENV = "/workspace/ComfyUI/venv"
+CUSTOM_NODE_REQUIREMENTS = "/workspace/ComfyUI/.custom_nodes_requirements.txt"
+REQUIREMENT_LINE = re.compile(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*([^;]*)")
+custom_node_task = None  # Latest CustomNodeInstaller, for the dashboard's node progress
+
+
+def normalize_package_name(name):
+    """PEP 503 normalized package name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirement_specs(path):
+    """
+    Read the plain 'name[extras] specifier' lines of a requirements file as
+    [(normalized_name, specifier)]. Options, URLs and nested files are
+    skipped; they only matter to the resolver, not to conflict reporting.
+    """
+    specs = []
     try:
-        global running_process
+        with open(path) as f:
+            for line in f:
+                line = line.split(" #", 1)[0].strip()
+                if not line or line.startswith(("#", "-")) or "://" in line:
+                    continue
+                match = REQUIREMENT_LINE.match(line)
+                if match:
+                    name, spec = match.group(1), match.group(3).replace(" ", "")
+                    specs.append((normalize_package_name(name), spec))
+    except OSError:
+        pass
+    return specs
 
-        # Clear log file first
-        with open(LOG_FILE, "w") as f:
-            f.write(f"=== {action.capitalize()} Custom Nodes ===\n")
-            f.write(f"Script: {script_path}\n")
-            f.write(f"Started at: {datetime.utcnow().isoformat()}Z\n")
-            f.write("=" * 40 + "\n\n")
 
-        # Open log file for appending
-        log_file = open(LOG_FILE, "a")
+def find_requirement_conflicts(sources):
+    """
+    Find packages that sources pin to different exact versions.
+    sources is {label: requirements_path}; returns {package: {pin: [labels]}}.
+    """
+    pins = {}
+    for label, path in sources.items():
+        for name, spec in parse_requirement_specs(path):
+            if spec.startswith("==") and "," not in spec:
+                pins.setdefault(name, {}).setdefault(spec, []).append(label)
+    return {name: specs for name, specs in pins.items() if len(specs) > 1}
+
+
+def write_merged_requirements(sources, path):
+    """Write one requirements file including every source, for a single resolver run"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(
+            "# Generated by ComfyStudio: custom node requirements, resolved together\n"
+        )
+        for label, source in sources.items():
+            f.write(f"# {label}\n-r {source}\n")
+    os.replace(tmp_path, path)
+
 
-        # Run the script with output to log file
-        running_process = subprocess.Popen(
-            ["bash", script_path],
-            stdout=log_file,
+class InstallCancelled(Exception):
+    pass
+
+
+class CustomNodeInstaller:
+    """
+    Background custom node install/update job with the same
+    poll()/wait()/terminate()/returncode interface as subprocess.Popen.
+    """
+
+    def __init__(self, action, nodes, log_file):
+        self.action = action  # 'install' or 'update'
+        self.nodes = nodes
+        self.log_file = log_file
+        self.returncode = None
+        self.cancel = threading.Event()
+        self.processes = set()
+        self.status = {}  # {repo_name: {"status": str, "error": str or None}}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+        self.env = os.environ.copy()
+        self.env["GIT_TERMINAL_PROMPT"] = (
+            "0"  # Fail instead of prompting for credentials
+        )
+        self.env.update(get_wheel_cache_env())
+        self.env["VIRTUAL_ENV"] = COMFYUI_VENV
+        self.env["PATH"] = os.pathsep.join(
+            [os.path.join(COMFYUI_VENV, "bin"), self.env.get("PATH", "")]
+        )
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        self.thread.join()
+        return self.returncode
+
+    def terminate(self):
+        self.cancel.set()
+        with self.lock:
+            processes = list(self.processes)
+        for process in processes:
+            process.terminate()
+
+    def log(self, message):
+        with self.lock:
+            self.log_file.write(message + "\n")
+            self.log_file.flush()
+
+    def set_status(self, node, status, error=None):
+        with self.lock:
+            self.status[node["repo_name"]] = {"status": status, "error": error}
+        notify_dashboard()
+
+    def get_progress(self):
+        with self.lock:
+            nodes = {name: dict(entry) for name, entry in self.status.items()}
+        counts = {}
+        for entry in nodes.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return {
+            "action": self.action,
+            "running": self.returncode is None,
+            "counts": counts,
+            "nodes": nodes,
+        }
+
+    def run_command(self, args, cwd, stream=False):
+        """
+        Run a command, either streaming its output to the log or capturing it
+        (parallel git output would interleave). Raises IOError on failure.
+        """
+        if self.cancel.is_set():
+            raise InstallCancelled()
+        process = subprocess.Popen(
+            args,
+            cwd=cwd,
+            env=self.env,
+            stdout=self.log_file if stream else subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            cwd="/workspace",
-            bufsize=1,  # Line buffered
+            text=True,
         )
+        with self.lock:
+            self.processes.add(process)
+        try:
+            output, _ = process.communicate()
+        finally:
+            with self.lock:
+                self.processes.discard(process)
+        if self.cancel.is_set():
+            raise InstallCancelled()
+        if process.returncode != 0:
+            lines = (output or "").strip().splitlines()
+            errors = [
+                line
+                for line in lines
+                if line.startswith(("fatal:", "error:", "ERROR:"))
+            ]
+            detail = (errors or lines or [f"exit code {process.returncode}"])[-1]
+            raise IOError(f"{' '.join(args[:2])} failed: {detail}")
+
+    def run(self):
+        returncode = 1
+        try:
+            returncode = self.install_all()
+        except Exception as e:
+            self.log(f"Custom node installer error: {e}")
+        finally:
+            if self.cancel.is_set():
+                returncode = -signal.SIGTERM
+            self.returncode = returncode
+
+    def install_all(self):
+        if not os.path.isdir(TOOLS["comfy-ui"]["install_path"]):
+            self.log("ERROR: ComfyUI is not installed")
+            return 1
+
+        installed = [
+            n
+            for n in self.nodes
+            if os.path.isdir(os.path.join(CUSTOM_NODES_DIR, n["repo_name"]))
+        ]
+        if self.action == "install":
+            pending = [n for n in self.nodes if n not in installed]
+            self.log(
+                f"Installing {len(pending)} custom node(s), {len(installed)} already installed"
+            )
+        else:
+            pending = installed
+            self.log(f"Updating {len(pending)} installed custom node(s)")
+        for node in pending:
+            self.set_status(node, "queued")
+        os.makedirs(CUSTOM_NODE_STAGING_DIR, exist_ok=True)
+
+        fetched = []
+        with concurrent.futures.ThreadPoolExecutor(CUSTOM_NODE_WORKERS) as pool:
+            futures = [pool.submit(self.fetch_node, node) for node in pending]
+            for future in concurrent.futures.as_completed(futures):
+                node = future.result()
+                if node:
+                    fetched.append(node)
+
+        if fetched and not self.cancel.is_set():
+            self.install_requirements(fetched)
+        for node in fetched:
+            self.run_install_scripts(node)
+
+        with self.lock:
+            failed = sorted(
+                name
+                for name, entry in self.status.items()
+                if entry["status"] == "failed"
+            )
+            done = sum(1 for entry in self.status.values() if entry["status"] == "done")
+        verb = "installed" if self.action == "install" else "updated"
+        self.log(f"\nCustom nodes: {done} {verb}, {len(failed)} failed")
+        if failed:
+            self.log(f"Failed: {', '.join(failed)}")
+        return 1 if failed else 0
+
+    def fetch_node(self, node):
+        """Clone or pull one node; returns the node on success, None on failure"""
+        name = node["repo_name"]
+        node_path = os.path.join(CUSTOM_NODES_DIR, name)
+        try:
+            if self.action == "install":
+                self.set_status(node, "cloning")
+                staging_path = os.path.join(CUSTOM_NODE_STAGING_DIR, name)
+                shutil.rmtree(staging_path, ignore_errors=True)
+                self.run_command(
+                    [
+                        "git",
+                        "clone",
+                        "--depth",
+                        "1",
+                        "--recurse-submodules",
+                        "--shallow-submodules",
+                        node["repo_url"],
+                        staging_path,
+                    ],
+                    CUSTOM_NODE_STAGING_DIR,
+                )
+                os.rename(staging_path, node_path)
+                self.log(f"  ✓ Cloned {name}")
+            else:
+                self.set_status(node, "updating")
+                self.run_command(["git", "stash"], node_path)
+                self.run_command(["git", "pull", "--force"], node_path)
+                self.log(f"  ✓ Pulled {name}")
+            self.set_status(node, "fetched")
+            return node
+        except InstallCancelled:
+            self.set_status(node, "cancelled")
+        except Exception as e:
+            self.set_status(node, "failed", str(e))
+            self.log(f"  ✗ {name}: {e}")
+        return None
 
-        # Start a thread to close the log file when process completes
-        def wait_and_close():
-            running_process.wait()
-            log_file.write(
-                f"\n=== Process completed with exit code: {running_process.returncode} ===\n"
+    def get_pip_command(self):
+        """uv when available (much faster resolver), otherwise the venv's pip"""
+        python = os.path.join(COMFYUI_VENV, "bin", "python")
+        if shutil.which("uv", path=self.env["PATH"]):
+            return ["uv", "pip", "install", "--python", python]
+        return [python, "-m", "pip", "install"]
+
+    def install_requirements(self, fetched):
+        """
+        Resolve the requirements of every installed node, ComfyUI and
+        setup/comfy together and install them in one transaction. If that
+        can't be resolved, fall back to installing the new nodes one by one so
+        a single conflicting node doesn't block the rest.
+        """
+        sources = {}
+        for path, label in [
+            (
+                os.path.join(TOOLS["comfy-ui"]["install_path"], "requirements.txt"),
+                "ComfyUI",
+            ),
+            (
+                os.path.join(REPO_DIR, "setup", "comfy", "requirements.txt"),
+                "setup/comfy",
+            ),
+        ]:
+            if os.path.exists(path):
+                sources[label] = path
+        for node in self.nodes:
+            path = os.path.join(CUSTOM_NODES_DIR, node["repo_name"], "requirements.txt")
+            if os.path.exists(path):
+                sources[node["repo_name"]] = path
+
+        conflicts = find_requirement_conflicts(sources)
+        if conflicts:
+            self.log("\nConflicting version pins (the resolver has to pick one):")
+            for name, specs in sorted(conflicts.items()):
+                pins = ", ".join(
+                    f"{spec} ({', '.join(labels)})" for spec, labels in specs.items()
+                )
+                self.log(f"  {name}: {pins}")
+
+        for node in fetched:
+            self.set_status(node, "installing")
+        pip = self.get_pip_command()
+        self.log(
+            f"\n--- Installing requirements of {len(sources)} source(s) in one pass "
+            f"({'uv' if pip[0] == 'uv' else 'pip'}) ---"
+        )
+        write_merged_requirements(sources, CUSTOM_NODE_REQUIREMENTS)
+        try:
+            self.run_command(
+                pip + ["-r", CUSTOM_NODE_REQUIREMENTS], CUSTOM_NODES_DIR, stream=True
             )
-            log_file.close()
+            return
+        except InstallCancelled:
+            return
+        except Exception as e:
+            self.log(f"Combined install failed ({e}), installing node by node")
+
+        for node in fetched:
+            name = node["repo_name"]
+            requirements = os.path.join(CUSTOM_NODES_DIR, name, "requirements.txt")
+            if not os.path.exists(requirements):
+                continue
+            self.log(f"\n--- Installing requirements for {name} ---")
+            try:
+                self.run_command(
+                    pip + ["-r", requirements], CUSTOM_NODES_DIR, stream=True
+                )
+            except InstallCancelled:
+                return
+            except Exception as e:
+                self.set_status(node, "failed", str(e))
+                self.log(f"  ✗ {name}: {e}")
+
+    def run_install_scripts(self, node):
+        """Run a node's install.py / install.sh once its requirements are in place"""
+        name = node["repo_name"]
+        with self.lock:
+            if self.status[name]["status"] == "failed":
+                return
+        node_path = os.path.join(CUSTOM_NODES_DIR, name)
+        steps = []
+        if os.path.exists(os.path.join(node_path, "install.py")):
+            steps.append([os.path.join(COMFYUI_VENV, "bin", "python"), "install.py"])
+        if os.path.exists(os.path.join(node_path, "install.sh")):
+            steps.append(["bash", "install.sh"])
+
+        try:
+            if steps:
+                self.log(f"\n--- Running install scripts for {name} ---")
+            for args in steps:
+                self.run_command(args, node_path, stream=True)
+            self.set_status(node, "done")
+        except InstallCancelled:
+            self.set_status(node, "cancelled")
+        except Exception as e:
+            # The code is in place; only its setup step is incomplete
+            self.set_status(node, "failed", str(e))
+            self.log(f"  ✗ {name}: {e}")
+
+
+@app.route("/custom_nodes_action", methods=["POST"])
+def custom_nodes_action():
+    """Handle custom nodes install/update actions"""
+    # Check if user is admin
+    if not is_admin(get_current_artist()):
+        return jsonify({"success": False, "message": "Unauthorized"})
+
+    data = request.get_json()
+    action = data.get("action")  # 'install' or 'update'
+
+    if action not in ["install", "update"]:
+        return jsonify({"success": False, "message": "Invalid action"})
+
+    nodes = get_custom_nodes()
+    if not nodes:
+        return jsonify({"success": False, "message": "No custom nodes configured"})
+
+    def launch(log_file):
+        global custom_node_task
+        custom_node_task = CustomNodeInstaller(action, nodes, log_file).start()
+        return custom_node_task
 
-        thread = threading.Thread(target=wait_and_close, daemon=True)
-        thread.start()
+    try:
+        # Custom nodes live inside ComfyUI, so they queue behind ComfyUI jobs
+        job = submit_job(
+            "custom_nodes",
+            f"{action.capitalize()} Custom Nodes",
+            "comfy-ui",
+            [f"Nodes: {len(nodes)} configured in nodes.txt"],
+            launch,
+            on_finish=trim_wheel_cache,
+        )
 
-        # Return immediately - script runs in background
+        # Return immediately - the job runs in the background
         return jsonify(
             {
                 "success": True,
-                "message": f"{action.capitalize()} started for custom nodes. Check terminal for progress.",
-                "script": script_path,
+                "job_id": job.id,
+                "message": f"{action.capitalize()} {describe_job_start(job)} for custom nodes. Check terminal for progress.",
             }
         )
 
@@ -2563,24 +4051,86 @@ def custom_nodes_action():
         return jsonify({"success": False, "message": f"Failed to run script: {str(e)}"})
 
 
-def cleanup_sessions():
-    """Cleanup all active sessions"""
-    for tool_id, session in active_sessions.items():
-        if session.get("process"):
-            session["process"].terminate()
-        tool = TOOLS.get(tool_id)
-        if tool:
-            subprocess.run(["fuser", "-k", f"{tool['port']}/tcp"], capture_output=True)
+shutting_down = False
+exit_status = 0  # Re-raised once serving stops; waitress swallows SystemExit
+
+
+def stop_sessions():
+    """Terminate every tool's process group and free its port"""
+    with session_cond:
+        sessions = list(active_sessions.values())
+        active_sessions.clear()
+        for session in sessions:
+            session.state = "stopped"
+        session_cond.notify_all()
+    for session in sessions:
+        save_session(session)
+        if session.process:
+            signal_tool(session.process)
+        port = TOOLS[session.tool_id]["port"]
+        subprocess.run(["fuser", "-k", f"{port}/tcp"], capture_output=True)
+
+
+def detach_sessions():
+    """Leave tools running; the registry already has what the next server needs"""
+    with session_cond:
+        sessions = [
+            s for s in active_sessions.values() if s.process and s.poll() is None
+        ]
+    for session in sessions:
+        save_session(session)
+    if sessions:
+        names = ", ".join(TOOLS[s.tool_id]["name"] for s in sessions)
+        print(f"Leaving {names} running for the next server to reattach")
 
 
 def signal_handler(sig, frame):
-    cleanup_sessions()
-    sys.exit(0)
+    global shutting_down, exit_status
+    mode = "stop" if shutting_down or sig == signal.SIGINT else SHUTDOWN_MODE
+    shutting_down = True
+    if mode == "stop":
+        stop_sessions()
+        exit_status = 0
+    else:
+        detach_sessions()
+        exit_status = RESTART_EXIT_CODE
+    sys.exit(exit_status)
 
 
 if __name__ == "__main__":
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    print("Starting ComfyStudio on port 8080...")
-    app.run(host="0.0.0.0", port=8080, debug=False)
+    start_inventory_watcher()
+    restore_sessions()
+
+    # Production serving with waitress: a fixed pool of worker threads behind
+    # an async front end that handles the listen backlog and keep-alive
+    # connections. One process on purpose: the server owns the tool processes,
+    # their log pipes and the supervisor, which can't be split across workers.
+    # Every open log stream and dashboard long poll holds a thread, hence the
+    # generous pool.
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+
+    if serve is not None:
+        threads = int(os.environ.get("SERVER_THREADS", "64"))
+        print(f"Starting ComfyStudio on port 8080 (waitress, {threads} threads)...")
+        serve(
+            app,
+            host="0.0.0.0",
+            port=8080,
+            threads=threads,
+            backlog=2048,
+            connection_limit=1000,
+            channel_timeout=120,  # Idle keep-alive connections; streams send heartbeats
+            ident="ComfyStudio",
+        )
+    else:
+        print("waitress not installed, falling back to the Flask development server")
+        print("Starting ComfyStudio on port 8080...")
+        # Threaded so long-lived log streams don't block other requests
+        app.run(host="0.0.0.0", port=8080, debug=False, threaded=True)
+    sys.exit(exit_status)
@@ -23,26 +23,29 @@ REPO_DIR="$WORKSPACE_DIR/runpod-ggs"
 COMFYUI_DIR="$WORKSPACE_DIR/ComfyUI"
 
 # Clone or update the repository
-echo "Syncing repository..."
-if [ -d "$REPO_DIR/.git" ]; then
-    echo "Repository exists, pulling latest changes..."
-    cd "$REPO_DIR"
-    git fetch --all
-    git reset --hard origin/main
-    git pull
-    echo "Repository updated."
-else
-    echo "Cloning repository..."
-    rm -rf "$REPO_DIR"
-    git clone "$REPO_URL" "$REPO_DIR"
-    echo "Repository cloned."
-fi
+sync_repo() {
+    echo "Syncing repository..."
+    if [ -d "$REPO_DIR/.git" ]; then
+        echo "Repository exists, pulling latest changes..."
+        cd "$REPO_DIR"
+        git fetch --all
+        git reset --hard origin/main
+        git pull
+        echo "Repository updated."
+    else
+        echo "Cloning repository..."
+        rm -rf "$REPO_DIR"
+        git clone "$REPO_URL" "$REPO_DIR"
+        echo "Repository cloned."
+    fi
 
-# Make all scripts executable
-echo "Setting script permissions..."
-find "$REPO_DIR/setup" -name "*.sh" -exec chmod +x {} \;
-chmod +x "$REPO_DIR/server/start_server.sh" 2>/dev/null || true
-chmod +x "$REPO_DIR/server/build_server.sh" 2>/dev/null || true
+    # Make all scripts executable
+    echo "Setting script permissions..."
+    find "$REPO_DIR/setup" -name "*.sh" -exec chmod +x {} \;
+    chmod +x "$REPO_DIR/server/start_server.sh" 2>/dev/null || true
+    chmod +x "$REPO_DIR/server/build_server.sh" 2>/dev/null || true
+}
+sync_repo
 
 # Verify network volume is mounted and ComfyUI is installed
 if [ ! -d "$COMFYUI_DIR" ]; then
@@ -50,12 +53,15 @@ if [ ! -d "$COMFYUI_DIR" ]; then
     echo "Some features may not be available until ComfyUI is installed"
 fi
 
-# Kill any existing processes on our ports
-echo "Cleaning up existing processes..."
+# Stop any previous server. SIGTERM makes it leave its tools running, and
+# this server reattaches to them; tool ports are freed when a tool is started
+echo "Stopping any previous server..."
+fuser -k -TERM 8080/tcp 2>/dev/null || true
+for _ in $(seq 1 10); do
+    fuser 8080/tcp >/dev/null 2>&1 || break
+    sleep 1
+done
 fuser -k 8080/tcp 2>/dev/null || true
-fuser -k 8888/tcp 2>/dev/null || true
-fuser -k 8188/tcp 2>/dev/null || true
-sleep 2
 
 # Set working directory
 cd "$WORKSPACE_DIR"
@@ -74,6 +80,44 @@ echo ""
 # Export repo path for the server to use
 export REPO_DIR="$REPO_DIR"
 
-# Start the server from git repo (runs in foreground)
-# Using repo version allows updates without rebuilding Docker image
-exec python3 "$REPO_DIR/server/server.py"
+# Production WSGI server (images built before it was added to the Dockerfile)
+python3 -c "import waitress" 2>/dev/null || pip install --quiet --no-deps waitress || true
+
+# Start the server from git repo
+# Using repo version allows updates without rebuilding Docker image.
+# The server runs under this script instead of replacing it: as the
+# container's main process its exit would take every tool down with it.
+# To upgrade the control plane, send the server SIGTERM; it exits with
+# RESTART_EXIT_CODE leaving the tools running, and is started again from the
+# synced repo. A crash restarts the same version, backing off while it keeps
+# crashing. Stopping the container stops the tools (SIGINT to the server).
+RESTART_EXIT_CODE=75
+BACKOFF_MAX=60
+BACKOFF=1
+trap 'kill -INT "$SERVER_PID" 2>/dev/null; wait "$SERVER_PID"; exit 0' TERM INT
+while true; do
+    STARTED=$(date +%s)
+    python3 "$REPO_DIR/server/server.py" &
+    SERVER_PID=$!
+    STATUS=0
+    wait "$SERVER_PID" || STATUS=$?
+
+    if [ "$STATUS" -eq "$RESTART_EXIT_CODE" ]; then
+        echo "Server handed off its tools, updating and restarting..."
+        sync_repo || echo "Repository sync failed, restarting the current version"
+        cd "$WORKSPACE_DIR"
+        BACKOFF=1
+    elif [ "$STATUS" -eq 0 ]; then
+        echo "Server stopped"
+        exit 0
+    else
+        # A run that lasted a while wasn't a crash on start
+        if [ $(( $(date +%s) - STARTED )) -ge "$BACKOFF_MAX" ]; then
+            BACKOFF=1
+        fi
+        echo "Server exited with status $STATUS, restarting in ${BACKOFF}s"
+        sleep "$BACKOFF" &
+        wait $!
+        BACKOFF=$(( BACKOFF * 2 > BACKOFF_MAX ? BACKOFF_MAX : BACKOFF * 2 ))
+    fi
+done
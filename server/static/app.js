@@ -0,0 +1,1020 @@
+var sessionTimers = {};
+
+// Initialize on load
+document.addEventListener('DOMContentLoaded', function() {
+    updateUI();
+    startTimers();
+    refreshStatus();
+    watchDashboard();
+});
+
+// Profile selection change
+document.getElementById('profileSelect').addEventListener('change', function() {
+    currentArtist = this.value;
+
+    // Update server with new artist
+    fetch('/set_artist', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ artist: currentArtist })
+    });
+
+    updateUI();
+});
+
+// Admin toggle change
+document.getElementById('adminSwitch').addEventListener('change', function() {
+    adminMode = this.checked;
+
+    fetch('/set_admin_mode', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ admin_mode: adminMode })
+    });
+
+    updateUI();
+});
+
+function updateUI() {
+    const adminToggle = document.getElementById('adminToggle');
+    const userTools = document.getElementById('userTools');
+    const adminTools = document.getElementById('adminTools');
+
+    // Check if current user is admin (with safety checks)
+    let isAdmin = false;
+    if (currentArtist && Array.isArray(admins) && admins.length > 0) {
+        const currentLower = currentArtist.trim().toLowerCase();
+        isAdmin = admins.some(function(admin) {
+            return admin && admin.trim().toLowerCase() === currentLower;
+        });
+    }
+
+    if (isAdmin) {
+        adminToggle.classList.add('visible');
+    } else {
+        adminToggle.classList.remove('visible');
+        adminMode = false;
+        document.getElementById('adminSwitch').checked = false;
+    }
+
+    // Toggle between user and admin tools
+    if (adminMode) {
+        userTools.classList.add('hidden');
+        adminTools.classList.remove('hidden');
+    } else {
+        userTools.classList.remove('hidden');
+        adminTools.classList.add('hidden');
+    }
+}
+
+function handleToolClick(toolId) {
+    if (!currentArtist) {
+        showStatus('Please select a profile first', 'error');
+        return;
+    }
+
+    var btn = document.querySelector('[data-tool="' + toolId + '"]');
+    if (btn.classList.contains('active')) {
+        // Tool is running - open it in new tab
+        var tool = tools[toolId];
+        var url = 'https://' + runpodId + '-' + tool.port + '.proxy.runpod.net';
+        window.open(url, '_blank');
+    } else if (!btn.classList.contains('starting')) {
+        // Start the tool (only if not already starting)
+        btn.classList.add('starting');
+        // Update button text to show starting state
+        var toolNameSpan = btn.querySelector('.tool-name');
+        if (toolNameSpan) {
+            toolNameSpan.setAttribute('data-original-text', toolNameSpan.textContent);
+            toolNameSpan.textContent = 'Starting ' + toolNameSpan.textContent + '...';
+        }
+        startSession(toolId, btn);
+    }
+}
+
+function startSession(toolId, btn) {
+    var toolName = tools[toolId] ? tools[toolId].name : toolId;
+
+    // Show terminal
+    clearUserTerminal();
+    showUserTerminal(toolName);
+
+    fetch('/start_session', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tool_id: toolId, artist: currentArtist })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            // Stream logs until the tool is ready
+            startUserLogStream(toolId, toolName);
+        } else {
+            showStatus(data.message, 'error');
+            // Reset button state on error
+            if (btn) {
+                btn.classList.remove('starting');
+                var toolNameSpan = btn.querySelector('.tool-name');
+                if (toolNameSpan && toolNameSpan.getAttribute('data-original-text')) {
+                    toolNameSpan.textContent = toolNameSpan.getAttribute('data-original-text');
+                }
+            }
+        }
+    })
+    .catch(function(error) {
+        showStatus('Error: ' + error, 'error');
+        // Reset button state on error
+        if (btn) {
+            btn.classList.remove('starting');
+            var toolNameSpan = btn.querySelector('.tool-name');
+            if (toolNameSpan && toolNameSpan.getAttribute('data-original-text')) {
+                toolNameSpan.textContent = toolNameSpan.getAttribute('data-original-text');
+            }
+        }
+    });
+}
+
+function stopSession(toolId) {
+    fetch('/stop_session', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tool_id: toolId })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showStatus(data.tool_name + ' stopped', 'success');
+        } else {
+            showStatus(data.message, 'error');
+        }
+    });
+}
+
+function handleAdminAction(toolId, action) {
+    // Get the button and disable it
+    var btnId = action + '-btn-' + toolId;
+    var btn = document.getElementById(btnId);
+    // Get tool name from tools object
+    var toolName = tools[toolId] ? tools[toolId].name : toolId;
+
+    if (btn) {
+        btn.disabled = true;
+        btn.textContent = action.charAt(0).toUpperCase() + action.slice(1) + 'ing ' + toolName + '...';
+        // Track active button globally so we can re-enable it when done
+        activeAdminButton = btn;
+        activeAdminAction = action;
+        activeAdminToolId = toolId;
+    }
+
+    // Update terminal title based on action
+    var terminalTitle = document.querySelector('#terminalContainer .terminal-title');
+    if (terminalTitle) {
+        var actionText = action.charAt(0).toUpperCase() + action.slice(1) + 'ing';
+        terminalTitle.textContent = actionText + ' ' + toolName;
+    }
+
+    // Clear and show terminal, start timer (the previous job keeps its log)
+    document.getElementById('terminal').innerHTML = '';
+    showTerminal();
+    startTerminalTimer('terminalTimer');
+
+    fetch('/admin_action', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tool_id: toolId, action: action })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showStatus(data.message, 'success');
+            // Start streaming logs
+            startLogStream(data.job_id);
+        } else {
+            showStatus(data.message, 'error');
+            appendToTerminal('Error: ' + data.message + '\n', 'error');
+            // Re-enable button on error
+            if (btn) {
+                btn.disabled = false;
+                btn.textContent = action.charAt(0).toUpperCase() + action.slice(1) + ' ' + toolId;
+            }
+        }
+    });
+}
+
+function stopToolSession(toolId) {
+    fetch('/stop_session', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tool_id: toolId })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showStatus(data.message, 'success');
+        } else {
+            showStatus(data.message, 'error');
+        }
+    });
+}
+
+function showModelsPage() {
+    document.getElementById('mainPage').classList.add('hidden');
+    document.getElementById('modelsPage').classList.add('visible');
+}
+
+function hideModelsPage() {
+    document.getElementById('modelsPage').classList.remove('visible');
+    document.getElementById('mainPage').classList.remove('hidden');
+}
+
+function showCustomNodesPage() {
+    document.getElementById('mainPage').classList.add('hidden');
+    document.getElementById('customNodesPage').classList.add('visible');
+
+    // Reset custom nodes terminal title
+    var terminalTitle = document.querySelector('#customNodesTerminalContainer .terminal-title');
+    if (terminalTitle) {
+        terminalTitle.textContent = 'Installation Progress';
+    }
+}
+
+function hideCustomNodesPage() {
+    document.getElementById('customNodesPage').classList.remove('visible');
+    document.getElementById('mainPage').classList.remove('hidden');
+}
+
+// Live dashboard state: a long poll on /dashboard returns the fields changed
+// since the last version seen (tool sessions, jobs, model and node install
+// state, current artist), and the page patches itself instead of reloading
+var dashboardEpoch = null;
+var dashboardVersion = 0;
+var toolStates = {};
+var dashboardJobs = {};
+var dashboardLive = false;  // The last long poll succeeded
+
+function watchDashboard() {
+    var url = '/dashboard?since=' + dashboardVersion;
+    if (dashboardEpoch) url += '&epoch=' + dashboardEpoch;
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            dashboardEpoch = data.epoch;
+            dashboardVersion = data.version;
+            dashboardLive = true;
+            applyDashboardChanges(data.changes, data.full);
+            watchDashboard();
+        })
+        .catch(function(err) {
+            console.error('Error watching dashboard state:', err);
+            dashboardLive = false;
+            refreshStatus();
+            setTimeout(watchDashboard, 3000);
+        });
+}
+
+// Tool and artist state from /status: paints the tool rows on load before the
+// first (full) dashboard response, and keeps them current while the long poll
+// is failing. Sent with the last ETag, so an unchanged state costs a 304.
+var statusEtag = null;
+
+function refreshStatus() {
+    var headers = statusEtag ? { 'If-None-Match': statusEtag } : {};
+    fetch('/status', { headers: headers, cache: 'no-store' })
+        .then(function(response) {
+            if (response.status === 304 || !response.ok) return null;
+            statusEtag = response.headers.get('ETag');
+            return response.json();
+        })
+        .then(function(data) {
+            // A live long poll is at least as fresh
+            if (!data || dashboardLive) return;
+            applyDashboardChanges({
+                tools: data.tools,
+                artist: { current_artist: data.current_artist, admin_mode: data.admin_mode }
+            }, false);
+        })
+        .catch(err => console.error('Error fetching status:', err));
+}
+
+function applyDashboardChanges(changes, full) {
+    var toolChanges = changes.tools || {};
+    var jobChanges = changes.jobs || {};
+
+    if (full) dashboardJobs = {};
+    Object.keys(jobChanges).forEach(function(jobId) {
+        if (jobChanges[jobId]) {
+            dashboardJobs[jobId] = jobChanges[jobId];
+        } else {
+            delete dashboardJobs[jobId];
+        }
+    });
+
+    Object.keys(toolChanges).forEach(function(toolId) {
+        toolStates[toolId] = toolChanges[toolId];
+        renderUserTool(toolId);
+    });
+    // Admin rows show install state and the tool's queued or running job
+    if (Object.keys(toolChanges).length || Object.keys(jobChanges).length) {
+        Object.keys(toolStates).forEach(renderAdminTool);
+    }
+
+    if (changes.models || changes.nodes) {
+        applyInventory(changes.models || {}, changes.nodes || {});
+    }
+    if (changes.node_progress) {
+        applyNodeProgress(changes.node_progress);
+    }
+
+    var artist = changes.artist;
+    if (artist) {
+        if ('current_artist' in artist) {
+            currentArtist = artist.current_artist || '';
+            document.getElementById('profileSelect').value = currentArtist;
+        }
+        if ('admin_mode' in artist) {
+            adminMode = !!artist.admin_mode;
+            document.getElementById('adminSwitch').checked = adminMode;
+        }
+        updateUI();
+    }
+}
+
+function renderUserTool(toolId) {
+    var state = toolStates[toolId];
+    var btn = document.querySelector('#userTools .tool-btn[data-tool="' + toolId + '"]');
+    if (!state || !btn) return;
+    var session = state.running ? state.session : null;
+
+    btn.disabled = !state.installed;
+    btn.classList.toggle('disabled', !state.installed);
+    btn.classList.toggle('active', state.port_ready);
+    btn.classList.toggle('starting', !!session && !state.port_ready);
+
+    var name = tools[toolId].name;
+    var toolNameSpan = btn.querySelector('.tool-name');
+    if (session && !state.port_ready) {
+        toolNameSpan.setAttribute('data-original-text', name);
+        var verb = session.state === 'restarting' ? 'Restarting ' : 'Starting ';
+        toolNameSpan.textContent = verb + name + '...';
+    } else {
+        toolNameSpan.textContent = name;
+    }
+
+    var info = btn.querySelector('.tool-info');
+    var extra = info.querySelector('.tool-status, .tool-timer');
+    if (extra) extra.remove();
+    if (!state.installed) {
+        var status = document.createElement('span');
+        status.className = 'tool-status';
+        status.textContent = 'Not Installed';
+        info.appendChild(status);
+    } else if (session) {
+        var timer = document.createElement('span');
+        timer.className = 'tool-timer';
+        timer.dataset.start = new Date(session.started * 1000).toISOString();
+        info.appendChild(timer);
+        updateTimers();
+    }
+
+    var row = btn.parentElement;
+    var stopBtn = row.querySelector('.tool-stop-btn');
+    if (session && !stopBtn) {
+        stopBtn = document.createElement('button');
+        stopBtn.className = 'tool-stop-btn';
+        stopBtn.textContent = 'Stop';
+        stopBtn.onclick = function() { stopToolSession(toolId); };
+        row.appendChild(stopBtn);
+    } else if (!session && stopBtn) {
+        stopBtn.remove();
+    }
+}
+
+function renderAdminTool(toolId) {
+    var state = toolStates[toolId];
+    var row = document.getElementById('admin-row-' + toolId);
+    var tool = tools[toolId];
+    if (!state || !row || !tool.install_path) return;
+
+    var job = null;
+    Object.keys(dashboardJobs).forEach(function(jobId) {
+        var candidate = dashboardJobs[jobId];
+        if (candidate.kind === 'tool' && candidate.resource === toolId &&
+                (candidate.status === 'queued' || candidate.status === 'running')) {
+            job = candidate;
+        }
+    });
+
+    // Only rebuilt when what it shows changed, so a click in progress isn't lost
+    var key = job ? job.id + ':' + job.status : (state.installed ? 'installed' : 'missing');
+    if (row.dataset.render === key) return;
+    row.dataset.render = key;
+    row.innerHTML = '';
+
+    if (job) {
+        var label = job.title + (job.status === 'queued' ? ' (queued)' : '...');
+        row.appendChild(adminToolButton(toolId, null, label));
+    } else if (state.installed) {
+        row.appendChild(adminToolButton(toolId, 'reinstall', 'Reinstall ' + tool.name));
+        row.appendChild(adminToolButton(toolId, 'update', 'Update ' + tool.name, 'update'));
+    } else {
+        row.appendChild(adminToolButton(toolId, 'install', 'Install ' + tool.name));
+    }
+}
+
+function adminToolButton(toolId, action, label, extraClass) {
+    var btn = document.createElement('button');
+    btn.className = 'admin-tool-btn' + (extraClass ? ' ' + extraClass : '');
+    btn.textContent = label;
+    if (action) {
+        btn.id = action + '-btn-' + toolId;
+        btn.dataset.tool = toolId;
+        btn.dataset.action = action;
+        btn.onclick = function() { handleAdminAction(toolId, action); };
+    } else {
+        btn.disabled = true;
+    }
+    return btn;
+}
+
+// Install badges on the models and custom nodes pages
+function applyInventory(models, nodes) {
+    Object.keys(models).forEach(function(scriptId) {
+        var el = document.getElementById('model-status-' + scriptId);
+        if (el && models[scriptId]) el.innerHTML = renderModelStatus(models[scriptId]);
+    });
+    Object.keys(nodes).forEach(function(repoName) {
+        var el = document.getElementById('node-status-' + repoName);
+        if (el) el.innerHTML = nodes[repoName] ? '<span style="color: #10b981; font-size: 12px;"> ✓ Installed</span>' : '';
+    });
+}
+
+// Per-node step of the latest custom node install/update. Steps in progress
+// are only shown while it runs; outcomes stay until the next one starts.
+var NODE_PROGRESS = {
+    queued: { text: 'Queued', color: '#6b7280' },
+    cloning: { text: 'Cloning...', color: '#3b82f6' },
+    updating: { text: 'Pulling...', color: '#3b82f6' },
+    fetched: { text: 'Waiting for requirements', color: '#6b7280' },
+    installing: { text: 'Installing requirements...', color: '#3b82f6' },
+    done: { text: '✓ Done', color: '#10b981', final: true },
+    failed: { text: '✗ Failed', color: '#ef4444', final: true },
+    cancelled: { text: 'Cancelled', color: '#f59e0b', final: true }
+};
+
+function applyNodeProgress(progress) {
+    Object.keys(progress).forEach(function(repoName) {
+        var el = document.getElementById('node-progress-' + repoName);
+        if (!el) return;
+        var entry = progress[repoName];
+        var step = entry && NODE_PROGRESS[entry.status];
+        el.textContent = '';
+        el.title = '';
+        if (!step || !(entry.running || step.final)) return;
+        var badge = document.createElement('span');
+        badge.style.color = step.color;
+        badge.style.fontSize = '12px';
+        badge.textContent = ' ' + step.text;
+        el.appendChild(badge);
+        if (entry.error) el.title = entry.error;
+    });
+}
+
+function renderModelStatus(status) {
+    if (status.total <= 0) return '';
+    if (status.installed === status.total) {
+        return '<span style="color: #10b981; font-size: 12px;"> ✓ Installed</span>';
+    } else if (status.installed > 0) {
+        return '<span style="color: #f59e0b; font-size: 12px;"> (' + status.installed + '/' + status.total + ')</span>';
+    }
+    return '<span style="color: #6b7280; font-size: 12px;"> (new)</span>';
+}
+
+function toggleAllModels(checkbox) {
+    var modelCheckboxes = document.querySelectorAll('#modelsPage .model-checkbox:not(#downloadAllModels)');
+    modelCheckboxes.forEach(function(cb) {
+        cb.checked = checkbox.checked;
+    });
+}
+
+function toggleAllNodes(checkbox) {
+    var nodeCheckboxes = document.querySelectorAll('#customNodesPage .model-checkbox:not(#installAllNodes)');
+    nodeCheckboxes.forEach(function(cb) {
+        cb.checked = checkbox.checked;
+    });
+}
+
+function installCustomNodes() {
+    // Update terminal title and start timer
+    var terminalTitle = document.querySelector('#customNodesTerminalContainer .terminal-title');
+    if (terminalTitle) {
+        terminalTitle.textContent = 'Installing Custom Nodes';
+    }
+    startTerminalTimer('customNodesTerminalTimer');
+
+    clearCustomNodesTerminal();
+    showCustomNodesTerminal();
+    appendToCustomNodesTerminal('Starting custom nodes installation...\\n', 'info');
+
+    fetch('/custom_nodes_action', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ action: 'install' })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showCustomNodesStatus(data.message, 'success');
+            startCustomNodesLogStream(data.job_id);
+        } else {
+            showCustomNodesStatus(data.message, 'error');
+            appendToCustomNodesTerminal('Error: ' + data.message + '\\n', 'error');
+        }
+    });
+}
+
+function updateCustomNodes() {
+    // Update terminal title and start timer
+    var terminalTitle = document.querySelector('#customNodesTerminalContainer .terminal-title');
+    if (terminalTitle) {
+        terminalTitle.textContent = 'Updating Custom Nodes';
+    }
+    startTerminalTimer('customNodesTerminalTimer');
+
+    clearCustomNodesTerminal();
+    showCustomNodesTerminal();
+    appendToCustomNodesTerminal('Starting custom nodes update...\\n', 'info');
+
+    fetch('/custom_nodes_action', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ action: 'update' })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showCustomNodesStatus(data.message, 'success');
+            startCustomNodesLogStream(data.job_id);
+        } else {
+            showCustomNodesStatus(data.message, 'error');
+            appendToCustomNodesTerminal('Error: ' + data.message + '\\n', 'error');
+        }
+    });
+}
+
+function showCustomNodesStatus(message, type) {
+    var statusDiv = document.getElementById('customNodesStatusMessage');
+    statusDiv.textContent = message;
+    statusDiv.className = 'status-message ' + type;
+    statusDiv.classList.remove('hidden');
+    setTimeout(function() {
+        statusDiv.classList.add('hidden');
+    }, 5000);
+}
+
+function showCustomNodesTerminal() {
+    document.getElementById('customNodesTerminalContainer').style.display = 'block';
+}
+
+function minimizeCustomNodesTerminal() {
+    var terminal = document.getElementById('customNodesTerminal');
+    if (terminal.style.display === 'none') {
+        terminal.style.display = 'block';
+    } else {
+        terminal.style.display = 'none';
+    }
+}
+
+function copyCustomNodesTerminal() {
+    var terminal = document.getElementById('customNodesTerminal');
+    navigator.clipboard.writeText(terminal.textContent).then(function() {
+        showCustomNodesStatus('Terminal content copied to clipboard', 'success');
+    }).catch(function(err) {
+        showCustomNodesStatus('Failed to copy: ' + err, 'error');
+    });
+}
+
+function clearCustomNodesTerminal() {
+    document.getElementById('customNodesTerminal').textContent = '';
+}
+
+function appendToCustomNodesTerminal(text, type) {
+    var terminal = document.getElementById('customNodesTerminal');
+    var span = document.createElement('span');
+    span.textContent = text;
+    if (type === 'error') {
+        span.style.color = '#ef4444';
+    } else if (type === 'success') {
+        span.style.color = '#10b981';
+    } else if (type === 'info') {
+        span.style.color = '#3b82f6';
+    }
+    terminal.appendChild(span);
+    terminal.scrollTop = terminal.scrollHeight;
+}
+
+function startCustomNodesLogStream(jobId) {
+    stopLogStream();
+    logStream = openLogStream('log=admin&job=' + encodeURIComponent(jobId), {
+        log: function(data) {
+            if (data.reset) {
+                document.getElementById('customNodesTerminal').textContent = '';
+            }
+            if (data.content) {
+                appendToCustomNodesTerminal(data.content);
+            }
+        },
+        exit: function() {
+            logStream = null;
+            appendToCustomNodesTerminal('\\n=== Process completed ===\\n', 'success');
+            stopTerminalTimer();
+        }
+    });
+}
+
+function downloadModels() {
+    const hfToken = document.getElementById('hfToken').value;
+    const civitToken = document.getElementById('civitToken').value;
+
+    const selectedModels = [];
+    document.querySelectorAll('.model-checkbox:checked').forEach(cb => {
+        selectedModels.push(cb.value);
+    });
+
+    if (selectedModels.length === 0) {
+        showModelsStatus('Please select at least one model set', 'error');
+        return;
+    }
+
+    // Update terminal title and start timer
+    var terminalTitle = document.querySelector('#modelsTerminalContainer .terminal-title');
+    if (terminalTitle) {
+        terminalTitle.textContent = 'Downloading Models';
+    }
+    startTerminalTimer('modelsTerminalTimer');
+
+    // Clear and show terminal
+    document.getElementById('modelsTerminal').innerHTML = '';
+    showModelsTerminal();
+    appendToModelsTerminal('Starting download for: ' + selectedModels.join(', ') + '...\\n', 'info');
+
+    fetch('/download_models', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            models: selectedModels,
+            hf_token: hfToken,
+            civit_token: civitToken
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showModelsStatus(data.message, 'success');
+            // Start streaming logs
+            startModelsLogStream(data.job_id);
+        } else {
+            showModelsStatus(data.message, 'error');
+            appendToModelsTerminal('Error: ' + data.message + '\\n', 'error');
+        }
+    });
+}
+
+// Models page terminal functions
+function showModelsTerminal() {
+    document.getElementById('modelsTerminalContainer').classList.add('visible');
+}
+
+function minimizeModelsTerminal() {
+    var terminal = document.getElementById('modelsTerminal');
+    if (terminal.style.display === 'none') {
+        terminal.style.display = 'block';
+    } else {
+        terminal.style.display = 'none';
+    }
+}
+
+function copyModelsTerminal() {
+    var terminal = document.getElementById('modelsTerminal');
+    navigator.clipboard.writeText(terminal.textContent).then(function() {
+        showModelsStatus('Terminal content copied to clipboard', 'success');
+    }).catch(function(err) {
+        showModelsStatus('Failed to copy: ' + err, 'error');
+    });
+}
+
+function clearModelsTerminal() {
+    document.getElementById('modelsTerminal').innerHTML = '';
+    clearJobLog(modelsTerminalJobId);
+}
+
+function minimizeTerminal() {
+    var terminal = document.getElementById('terminal');
+    if (terminal.style.display === 'none') {
+        terminal.style.display = 'block';
+    } else {
+        terminal.style.display = 'none';
+    }
+}
+
+function copyTerminal() {
+    var terminal = document.getElementById('terminal');
+    navigator.clipboard.writeText(terminal.textContent).then(function() {
+        showStatus('Terminal content copied to clipboard', 'success');
+    }).catch(function(err) {
+        showStatus('Failed to copy: ' + err, 'error');
+    });
+}
+
+function clearTerminal() {
+    document.getElementById('terminal').innerHTML = '';
+}
+
+function appendToModelsTerminal(text, className) {
+    const terminal = document.getElementById('modelsTerminal');
+    const span = document.createElement('span');
+    if (className) span.className = className;
+    span.textContent = text;
+    terminal.appendChild(span);
+    terminal.scrollTop = terminal.scrollHeight;
+}
+
+function startModelsLogStream(jobId) {
+    stopLogStream();
+    modelsTerminalJobId = jobId;
+    logStream = openLogStream('log=admin&job=' + encodeURIComponent(jobId), {
+        log: function(data) {
+            if (data.reset) {
+                document.getElementById('modelsTerminal').innerHTML = '';
+            }
+            if (data.content) {
+                appendToModelsTerminal(data.content);
+            }
+        },
+        exit: function() {
+            logStream = null;
+            appendToModelsTerminal('\\n--- Download completed ---\\n', 'success');
+            stopTerminalTimer();
+        }
+    });
+}
+
+function showStatus(message, type) {
+    const el = document.getElementById('statusMessage');
+    el.textContent = message;
+    el.className = 'status-message ' + type;
+    el.classList.remove('hidden');
+    setTimeout(() => el.classList.add('hidden'), 3000);
+}
+
+function showModelsStatus(message, type) {
+    const el = document.getElementById('modelsStatusMessage');
+    el.textContent = message;
+    el.className = 'status-message ' + type;
+    el.classList.remove('hidden');
+    setTimeout(() => el.classList.add('hidden'), 3000);
+}
+
+function startTimers() {
+    updateTimers();
+    setInterval(updateTimers, 1000);
+}
+
+// Session timers come and go with dashboard updates, so one interval
+// updates whichever are on the page
+function updateTimers() {
+    document.querySelectorAll('.tool-timer').forEach(timer => {
+        const elapsed = Math.max(0, Math.floor((new Date() - new Date(timer.dataset.start)) / 1000));
+        const minutes = Math.floor(elapsed / 60);
+        const seconds = elapsed % 60;
+        timer.textContent = minutes.toString().padStart(2, '0') + ':' + seconds.toString().padStart(2, '0');
+    });
+}
+
+// Terminal functions
+var logStream = null;
+var terminalJobId = null;  // Job shown in the admin terminal
+var modelsTerminalJobId = null;  // Job shown in the models terminal
+var activeAdminButton = null;
+var activeAdminAction = null;
+var activeAdminToolId = null;
+
+function showTerminal() {
+    document.getElementById('terminalContainer').classList.add('visible');
+}
+
+function minimizeTerminal() {
+    var terminal = document.getElementById('terminal');
+    if (terminal.style.display === 'none') {
+        terminal.style.display = 'block';
+    } else {
+        terminal.style.display = 'none';
+    }
+}
+
+function clearTerminal() {
+    document.getElementById('terminal').innerHTML = '';
+    // Also clear server-side log
+    clearJobLog(terminalJobId);
+}
+
+// Clear a finished job's log on the server, so it doesn't come back on the
+// next reconnect or reload (a running job keeps its log)
+function clearJobLog(jobId) {
+    if (!jobId) return;
+    fetch('/clear_logs', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ job_id: jobId })
+    });
+}
+
+function appendToTerminal(text, className) {
+    const terminal = document.getElementById('terminal');
+    const span = document.createElement('span');
+    if (className) span.className = className;
+    span.textContent = text;
+    terminal.appendChild(span);
+    terminal.scrollTop = terminal.scrollHeight;
+}
+
+// Open a Server-Sent Events stream on /logs/stream. The browser resumes
+// from the last received offset on reconnect; the stream is closed once
+// the server reports the process exited (or the tool port is ready).
+function openLogStream(params, handlers) {
+    var source = new EventSource('/logs/stream?' + params);
+    source.addEventListener('log', function(e) {
+        handlers.log(JSON.parse(e.data));
+    });
+    source.addEventListener('exit', function(e) {
+        source.close();
+        if (handlers.exit) handlers.exit(JSON.parse(e.data));
+    });
+    source.addEventListener('port_ready', function(e) {
+        source.close();
+        if (handlers.portReady) handlers.portReady(JSON.parse(e.data));
+    });
+    return source;
+}
+
+function startLogStream(jobId) {
+    stopLogStream();
+    terminalJobId = jobId;
+    logStream = openLogStream('log=admin&job=' + encodeURIComponent(jobId), {
+        log: function(data) {
+            if (data.reset) {
+                document.getElementById('terminal').innerHTML = '';
+            }
+            if (data.content) {
+                appendToTerminal(data.content);
+            }
+        },
+        exit: function() {
+            logStream = null;
+            appendToTerminal('\n--- Process completed ---\n', 'success');
+            stopTerminalTimer();
+            // Re-enable the admin button
+            resetAdminButton();
+            // Don't auto-reload - let user see any errors
+        }
+    });
+}
+
+function stopLogStream() {
+    if (logStream) {
+        logStream.close();
+        logStream = null;
+    }
+}
+
+// Terminal timer functions
+var terminalTimerInterval = null;
+var terminalTimerStart = null;
+
+function startTerminalTimer(timerId) {
+    stopTerminalTimer();
+    terminalTimerStart = Date.now();
+    var timerElement = document.getElementById(timerId || 'terminalTimer');
+    if (timerElement) {
+        timerElement.textContent = '0:00';
+        terminalTimerInterval = setInterval(function() {
+            var elapsed = Math.floor((Date.now() - terminalTimerStart) / 1000);
+            var minutes = Math.floor(elapsed / 60);
+            var seconds = elapsed % 60;
+            timerElement.textContent = minutes + ':' + (seconds < 10 ? '0' : '') + seconds;
+        }, 1000);
+    }
+}
+
+function stopTerminalTimer() {
+    if (terminalTimerInterval) {
+        clearInterval(terminalTimerInterval);
+        terminalTimerInterval = null;
+    }
+}
+
+function resetAdminButton() {
+    if (activeAdminButton && activeAdminAction && activeAdminToolId) {
+        activeAdminButton.disabled = false;
+        activeAdminButton.textContent = activeAdminAction.charAt(0).toUpperCase() + activeAdminAction.slice(1);
+        activeAdminButton = null;
+        activeAdminAction = null;
+        activeAdminToolId = null;
+    }
+}
+
+// User terminal functions
+var userLogStream = null;
+var userLogTimeout = null;
+
+function showUserTerminal(toolName) {
+    var container = document.getElementById('userTerminalContainer');
+    var title = container.querySelector('.terminal-title');
+    title.textContent = 'Starting ' + (toolName || '...');
+    container.classList.add('visible');
+}
+
+function minimizeUserTerminal() {
+    var terminal = document.getElementById('userTerminal');
+    if (terminal.style.display === 'none') {
+        terminal.style.display = 'block';
+    } else {
+        terminal.style.display = 'none';
+    }
+}
+
+function copyUserTerminal() {
+    var terminal = document.getElementById('userTerminal');
+    navigator.clipboard.writeText(terminal.textContent).then(function() {
+        showStatus('Terminal content copied to clipboard', 'success');
+    }).catch(function(err) {
+        showStatus('Failed to copy: ' + err, 'error');
+    });
+}
+
+function clearUserTerminal() {
+    document.getElementById('userTerminal').innerHTML = '';
+}
+
+function appendToUserTerminal(text, className) {
+    var terminal = document.getElementById('userTerminal');
+    var span = document.createElement('span');
+    if (className) span.className = className;
+    // Handle literal backslash-n from raw Python strings (\\\\n becomes \\n in JS regex)
+    span.innerHTML = text.replace(/\\\\n/g, '<br>').replace(/\n/g, '<br>');
+    terminal.appendChild(span);
+    terminal.scrollTop = terminal.scrollHeight;
+}
+
+function startUserLogStream(toolId, toolName) {
+    var tool = tools[toolId];
+    var port = tool ? tool.port : null;
+    var maxWait = 960000; // Backstop; the server fails a session after 15 minutes
+
+    stopUserLogStream();
+
+    userLogStream = openLogStream('log=user&tool=' + encodeURIComponent(toolId), {
+        log: function(logData) {
+            if (logData.reset) {
+                clearUserTerminal();
+            }
+            // Show new log content
+            if (logData.content) {
+                appendToUserTerminal(logData.content);
+
+                // Auto-scroll
+                var terminal = document.getElementById('userTerminal');
+                terminal.scrollTop = terminal.scrollHeight;
+            }
+        },
+        portReady: function() {
+            stopUserLogStream();
+            // Open the tool
+            var url = 'https://' + runpodId + '-' + port + '.proxy.runpod.net';
+            window.open(url, '_blank');
+        },
+        exit: function(data) {
+            stopUserLogStream();
+            if (data.error) {
+                showStatus(toolName + ': ' + data.error, 'error');
+            } else {
+                showStatus(toolName + ' process exited unexpectedly', 'error');
+            }
+        }
+    });
+
+    userLogTimeout = setTimeout(function() {
+        stopUserLogStream();
+        showStatus('Timeout waiting for ' + toolName + ' to start', 'error');
+    }, maxWait);
+}
+
+function stopUserLogStream() {
+    if (userLogStream) {
+        userLogStream.close();
+        userLogStream = null;
+    }
+    if (userLogTimeout) {
+        clearTimeout(userLogTimeout);
+        userLogTimeout = null;
+    }
+}
@@ -12,9 +12,12 @@ cd /workspace/ai-toolkit
 python3 -m venv venv
 source venv/bin/activate
 
+REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+source "$REPO_DIR/setup/wheel_cache.sh"
+
 pip install --upgrade pip
-pip install --pre torch torchvision torchaudio --index-url https://download.pytorch.org/whl/nightly/cu128
-pip install -r requirements.txt
+pip_install_cached --pre torch torchvision torchaudio --index-url https://download.pytorch.org/whl/nightly/cu128
+pip_install_cached -r requirements.txt
 
 cd ui
 npm install
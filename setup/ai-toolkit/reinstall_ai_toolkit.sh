@@ -3,9 +3,39 @@ set -e
 
 echo "Reinstalling AI-Toolkit"
 
-rm -rf /workspace/ai-toolkit
-
 REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+OLD_DIR="/workspace/ai-toolkit.old-$(date +%Y%m%d-%H%M%S)"
+DATA_DIRS="output config datasets"
+
+# Retained backup of trained models, job configs and datasets in
+# /workspace/backup, deduplicated against the previous one. The old install
+# is moved aside so the data can be moved over and it can be put back if the
+# new install fails.
+if [ -d /workspace/ai-toolkit ]; then
+    python3 "$REPO_DIR/setup/backup.py" snapshot ai-toolkit /workspace/ai-toolkit $DATA_DIRS
+    mv /workspace/ai-toolkit "$OLD_DIR"
+fi
+
+restore_old() {
+    echo "Reinstall failed, restoring the previous AI-Toolkit"
+    rm -rf /workspace/ai-toolkit
+    if [ -d "$OLD_DIR" ]; then
+        mv "$OLD_DIR" /workspace/ai-toolkit
+    fi
+}
+trap restore_old ERR
+
 bash "$REPO_DIR/setup/ai-toolkit/install_ai_toolkit.sh"
 
+trap - ERR
+
+for dir in $DATA_DIRS; do
+    if [ -d "$OLD_DIR/$dir" ]; then
+        rm -rf "/workspace/ai-toolkit/$dir"
+        mv "$OLD_DIR/$dir" "/workspace/ai-toolkit/$dir"
+    fi
+done
+
+nohup rm -rf "$OLD_DIR" > /dev/null 2>&1 &
+
 echo "AI-Toolkit Reinstall complete"
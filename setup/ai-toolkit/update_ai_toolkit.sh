@@ -6,11 +6,14 @@ echo "Updating AI-Toolkit"
 cd /workspace/ai-toolkit
 source venv/bin/activate
 
+REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+source "$REPO_DIR/setup/wheel_cache.sh"
+
 git stash
 git pull --force
 
-pip install --pre torch torchvision torchaudio --index-url https://download.pytorch.org/whl/nightly/cu128
-pip install -r requirements.txt
+pip_install_cached --pre torch torchvision torchaudio --index-url https://download.pytorch.org/whl/nightly/cu128
+pip_install_cached -r requirements.txt
 
 cd ui
 npm install
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Backups of tool data for reinstalls.
+
+Snapshots live in /workspace/backup/<tool>-<timestamp>. A snapshot is an
+independent backup: it never shares an inode with the live tree, so later
+writes to the tool's files can't change it. A file unchanged since the tool's
+previous snapshot is hardlinked from that snapshot (snapshots share unchanged
+files with each other, so their files must never be edited in place);
+anything else is reflinked on filesystems that support it and copied
+otherwise. Restoring clones each file next to its destination and renames it
+over, so the snapshot stays independent and no file is left half written.
+Each snapshot records a manifest with how many bytes were reused, reflinked
+or copied. Old snapshots are pruned per tool after each new one.
+
+Usage:
+    backup.py snapshot <tool> <root> <dir>...   Snapshot <root>/<dir>..., print its path
+    backup.py restore <snapshot> <root>         Copy a snapshot's files back into <root>
+    backup.py prune [--keep N]                  Apply the retention policy
+    backup.py list [--json]                     Snapshots with sizes and savings
+"""
+
+import fcntl
+import json
+import os
+import re
+import shutil
+import stat
+import sys
+import time
+
+BACKUP_DIR = os.environ.get("BACKUP_DIR", "/workspace/backup")
+BACKUP_KEEP = int(os.environ.get("BACKUP_KEEP", "5"))  # Snapshots kept per tool
+MANIFEST = ".manifest.json"
+FICLONE = 0x40049409  # ioctl request for reflinks (Linux)
+SNAPSHOT_NAME = re.compile(r"^(?P<tool>.+)-(?P<stamp>\d{8}-\d{6})$")
+
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def list_snapshots(tool=None):
+    """Snapshot directories as [(tool, stamp, path)], oldest first"""
+    snapshots = []
+    try:
+        names = os.listdir(BACKUP_DIR)
+    except OSError:
+        return snapshots
+    for name in names:
+        match = SNAPSHOT_NAME.match(name)
+        path = os.path.join(BACKUP_DIR, name)
+        if (
+            match
+            and os.path.isdir(path)
+            and (tool is None or match.group("tool") == tool)
+        ):
+            snapshots.append((match.group("tool"), match.group("stamp"), path))
+    snapshots.sort(key=lambda s: s[1])
+    return snapshots
+
+
+def load_manifest(snapshot):
+    try:
+        with open(os.path.join(snapshot, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def reflink(src, dest):
+    """Copy-on-write clone of src at dest; raises OSError where unsupported"""
+    with open(src, "rb") as fsrc:
+        fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+        except OSError:
+            os.close(fd)
+            os.remove(dest)
+            raise
+        os.close(fd)
+    shutil.copystat(src, dest)
+
+
+def clone_file(src, dest, state):
+    """
+    Copy src to dest as an independent file, by reflink where possible.
+    Returns 'reflink' or 'copy'. state remembers whether the filesystem
+    refused reflinks so it isn't retried for every file.
+    """
+    if state.get("reflink", True):
+        try:
+            reflink(src, dest)
+            return "reflink"
+        except OSError:
+            state["reflink"] = False
+    shutil.copy2(src, dest)
+    return "copy"
+
+
+def snapshot(tool, root, dirs):
+    """Snapshot root/<dir> for each dir; returns the snapshot path"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    target = os.path.join(BACKUP_DIR, f"{tool}-{stamp}")
+    previous = list_snapshots(tool)
+    previous_path = previous[-1][2] if previous else None
+    previous_files = (
+        (load_manifest(previous_path) or {}).get("files", {}) if previous_path else {}
+    )
+
+    files = {}
+    stats = {"files": 0, "bytes": 0, "copied": 0, "reused": 0, "reflink": 0}
+    state = {}
+    os.makedirs(target)
+
+    for name in dirs:
+        source_dir = os.path.join(root, name)
+        if not os.path.isdir(source_dir):
+            continue
+        for current, subdirs, filenames in os.walk(source_dir):
+            rel_dir = os.path.relpath(current, root)
+            os.makedirs(os.path.join(target, rel_dir), exist_ok=True)
+            for filename in filenames:
+                src = os.path.join(current, filename)
+                rel = os.path.join(rel_dir, filename)
+                dest = os.path.join(target, rel)
+                st = os.lstat(src)
+                if not stat.S_ISREG(st.st_mode):
+                    continue  # Symlinks, sockets etc. are left out
+                signature = [st.st_size, st.st_mtime_ns]
+                files[rel] = signature
+                stats["files"] += 1
+                stats["bytes"] += st.st_size
+
+                # Unchanged since the last snapshot: share its copy
+                if previous_files.get(rel) == signature:
+                    try:
+                        os.link(os.path.join(previous_path, rel), dest)
+                        stats["reused"] += st.st_size
+                        continue
+                    except OSError:
+                        pass
+
+                method = clone_file(src, dest, state)
+                stats["copied" if method == "copy" else method] += st.st_size
+
+    stats["saved"] = stats["bytes"] - stats["copied"]
+    with open(os.path.join(target, MANIFEST), "w") as f:
+        json.dump(
+            {"tool": tool, "root": root, "dirs": dirs, "stats": stats, "files": files},
+            f,
+        )
+
+    print(
+        f"Backed up {stats['files']} file(s), {format_bytes(stats['bytes'])} to {target}: "
+        f"{format_bytes(stats['reused'])} unchanged since last snapshot, "
+        f"{format_bytes(stats['reflink'])} reflinked, "
+        f"{format_bytes(stats['copied'])} copied",
+        file=sys.stderr,
+    )
+    prune(tool=tool)
+    return target
+
+
+def restore(snapshot_path, root):
+    """Put every file of a snapshot back into root, replacing what's there"""
+    state = {}
+    restored = 0
+    for current, _subdirs, filenames in os.walk(snapshot_path):
+        rel_dir = os.path.relpath(current, snapshot_path)
+        os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+        for filename in filenames:
+            if rel_dir == "." and filename == MANIFEST:
+                continue
+            dest = os.path.join(root, rel_dir, filename)
+            # Clone next to the destination, then swap it in with a rename
+            partial = f"{dest}.restore-{os.getpid()}"
+            clone_file(os.path.join(current, filename), partial, state)
+            os.replace(partial, dest)
+            restored += 1
+    print(f"Restored {restored} file(s) from {snapshot_path}", file=sys.stderr)
+
+
+def prune(tool=None, keep=BACKUP_KEEP):
+    """Keep the newest `keep` snapshots of each tool, delete the rest"""
+    by_tool = {}
+    for snapshot_tool, stamp, path in list_snapshots(tool):
+        by_tool.setdefault(snapshot_tool, []).append(path)
+    removed = []
+    for paths in by_tool.values():
+        for path in paths[: max(len(paths) - keep, 0)]:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    if removed:
+        print(f"Pruned {len(removed)} old snapshot(s)", file=sys.stderr)
+    return removed
+
+
+def describe():
+    """Snapshots with logical size, bytes saved and the space actually used"""
+    snapshots = []
+    seen_inodes = set()
+    total_used = 0
+    for tool, stamp, path in list_snapshots():
+        manifest = load_manifest(path) or {}
+        logical, used = 0, 0
+        for current, _subdirs, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    st = os.lstat(os.path.join(current, filename))
+                except OSError:
+                    continue
+                logical += st.st_size
+                if (st.st_dev, st.st_ino) not in seen_inodes:
+                    seen_inodes.add((st.st_dev, st.st_ino))
+                    used += st.st_size
+        total_used += used
+        snapshots.append(
+            {
+                "tool": tool,
+                "stamp": stamp,
+                "path": path,
+                "bytes": logical,
+                "new_bytes": used,  # Not shared with an older snapshot
+                "stats": manifest.get("stats"),
+            }
+        )
+    return {"snapshots": snapshots, "bytes_used": total_used, "keep": BACKUP_KEEP}
+
+
+def main(args):
+    if not args:
+        print(__doc__)
+        return 1
+    command = args[0]
+    if command == "snapshot" and len(args) >= 4:
+        print(snapshot(args[1], args[2], args[3:]))
+    elif command == "restore" and len(args) == 3:
+        restore(args[1], args[2])
+    elif command == "prune":
+        keep = int(args[2]) if len(args) == 3 and args[1] == "--keep" else BACKUP_KEEP
+        prune(keep=keep)
+    elif command == "list":
+        info = describe()
+        if "--json" in args:
+            print(json.dumps(info))
+        else:
+            for s in info["snapshots"]:
+                print(
+                    f"{s['path']}  {format_bytes(s['bytes'])} ({format_bytes(s['new_bytes'])} new)"
+                )
+            print(f"Total on disk: {format_bytes(info['bytes_used'])}")
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
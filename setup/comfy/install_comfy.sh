@@ -4,6 +4,10 @@ set -e
 
 echo "Installing ComfyUI"
 
+REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+# Set by reinstall_comfy.sh: the previous venv, reused if its lock still matches
+VENV_SNAPSHOT="${VENV_SNAPSHOT:-}"
+
 cd /workspace
 
 git clone --depth 1 https://github.com/comfyanonymous/ComfyUI
@@ -14,13 +18,6 @@ git reset --hard
 git stash
 git pull --force
 
-python -m venv venv
-source venv/bin/activate
-
-python -m pip install --upgrade pip
-
-pip install torch==2.8.0 torchvision torchaudio --index-url https://download.pytorch.org/whl/cu129
-
 cd custom_nodes
 
 git clone --depth 1 https://github.com/ltdrdata/ComfyUI-Manager
@@ -32,41 +29,76 @@ cd ComfyUI-Manager
 git stash
 git reset --hard
 git pull --force
-[ -f "requirements.txt" ] && pip install -r requirements.txt
 cd ..
 
 cd ComfyUI-GGUF
 git stash
 git reset --hard
 git pull --force
-[ -f "requirements.txt" ] && pip install -r requirements.txt
 cd ..
 
 cd RES4LYF
 git stash
 git reset --hard
 git pull --force
-[ -f "requirements.txt" ] && pip install -r requirements.txt
 cd ..
 
 cd rgthree-comfy
 git stash
 git reset --hard
 git pull --force
-[ -f "requirements.txt" ] && pip install -r requirements.txt
 cd ..
 
 cd ..
 
-pip install -r requirements.txt
-pip install -r /workspace/runpod-ggs/setup/comfy/requirements.txt
-
-pip uninstall xformers --yes
-
-pip install https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/flash_attn-2.8.2-cp310-cp310-linux_x86_64.whl
-pip install https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/xformers-0.0.33+c159edc0.d20250906-cp39-abi3-linux_x86_64.whl
-pip install https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/sageattention-2.2.0.post4-cp39-abi3-linux_x86_64.whl
-pip install https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/insightface-0.7.3-cp310-cp310-linux_x86_64.whl
+# Lock hash: everything that decides what goes into the venv
+LOCK_HASH=$(cat "$REPO_DIR/setup/comfy/install_comfy.sh" "$REPO_DIR/setup/comfy/requirements.txt" \
+    requirements.txt custom_nodes/*/requirements.txt 2>/dev/null | sha256sum | cut -d' ' -f1)
+
+# A snapshot is reusable when it was built from the same lock hash, torch still
+# imports, and every package recorded at install time is still installed at
+# the same version (packages added later by custom nodes are fine)
+venv_snapshot_valid() {
+    local venv="$1"
+    [ -f "$venv/.lock-hash" ] && [ -f "$venv/.lock" ] || return 1
+    [ "$(cat "$venv/.lock-hash")" = "$LOCK_HASH" ] || return 1
+    "$venv/bin/python" -c "import torch, torchvision, torchaudio" || return 1
+    [ -z "$(comm -23 <(sort "$venv/.lock") <("$venv/bin/python" -m pip freeze | sort))" ]
+}
+
+if [ -n "$VENV_SNAPSHOT" ] && venv_snapshot_valid "$VENV_SNAPSHOT"; then
+    echo "Dependencies unchanged, reusing the existing venv"
+    mv "$VENV_SNAPSHOT" venv
+else
+    [ -n "$VENV_SNAPSHOT" ] && echo "Dependencies changed or venv snapshot invalid, building a new venv"
+
+    python -m venv venv
+    source venv/bin/activate
+
+    source "$REPO_DIR/setup/wheel_cache.sh"
+
+    python -m pip install --upgrade pip
+
+    pip_install_cached torch==2.8.0 torchvision torchaudio --index-url https://download.pytorch.org/whl/cu129
+
+    # All requirement files in a single resolver pass
+    requirement_args=(-r requirements.txt -r "$REPO_DIR/setup/comfy/requirements.txt")
+    for requirements in custom_nodes/*/requirements.txt; do
+        [ -f "$requirements" ] && requirement_args+=(-r "$requirements")
+    done
+    pip_install_cached "${requirement_args[@]}"
+
+    pip uninstall xformers --yes
+
+    pip install "$(cached_wheel https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/flash_attn-2.8.2-cp310-cp310-linux_x86_64.whl)"
+    pip install "$(cached_wheel https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/xformers-0.0.33+c159edc0.d20250906-cp39-abi3-linux_x86_64.whl)"
+    pip install "$(cached_wheel https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/sageattention-2.2.0.post4-cp39-abi3-linux_x86_64.whl)"
+    pip install "$(cached_wheel https://huggingface.co/MonsterMMORPG/Wan_GGUF/resolve/main/insightface-0.7.3-cp310-cp310-linux_x86_64.whl)"
+
+    # Record the lock so a later reinstall can reuse this venv
+    pip freeze > venv/.lock
+    echo "$LOCK_HASH" > venv/.lock-hash
+fi
 
 apt update
 apt install psmisc
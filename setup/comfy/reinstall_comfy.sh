@@ -5,18 +5,40 @@ echo "Reinstalling ComfyUI"
 
 cd /workspace
 
-BACKUP_DIR="/workspace/backup/comfy-$(date +%Y%m%d-%H%M%S)"
-mkdir -p "$BACKUP_DIR"
-
-[ -d "ComfyUI/output" ] && cp -r ComfyUI/output "$BACKUP_DIR/"
-[ -d "ComfyUI/input" ] && cp -r ComfyUI/input "$BACKUP_DIR/"
-
-rm -rf ComfyUI
-
 REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
-bash "$REPO_DIR/setup/comfy/install_comfy.sh"
-
-[ -d "$BACKUP_DIR/output" ] && cp -r "$BACKUP_DIR/output/"* /workspace/ComfyUI/output/
-[ -d "$BACKUP_DIR/input" ] && cp -r "$BACKUP_DIR/input/"* /workspace/ComfyUI/input/
+OLD_DIR="/workspace/ComfyUI.old-$(date +%Y%m%d-%H%M%S)"
+
+# Retained backup of output and input in /workspace/backup, deduplicated
+# against the previous one
+python3 "$REPO_DIR/setup/backup.py" snapshot comfy /workspace/ComfyUI output input
+
+# Move the old install aside (a rename, not a copy or delete) so its venv can
+# be reused and it can be put back if the new install fails
+mv ComfyUI "$OLD_DIR"
+
+restore_old() {
+    echo "Reinstall failed, restoring the previous ComfyUI"
+    if [ ! -d "$OLD_DIR/venv" ] && [ -d /workspace/ComfyUI/venv ]; then
+        mv /workspace/ComfyUI/venv "$OLD_DIR/venv"
+    fi
+    rm -rf /workspace/ComfyUI
+    mv "$OLD_DIR" /workspace/ComfyUI
+}
+trap restore_old ERR
+
+VENV_SNAPSHOT="$OLD_DIR/venv" bash "$REPO_DIR/setup/comfy/install_comfy.sh"
+
+trap - ERR
+
+# Move output and input over instead of copying them back
+for dir in output input; do
+    if [ -d "$OLD_DIR/$dir" ]; then
+        rm -rf "/workspace/ComfyUI/$dir"
+        mv "$OLD_DIR/$dir" "/workspace/ComfyUI/$dir"
+    fi
+done
+
+# The rest of the old install is removed in the background
+nohup rm -rf "$OLD_DIR" > /dev/null 2>&1 &
 
 echo "ComfyUI Reinstall complete"
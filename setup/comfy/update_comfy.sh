@@ -6,9 +6,12 @@ echo "Updating ComfyUI"
 cd /workspace/ComfyUI
 source venv/bin/activate
 
+REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+source "$REPO_DIR/setup/wheel_cache.sh"
+
 git stash
 git pull --force
 
-pip install -r requirements.txt
+pip_install_cached -r requirements.txt
 
 echo "ComfyUI Update complete"
@@ -18,6 +18,7 @@ source /workspace/ComfyUI/venv/bin/activate
 mkdir -p "$CUSTOM_NODES_DIR"
 cd "$CUSTOM_NODES_DIR"
 
+new_nodes=()
 while read -r repo_url || [ -n "$repo_url" ]; do
     [[ "$repo_url" =~ ^#.*$ ]] || [ -z "$repo_url" ] && continue
 
@@ -30,14 +31,21 @@ while read -r repo_url || [ -n "$repo_url" ]; do
     fi
 
     echo "Installing $repo_name..."
-    git clone "$repo_url"
+    git clone --depth 1 "$repo_url"
+    new_nodes+=("$node_path")
 
+done < "$NODES_CONFIG"
+
+# Resolve the requirements of all nodes together in one pass
+if [ ${#new_nodes[@]} -gt 0 ]; then
+    bash "$REPO_DIR/setup/custom-nodes/install_requirements.sh"
+fi
+
+for node_path in "${new_nodes[@]}"; do
     cd "$node_path"
-    [ -f "requirements.txt" ] && pip install -r requirements.txt
     [ -f "install.py" ] && python install.py
     [ -f "install.sh" ] && bash install.sh
     cd "$CUSTOM_NODES_DIR"
-
-done < "$NODES_CONFIG"
+done
 
 echo "Custom nodes installation complete"
@@ -0,0 +1,38 @@
+#!/bin/bash
+
+# Install the requirements of every installed custom node, ComfyUI and
+# setup/comfy in a single resolver run (uv when available, otherwise pip)
+set -e
+
+REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+NODES_CONFIG="$REPO_DIR/setup/custom-nodes/nodes.txt"
+CUSTOM_NODES_DIR="/workspace/ComfyUI/custom_nodes"
+MERGED="/workspace/ComfyUI/.custom_nodes_requirements.txt"
+
+source /workspace/ComfyUI/venv/bin/activate
+
+echo "# Generated by install_requirements.sh: custom node requirements, resolved together" > "$MERGED"
+[ -f "/workspace/ComfyUI/requirements.txt" ] && echo "-r /workspace/ComfyUI/requirements.txt" >> "$MERGED"
+[ -f "$REPO_DIR/setup/comfy/requirements.txt" ] && echo "-r $REPO_DIR/setup/comfy/requirements.txt" >> "$MERGED"
+
+while read -r repo_url || [ -n "$repo_url" ]; do
+    [[ "$repo_url" =~ ^#.*$ ]] || [ -z "$repo_url" ] && continue
+
+    requirements="$CUSTOM_NODES_DIR/$(basename "$repo_url" .git)/requirements.txt"
+    [ -f "$requirements" ] && echo "-r $requirements" >> "$MERGED"
+done < "$NODES_CONFIG"
+
+# Report packages pinned to different exact versions by different files
+awk '{ sub(/[;#].*/, ""); gsub(/[[:space:]]/, "") }
+    /^[A-Za-z0-9][A-Za-z0-9._-]*==[^,]+$/ {
+        split($0, req, "=="); name = tolower(req[1]); gsub(/[._]+/, "-", name)
+        if (!seen[name, req[2]]++) { pins[name] = pins[name] ? pins[name] ", " req[2] : req[2]; count[name]++ }
+    }
+    END { for (name in count) if (count[name] > 1) print "Conflicting pins for " name ": " pins[name] }' \
+    $(sed -n 's/^-r //p' "$MERGED")
+
+if command -v uv > /dev/null; then
+    uv pip install --python "$(command -v python)" -r "$MERGED"
+else
+    pip install -r "$MERGED"
+fi
@@ -16,6 +16,7 @@ fi
 
 source /workspace/ComfyUI/venv/bin/activate
 
+updated_nodes=()
 while read -r repo_url || [ -n "$repo_url" ]; do
     [[ "$repo_url" =~ ^#.*$ ]] || [ -z "$repo_url" ] && continue
 
@@ -31,11 +32,17 @@ while read -r repo_url || [ -n "$repo_url" ]; do
     cd "$node_path"
     git stash
     git pull --force
+    updated_nodes+=("$node_path")
 
-    [ -f "requirements.txt" ] && pip install -r requirements.txt
+done < "$NODES_CONFIG"
+
+# Resolve the requirements of all nodes together in one pass
+bash "$REPO_DIR/setup/custom-nodes/install_requirements.sh"
+
+for node_path in "${updated_nodes[@]}"; do
+    cd "$node_path"
     [ -f "install.py" ] && python install.py
     [ -f "install.sh" ] && bash install.sh
-
-done < "$NODES_CONFIG"
+done
 
 echo "Custom nodes update complete"
@@ -43,8 +43,9 @@ cd "$MODELS_DIR/diffusion_models"
 echo "  • flux1-dev.safetensors"
 if [ ! -f "flux1-dev.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O flux1-dev.safetensors \
+         -c -O flux1-dev.safetensors.incomplete \
          "https://huggingface.co/black-forest-labs/FLUX.1-dev/resolve/main/flux1-dev.safetensors"
+    mv flux1-dev.safetensors.incomplete flux1-dev.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -52,8 +53,9 @@ fi
 echo "  • flux1-schnell.safetensors"
 if [ ! -f "flux1-schnell.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O flux1-schnell.safetensors \
+         -c -O flux1-schnell.safetensors.incomplete \
          "https://huggingface.co/black-forest-labs/FLUX.1-schnell/resolve/main/flux1-schnell.safetensors"
+    mv flux1-schnell.safetensors.incomplete flux1-schnell.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -61,8 +63,9 @@ fi
 echo "  • flux1-fill-dev.safetensors"
 if [ ! -f "flux1-fill-dev.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O flux1-fill-dev.safetensors \
+         -c -O flux1-fill-dev.safetensors.incomplete \
          "https://huggingface.co/black-forest-labs/FLUX.1-Fill-dev/resolve/main/flux1-fill-dev.safetensors"
+    mv flux1-fill-dev.safetensors.incomplete flux1-fill-dev.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -70,8 +73,9 @@ fi
 echo "  • flux1-kontext-dev.safetensors"
 if [ ! -f "flux1-kontext-dev.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O flux1-kontext-dev.safetensors \
+         -c -O flux1-kontext-dev.safetensors.incomplete \
          "https://huggingface.co/black-forest-labs/FLUX.1-Kontext-dev/resolve/main/flux1-kontext-dev.safetensors"
+    mv flux1-kontext-dev.safetensors.incomplete flux1-kontext-dev.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -79,8 +83,9 @@ fi
 echo "  • flux1-redux-dev.safetensors"
 if [ ! -f "flux1-redux-dev.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O flux1-redux-dev.safetensors \
+         -c -O flux1-redux-dev.safetensors.incomplete \
          "https://huggingface.co/black-forest-labs/FLUX.1-Redux-dev/resolve/main/flux1-redux-dev.safetensors"
+    mv flux1-redux-dev.safetensors.incomplete flux1-redux-dev.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -93,8 +98,9 @@ cd "$MODELS_DIR/clip"
 echo "  • clip_l.safetensors"
 if [ ! -f "clip_l.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O clip_l.safetensors \
+         -c -O clip_l.safetensors.incomplete \
          "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/clip_l.safetensors"
+    mv clip_l.safetensors.incomplete clip_l.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -102,8 +108,9 @@ fi
 echo "  • t5xxl_fp8_e4m3fn.safetensors"
 if [ ! -f "t5xxl_fp8_e4m3fn.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O t5xxl_fp8_e4m3fn.safetensors \
+         -c -O t5xxl_fp8_e4m3fn.safetensors.incomplete \
          "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/t5xxl_fp8_e4m3fn.safetensors"
+    mv t5xxl_fp8_e4m3fn.safetensors.incomplete t5xxl_fp8_e4m3fn.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -111,8 +118,9 @@ fi
 echo "  • t5xxl_fp16.safetensors"
 if [ ! -f "t5xxl_fp16.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O t5xxl_fp16.safetensors \
+         -c -O t5xxl_fp16.safetensors.incomplete \
          "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/t5xxl_fp16.safetensors"
+    mv t5xxl_fp16.safetensors.incomplete t5xxl_fp16.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -125,8 +133,9 @@ cd "$MODELS_DIR/clip_vision"
 echo "  • sigclip_vision_patch14_384.safetensors"
 if [ ! -f "sigclip_vision_patch14_384.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O sigclip_vision_patch14_384.safetensors \
+         -c -O sigclip_vision_patch14_384.safetensors.incomplete \
          "https://huggingface.co/Comfy-Org/sigclip_vision_384/resolve/main/sigclip_vision_patch14_384.safetensors"
+    mv sigclip_vision_patch14_384.safetensors.incomplete sigclip_vision_patch14_384.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -139,8 +148,9 @@ cd "$MODELS_DIR/vae"
 echo "  • ae.safetensors"
 if [ ! -f "ae.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O ae.safetensors \
+         -c -O ae.safetensors.incomplete \
          "https://huggingface.co/black-forest-labs/FLUX.1-schnell/resolve/main/ae.safetensors"
+    mv ae.safetensors.incomplete ae.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -153,8 +163,9 @@ cd "$MODELS_DIR/controlnet"
 echo "  • FLUX.1-dev-ControlNet-Union-Pro.safetensors"
 if [ ! -f "FLUX.1-dev-ControlNet-Union-Pro.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O FLUX.1-dev-ControlNet-Union-Pro.safetensors \
+         -c -O FLUX.1-dev-ControlNet-Union-Pro.safetensors.incomplete \
          "https://huggingface.co/Shakker-Labs/FLUX.1-dev-ControlNet-Union-Pro/resolve/main/diffusion_pytorch_model.safetensors"
+    mv FLUX.1-dev-ControlNet-Union-Pro.safetensors.incomplete FLUX.1-dev-ControlNet-Union-Pro.safetensors
 else
     echo "    ✅ Already exists"
 fi
@@ -162,8 +173,9 @@ fi
 echo "  • FLUX.1-dev-ControlNet-Union-Pro-2.0.safetensors"
 if [ ! -f "FLUX.1-dev-ControlNet-Union-Pro-2.0.safetensors" ]; then
     wget --header="Authorization: Bearer $HUGGING_FACE_HUB_TOKEN" \
-         -O FLUX.1-dev-ControlNet-Union-Pro-2.0.safetensors \
+         -c -O FLUX.1-dev-ControlNet-Union-Pro-2.0.safetensors.incomplete \
          "https://huggingface.co/Shakker-Labs/FLUX.1-dev-ControlNet-Union-Pro-2.0/resolve/main/diffusion_pytorch_model.safetensors"
+    mv FLUX.1-dev-ControlNet-Union-Pro-2.0.safetensors.incomplete FLUX.1-dev-ControlNet-Union-Pro-2.0.safetensors
 else
     echo "    ✅ Already exists"
 fi
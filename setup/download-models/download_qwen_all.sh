@@ -14,7 +14,8 @@ download() {
         return
     fi
     echo "Downloading $(basename "$dest")..."
-    curl -L -s -o "$dest" "$url"
+    curl -L -f --progress-bar -C - -o "$dest.incomplete" "$url" || return 1
+    mv "$dest.incomplete" "$dest"
 }
 
 download "https://huggingface.co/Comfy-Org/Qwen-Image_ComfyUI/resolve/main/split_files/diffusion_models/qwen_image_fp8_e4m3fn.safetensors" \
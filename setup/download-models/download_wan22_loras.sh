@@ -14,7 +14,8 @@ download() {
     fi
     
     echo "Downloading $(basename "$dest")..."
-    wget --show-progress -q -O "$dest" "$url" || curl -L --progress-bar -o "$dest" "$url"
+    wget --show-progress -q -c -O "$dest.incomplete" "$url" || curl -L -f --progress-bar -C - -o "$dest.incomplete" "$url" || return 1
+    mv "$dest.incomplete" "$dest"
 }
 
 download "https://huggingface.co/Comfy-Org/Wan_2.2_ComfyUI_Repackaged/resolve/main/split_files/loras/wan2.2_i2v_lightx2v_4steps_lora_v1_high_noise.safetensors" \
@@ -14,13 +14,14 @@ download() {
     fi
     
     echo "Downloading $(basename "$dest")..."
-    wget --show-progress -q -O "$dest" "$url" || curl -L --progress-bar -o "$dest" "$url"
+    wget --show-progress -q -c -O "$dest.incomplete" "$url" || curl -L -f --progress-bar -C - -o "$dest.incomplete" "$url" || return 1
+    mv "$dest.incomplete" "$dest"
 }
 
 download "https://huggingface.co/bullerwins/Wan2.2-I2V-A14B-GGUF/resolve/main/wan2.2_i2v_high_noise_14B_Q6_K.gguf" \
-    "ComfyUI/models/unet/wan2.2_i2v_high_noise_14B_Q6_K.gguf"
+    "/workspace/ComfyUI/models/unet/wan2.2_i2v_high_noise_14B_Q6_K.gguf"
 
 download "https://huggingface.co/bullerwins/Wan2.2-I2V-A14B-GGUF/resolve/main/wan2.2_i2v_low_noise_14B_Q6_K.gguf" \
-    "ComfyUI/models/unet/wan2.2_i2v_low_noise_14B_Q6_K.gguf"
+    "/workspace/ComfyUI/models/unet/wan2.2_i2v_low_noise_14B_Q6_K.gguf"
 
 echo "Done"
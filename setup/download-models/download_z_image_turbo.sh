@@ -14,7 +14,8 @@ download() {
         return
     fi
     echo "Downloading $(basename "$dest")..."
-    curl -L -s -o "$dest" "$url"
+    curl -L -f --progress-bar -C - -o "$dest.incomplete" "$url" || return 1
+    mv "$dest.incomplete" "$dest"
 }
 
 download "https://huggingface.co/Comfy-Org/z_image_turbo/resolve/main/split_files/text_encoders/qwen_3_4b.safetensors" \
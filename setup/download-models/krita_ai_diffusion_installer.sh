@@ -103,208 +103,251 @@ echo "============================"
 echo "⬇️  Downloading CLIP Vision models..."
 cd "$MODELS_DIR/clip_vision"
 if [ ! -f "clip-vision_vit-h.safetensors" ]; then
-    wget -O clip-vision_vit-h.safetensors \
+    wget -c -O clip-vision_vit-h.safetensors.incomplete \
         "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors"
+    mv clip-vision_vit-h.safetensors.incomplete clip-vision_vit-h.safetensors
 fi
 if [ ! -f "sigclip_vision_patch14_384.safetensors" ]; then
-    wget -O sigclip_vision_patch14_384.safetensors \
+    wget -c -O sigclip_vision_patch14_384.safetensors.incomplete \
         "https://huggingface.co/Comfy-Org/sigclip_vision_384/resolve/main/sigclip_vision_patch14_384.safetensors"
+    mv sigclip_vision_patch14_384.safetensors.incomplete sigclip_vision_patch14_384.safetensors
 fi
 
 # Upscale Models
 echo "⬇️  Downloading Upscale models..."
 cd "$MODELS_DIR/upscale_models"
 if [ ! -f "4x_NMKD-Superscale-SP_178000_G.pth" ]; then
-    wget -O 4x_NMKD-Superscale-SP_178000_G.pth \
+    wget -c -O 4x_NMKD-Superscale-SP_178000_G.pth.incomplete \
         "https://huggingface.co/gemasai/4x_NMKD-Superscale-SP_178000_G/resolve/main/4x_NMKD-Superscale-SP_178000_G.pth"
+    mv 4x_NMKD-Superscale-SP_178000_G.pth.incomplete 4x_NMKD-Superscale-SP_178000_G.pth
 fi
 if [ ! -f "OmniSR_X2_DIV2K.safetensors" ]; then
-    wget -O OmniSR_X2_DIV2K.safetensors \
+    wget -c -O OmniSR_X2_DIV2K.safetensors.incomplete \
         "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X2_DIV2K.safetensors"
+    mv OmniSR_X2_DIV2K.safetensors.incomplete OmniSR_X2_DIV2K.safetensors
 fi
 if [ ! -f "OmniSR_X3_DIV2K.safetensors" ]; then
-    wget -O OmniSR_X3_DIV2K.safetensors \
+    wget -c -O OmniSR_X3_DIV2K.safetensors.incomplete \
         "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X3_DIV2K.safetensors"
+    mv OmniSR_X3_DIV2K.safetensors.incomplete OmniSR_X3_DIV2K.safetensors
 fi
 if [ ! -f "OmniSR_X4_DIV2K.safetensors" ]; then
-    wget -O OmniSR_X4_DIV2K.safetensors \
+    wget -c -O OmniSR_X4_DIV2K.safetensors.incomplete \
         "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X4_DIV2K.safetensors"
+    mv OmniSR_X4_DIV2K.safetensors.incomplete OmniSR_X4_DIV2K.safetensors
 fi
 if [ ! -f "HAT_SRx4_ImageNet-pretrain.pth" ]; then
-    wget -O HAT_SRx4_ImageNet-pretrain.pth \
+    wget -c -O HAT_SRx4_ImageNet-pretrain.pth.incomplete \
         "https://huggingface.co/Acly/hat/resolve/main/HAT_SRx4_ImageNet-pretrain.pth"
+    mv HAT_SRx4_ImageNet-pretrain.pth.incomplete HAT_SRx4_ImageNet-pretrain.pth
 fi
 if [ ! -f "Real_HAT_GAN_sharper.pth" ]; then
-    wget -O Real_HAT_GAN_sharper.pth \
+    wget -c -O Real_HAT_GAN_sharper.pth.incomplete \
         "https://huggingface.co/Acly/hat/resolve/main/Real_HAT_GAN_sharper.pth"
+    mv Real_HAT_GAN_sharper.pth.incomplete Real_HAT_GAN_sharper.pth
 fi
 
 # ControlNet Models
 echo "⬇️  Downloading ControlNet models..."
 cd "$MODELS_DIR/controlnet"
 if [ ! -f "control_v11p_sd15_inpaint_fp16.safetensors" ]; then
-    wget -O control_v11p_sd15_inpaint_fp16.safetensors \
+    wget -c -O control_v11p_sd15_inpaint_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_inpaint_fp16.safetensors"
+    mv control_v11p_sd15_inpaint_fp16.safetensors.incomplete control_v11p_sd15_inpaint_fp16.safetensors
 fi
 if [ ! -f "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors" ]; then
-    wget -O control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors \
+    wget -c -O control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors"
+    mv control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors.incomplete control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors
 fi
 if [ ! -f "control_lora_rank128_v11p_sd15_scribble_fp16.safetensors" ]; then
-    wget -O control_lora_rank128_v11p_sd15_scribble_fp16.safetensors \
+    wget -c -O control_lora_rank128_v11p_sd15_scribble_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11p_sd15_scribble_fp16.safetensors"
+    mv control_lora_rank128_v11p_sd15_scribble_fp16.safetensors.incomplete control_lora_rank128_v11p_sd15_scribble_fp16.safetensors
 fi
 if [ ! -f "control_v11p_sd15_lineart_fp16.safetensors" ]; then
-    wget -O control_v11p_sd15_lineart_fp16.safetensors \
+    wget -c -O control_v11p_sd15_lineart_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_lineart_fp16.safetensors"
+    mv control_v11p_sd15_lineart_fp16.safetensors.incomplete control_v11p_sd15_lineart_fp16.safetensors
 fi
 if [ ! -f "control_v11p_sd15_softedge_fp16.safetensors" ]; then
-    wget -O control_v11p_sd15_softedge_fp16.safetensors \
+    wget -c -O control_v11p_sd15_softedge_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_softedge_fp16.safetensors"
+    mv control_v11p_sd15_softedge_fp16.safetensors.incomplete control_v11p_sd15_softedge_fp16.safetensors
 fi
 if [ ! -f "control_v11p_sd15_canny_fp16.safetensors" ]; then
-    wget -O control_v11p_sd15_canny_fp16.safetensors \
+    wget -c -O control_v11p_sd15_canny_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_canny_fp16.safetensors"
+    mv control_v11p_sd15_canny_fp16.safetensors.incomplete control_v11p_sd15_canny_fp16.safetensors
 fi
 if [ ! -f "control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors" ]; then
-    wget -O control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors \
+    wget -c -O control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors"
+    mv control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors.incomplete control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors
 fi
 if [ ! -f "control_lora_rank128_v11p_sd15_normalbae_fp16.safetensors" ]; then
-    wget -O control_lora_rank128_v11p_sd15_normalbae_fp16.safetensors \
+    wget -c -O control_lora_rank128_v11p_sd15_normalbae_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11p_sd15_normalbae_fp16.safetensors"
+    mv control_lora_rank128_v11p_sd15_normalbae_fp16.safetensors.incomplete control_lora_rank128_v11p_sd15_normalbae_fp16.safetensors
 fi
 if [ ! -f "control_lora_rank128_v11p_sd15_openpose_fp16.safetensors" ]; then
-    wget -O control_lora_rank128_v11p_sd15_openpose_fp16.safetensors \
+    wget -c -O control_lora_rank128_v11p_sd15_openpose_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11p_sd15_openpose_fp16.safetensors"
+    mv control_lora_rank128_v11p_sd15_openpose_fp16.safetensors.incomplete control_lora_rank128_v11p_sd15_openpose_fp16.safetensors
 fi
 if [ ! -f "control_lora_rank128_v11p_sd15_seg_fp16.safetensors" ]; then
-    wget -O control_lora_rank128_v11p_sd15_seg_fp16.safetensors \
+    wget -c -O control_lora_rank128_v11p_sd15_seg_fp16.safetensors.incomplete \
         "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11p_sd15_seg_fp16.safetensors"
+    mv control_lora_rank128_v11p_sd15_seg_fp16.safetensors.incomplete control_lora_rank128_v11p_sd15_seg_fp16.safetensors
 fi
 if [ ! -f "control_v1p_sd15_qrcode_monster.safetensors" ]; then
-    wget -O control_v1p_sd15_qrcode_monster.safetensors \
+    wget -c -O control_v1p_sd15_qrcode_monster.safetensors.incomplete \
         "https://huggingface.co/monster-labs/control_v1p_sd15_qrcode_monster/resolve/main/control_v1p_sd15_qrcode_monster.safetensors"
+    mv control_v1p_sd15_qrcode_monster.safetensors.incomplete control_v1p_sd15_qrcode_monster.safetensors
 fi
 if [ ! -f "xinsir-controlnet-union-sdxl-1.0-promax.safetensors" ]; then
-    wget -O xinsir-controlnet-union-sdxl-1.0-promax.safetensors \
+    wget -c -O xinsir-controlnet-union-sdxl-1.0-promax.safetensors.incomplete \
         "https://huggingface.co/xinsir/controlnet-union-sdxl-1.0/resolve/main/diffusion_pytorch_model_promax.safetensors"
+    mv xinsir-controlnet-union-sdxl-1.0-promax.safetensors.incomplete xinsir-controlnet-union-sdxl-1.0-promax.safetensors
 fi
 if [ ! -f "control_v1p_sdxl_qrcode_monster.safetensors" ]; then
-    wget -O control_v1p_sdxl_qrcode_monster.safetensors \
+    wget -c -O control_v1p_sdxl_qrcode_monster.safetensors.incomplete \
         "https://huggingface.co/monster-labs/control_v1p_sdxl_qrcode_monster/resolve/main/diffusion_pytorch_model.safetensors"
+    mv control_v1p_sdxl_qrcode_monster.safetensors.incomplete control_v1p_sdxl_qrcode_monster.safetensors
 fi
 if [ ! -f "FLUX.1-dev-Controlnet-Inpainting-Beta.safetensors" ]; then
-    wget -O FLUX.1-dev-Controlnet-Inpainting-Beta.safetensors \
+    wget -c -O FLUX.1-dev-Controlnet-Inpainting-Beta.safetensors.incomplete \
         "https://huggingface.co/alimama-creative/FLUX.1-dev-Controlnet-Inpainting-Beta/resolve/main/diffusion_pytorch_model.safetensors"
+    mv FLUX.1-dev-Controlnet-Inpainting-Beta.safetensors.incomplete FLUX.1-dev-Controlnet-Inpainting-Beta.safetensors
 fi
 if [ ! -f "mistoline_flux.dev_v1.safetensors" ]; then
-    wget -O mistoline_flux.dev_v1.safetensors \
+    wget -c -O mistoline_flux.dev_v1.safetensors.incomplete \
         "https://huggingface.co/TheMistoAI/MistoLine_Flux.dev/resolve/main/mistoline_flux.dev_v1.safetensors"
+    mv mistoline_flux.dev_v1.safetensors.incomplete mistoline_flux.dev_v1.safetensors
 fi
 
 # IP-Adapter Models
 echo "⬇️  Downloading IP-Adapter models..."
 cd "$MODELS_DIR/ipadapter"
 if [ ! -f "ip-adapter_sd15.safetensors" ]; then
-    wget -O ip-adapter_sd15.safetensors \
+    wget -c -O ip-adapter_sd15.safetensors.incomplete \
         "https://huggingface.co/h94/IP-Adapter/resolve/main/models/ip-adapter_sd15.safetensors"
+    mv ip-adapter_sd15.safetensors.incomplete ip-adapter_sd15.safetensors
 fi
 if [ ! -f "ip-adapter_sdxl_vit-h.safetensors" ]; then
-    wget -O ip-adapter_sdxl_vit-h.safetensors \
+    wget -c -O ip-adapter_sdxl_vit-h.safetensors.incomplete \
         "https://huggingface.co/h94/IP-Adapter/resolve/main/sdxl_models/ip-adapter_sdxl_vit-h.safetensors"
+    mv ip-adapter_sdxl_vit-h.safetensors.incomplete ip-adapter_sdxl_vit-h.safetensors
 fi
 if [ ! -f "ip-adapter-faceid-plusv2_sd15.bin" ]; then
-    wget -O ip-adapter-faceid-plusv2_sd15.bin \
+    wget -c -O ip-adapter-faceid-plusv2_sd15.bin.incomplete \
         "https://huggingface.co/h94/IP-Adapter-FaceID/resolve/main/ip-adapter-faceid-plusv2_sd15.bin"
+    mv ip-adapter-faceid-plusv2_sd15.bin.incomplete ip-adapter-faceid-plusv2_sd15.bin
 fi
 if [ ! -f "ip-adapter-faceid-plusv2_sdxl.bin" ]; then
-    wget -O ip-adapter-faceid-plusv2_sdxl.bin \
+    wget -c -O ip-adapter-faceid-plusv2_sdxl.bin.incomplete \
         "https://huggingface.co/h94/IP-Adapter-FaceID/resolve/main/ip-adapter-faceid-plusv2_sdxl.bin"
+    mv ip-adapter-faceid-plusv2_sdxl.bin.incomplete ip-adapter-faceid-plusv2_sdxl.bin
 fi
 
 # LoRA Models
 echo "⬇️  Downloading LoRA models..."
 cd "$MODELS_DIR/loras"
 if [ ! -f "Hyper-SD15-8steps-CFG-lora.safetensors" ]; then
-    wget -O Hyper-SD15-8steps-CFG-lora.safetensors \
+    wget -c -O Hyper-SD15-8steps-CFG-lora.safetensors.incomplete \
         "https://huggingface.co/ByteDance/Hyper-SD/resolve/main/Hyper-SD15-8steps-CFG-lora.safetensors"
+    mv Hyper-SD15-8steps-CFG-lora.safetensors.incomplete Hyper-SD15-8steps-CFG-lora.safetensors
 fi
 if [ ! -f "Hyper-SDXL-8steps-CFG-lora.safetensors" ]; then
-    wget -O Hyper-SDXL-8steps-CFG-lora.safetensors \
+    wget -c -O Hyper-SDXL-8steps-CFG-lora.safetensors.incomplete \
         "https://huggingface.co/ByteDance/Hyper-SD/resolve/main/Hyper-SDXL-8steps-CFG-lora.safetensors"
+    mv Hyper-SDXL-8steps-CFG-lora.safetensors.incomplete Hyper-SDXL-8steps-CFG-lora.safetensors
 fi
 if [ ! -f "ip-adapter-faceid-plusv2_sd15_lora.safetensors" ]; then
-    wget -O ip-adapter-faceid-plusv2_sd15_lora.safetensors \
+    wget -c -O ip-adapter-faceid-plusv2_sd15_lora.safetensors.incomplete \
         "https://huggingface.co/h94/IP-Adapter-FaceID/resolve/main/ip-adapter-faceid-plusv2_sd15_lora.safetensors"
+    mv ip-adapter-faceid-plusv2_sd15_lora.safetensors.incomplete ip-adapter-faceid-plusv2_sd15_lora.safetensors
 fi
 if [ ! -f "ip-adapter-faceid-plusv2_sdxl_lora.safetensors" ]; then
-    wget -O ip-adapter-faceid-plusv2_sdxl_lora.safetensors \
+    wget -c -O ip-adapter-faceid-plusv2_sdxl_lora.safetensors.incomplete \
         "https://huggingface.co/h94/IP-Adapter-FaceID/resolve/main/ip-adapter-faceid-plusv2_sdxl_lora.safetensors"
+    mv ip-adapter-faceid-plusv2_sdxl_lora.safetensors.incomplete ip-adapter-faceid-plusv2_sdxl_lora.safetensors
 fi
 
 # Inpaint Models
 echo "⬇️  Downloading Inpaint models..."
 cd "$MODELS_DIR/inpaint"
 if [ ! -f "fooocus_inpaint_head.pth" ]; then
-    wget -O fooocus_inpaint_head.pth \
+    wget -c -O fooocus_inpaint_head.pth.incomplete \
         "https://huggingface.co/lllyasviel/fooocus_inpaint/resolve/main/fooocus_inpaint_head.pth"
+    mv fooocus_inpaint_head.pth.incomplete fooocus_inpaint_head.pth
 fi
 if [ ! -f "inpaint_v26.fooocus.patch" ]; then
-    wget -O inpaint_v26.fooocus.patch \
+    wget -c -O inpaint_v26.fooocus.patch.incomplete \
         "https://huggingface.co/lllyasviel/fooocus_inpaint/resolve/main/inpaint_v26.fooocus.patch"
+    mv inpaint_v26.fooocus.patch.incomplete inpaint_v26.fooocus.patch
 fi
 if [ ! -f "MAT_Places512_G_fp16.safetensors" ]; then
-    wget -O MAT_Places512_G_fp16.safetensors \
+    wget -c -O MAT_Places512_G_fp16.safetensors.incomplete \
         "https://huggingface.co/Acly/MAT/resolve/main/MAT_Places512_G_fp16.safetensors"
+    mv MAT_Places512_G_fp16.safetensors.incomplete MAT_Places512_G_fp16.safetensors
 fi
 
 # Style Models
 echo "⬇️  Downloading Style models..."
 cd "$MODELS_DIR/style_models"
 if [ ! -f "flux1-redux-dev.safetensors" ]; then
-    wget -O flux1-redux-dev.safetensors \
+    wget -c -O flux1-redux-dev.safetensors.incomplete \
         "https://files.interstice.cloud/models/flux1-redux-dev.safetensors"
+    mv flux1-redux-dev.safetensors.incomplete flux1-redux-dev.safetensors
 fi
 
 # Checkpoints
 echo "⬇️  Downloading Checkpoint models..."
 cd "$MODELS_DIR/checkpoints"
 if [ ! -f "serenity_v21Safetensors.safetensors" ]; then
-    wget -O serenity_v21Safetensors.safetensors \
+    wget -c -O serenity_v21Safetensors.safetensors.incomplete \
         "https://huggingface.co/Acly/SD-Checkpoints/resolve/main/serenity_v21Safetensors.safetensors"
+    mv serenity_v21Safetensors.safetensors.incomplete serenity_v21Safetensors.safetensors
 fi
 if [ ! -f "dreamshaper_8.safetensors" ]; then
-    wget -O dreamshaper_8.safetensors \
+    wget -c -O dreamshaper_8.safetensors.incomplete \
         "https://huggingface.co/Lykon/DreamShaper/resolve/main/DreamShaper_8_pruned.safetensors"
+    mv dreamshaper_8.safetensors.incomplete dreamshaper_8.safetensors
 fi
 if [ ! -f "flat2DAnimerge_v45Sharp.safetensors" ]; then
-    wget -O flat2DAnimerge_v45Sharp.safetensors \
+    wget -c -O flat2DAnimerge_v45Sharp.safetensors.incomplete \
         "https://huggingface.co/Acly/SD-Checkpoints/resolve/main/flat2DAnimerge_v45Sharp.safetensors"
+    mv flat2DAnimerge_v45Sharp.safetensors.incomplete flat2DAnimerge_v45Sharp.safetensors
 fi
 if [ ! -f "RealVisXL_V5.0_fp16.safetensors" ]; then
-    wget -O RealVisXL_V5.0_fp16.safetensors \
+    wget -c -O RealVisXL_V5.0_fp16.safetensors.incomplete \
         "https://huggingface.co/SG161222/RealVisXL_V5.0/resolve/main/RealVisXL_V5.0_fp16.safetensors"
+    mv RealVisXL_V5.0_fp16.safetensors.incomplete RealVisXL_V5.0_fp16.safetensors
 fi
 if [ ! -f "zavychromaxl_v80.safetensors" ]; then
-    wget -O zavychromaxl_v80.safetensors \
+    wget -c -O zavychromaxl_v80.safetensors.incomplete \
         "https://huggingface.co/misri/zavychromaxl_v80/resolve/main/zavychromaxl_v80.safetensors"
+    mv zavychromaxl_v80.safetensors.incomplete zavychromaxl_v80.safetensors
 fi
 if [ ! -f "flux1-dev-fp8.safetensors" ]; then
-    wget -O flux1-dev-fp8.safetensors \
+    wget -c -O flux1-dev-fp8.safetensors.incomplete \
         "https://huggingface.co/Comfy-Org/flux1-dev/resolve/main/flux1-dev-fp8.safetensors"
+    mv flux1-dev-fp8.safetensors.incomplete flux1-dev-fp8.safetensors
 fi
 if [ ! -f "flux1-schnell-fp8.safetensors" ]; then
-    wget -O flux1-schnell-fp8.safetensors \
+    wget -c -O flux1-schnell-fp8.safetensors.incomplete \
         "https://huggingface.co/Comfy-Org/flux1-schnell/resolve/main/flux1-schnell-fp8.safetensors"
+    mv flux1-schnell-fp8.safetensors.incomplete flux1-schnell-fp8.safetensors
 fi
 
 # Special case: Flux Universal ControlNet (goes in models root)
 echo "⬇️  Downloading Flux Universal ControlNet..."
 cd "$MODELS_DIR"
 if [ ! -f "FLUX.1-dev-ControlNet-Union-Pro-2.0-fp8.safetensors" ]; then
-    wget -O FLUX.1-dev-ControlNet-Union-Pro-2.0-fp8.safetensors \
+    wget -c -O FLUX.1-dev-ControlNet-Union-Pro-2.0-fp8.safetensors.incomplete \
         "https://huggingface.co/ABDALLALSWAITI/FLUX.1-dev-ControlNet-Union-Pro-2.0-fp8/resolve/main/diffusion_pytorch_model.safetensors"
+    mv FLUX.1-dev-ControlNet-Union-Pro-2.0-fp8.safetensors.incomplete FLUX.1-dev-ControlNet-Union-Pro-2.0-fp8.safetensors
 fi
 
 echo ""
@@ -3,9 +3,40 @@ set -e
 
 echo "Reinstalling SwarmUI"
 
+REPO_DIR="${REPO_DIR:-/workspace/runpod-ggs}"
+OLD_DIR="/workspace/SwarmUI.old-$(date +%Y%m%d-%H%M%S)"
+DATA_DIRS="Output Data"
+
 cd /workspace
-rm -rf SwarmUI
 
-bash /workspace/runpod-ggs/setup/swarm-ui/install_swarm_ui.sh
+# Retained backup of generated images and settings in /workspace/backup,
+# deduplicated against the previous one. The old install is moved aside so
+# the data can be moved over and it can be put back if the new install fails.
+if [ -d SwarmUI ]; then
+    python3 "$REPO_DIR/setup/backup.py" snapshot swarm-ui /workspace/SwarmUI $DATA_DIRS
+    mv SwarmUI "$OLD_DIR"
+fi
+
+restore_old() {
+    echo "Reinstall failed, restoring the previous SwarmUI"
+    rm -rf /workspace/SwarmUI
+    if [ -d "$OLD_DIR" ]; then
+        mv "$OLD_DIR" /workspace/SwarmUI
+    fi
+}
+trap restore_old ERR
+
+bash "$REPO_DIR/setup/swarm-ui/install_swarm_ui.sh"
+
+trap - ERR
+
+for dir in $DATA_DIRS; do
+    if [ -d "$OLD_DIR/$dir" ]; then
+        rm -rf "/workspace/SwarmUI/$dir"
+        mv "$OLD_DIR/$dir" "/workspace/SwarmUI/$dir"
+    fi
+done
+
+nohup rm -rf "$OLD_DIR" > /dev/null 2>&1 &
 
 echo "SwarmUI Reinstall complete"
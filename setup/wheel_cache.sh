@@ -0,0 +1,51 @@
+#!/bin/bash
+
+# Persistent wheel cache on the network volume, sourced by install/update
+# scripts. Wheels are kept in $WHEEL_CACHE_DIR/wheels, which also serves as
+# a local package index, so a reinstall reads packages from disk instead of
+# PyPI, the PyTorch index or Hugging Face. The server reports its size and
+# evicts the least recently used wheels when it grows past its limit.
+
+export WHEEL_CACHE_DIR="${WHEEL_CACHE_DIR:-/workspace/.wheel-cache}"
+WHEEL_DIR="$WHEEL_CACHE_DIR/wheels"
+mkdir -p "$WHEEL_DIR"
+
+export PIP_CACHE_DIR="$WHEEL_CACHE_DIR/pip"
+export UV_CACHE_DIR="$WHEEL_CACHE_DIR/uv"
+export PIP_FIND_LINKS="$WHEEL_DIR"
+export UV_FIND_LINKS="$WHEEL_DIR"
+
+# Mark wheels as recently used (the volume may not track access times)
+touch_wheels() {
+    sed -n -e 's/^Saved //p' -e 's/^File was already downloaded //p' "$1" \
+        | while read -r wheel; do touch "$wheel"; done
+}
+
+# pip install with every package fetched into the cache first. Accepts the
+# same arguments as pip install. When the index can't be reached, installs
+# from whatever the cache already holds; when the cache alone isn't enough
+# (e.g. an sdist needing build tools), falls back to a normal install.
+pip_install_cached() {
+    local log
+    log=$(mktemp)
+    pip download --dest "$WHEEL_DIR" --progress-bar off "$@" | tee "$log"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        touch_wheels "$log"
+    else
+        echo "Could not fetch everything into the wheel cache, using what it has"
+    fi
+    rm -f "$log"
+    pip install --no-index --find-links "$WHEEL_DIR" "$@" || pip install "$@"
+}
+
+# Download a wheel URL into the cache once and print its local path
+cached_wheel() {
+    local url="$1"
+    local wheel="$WHEEL_DIR/$(basename "${url%%\?*}")"
+    if [ ! -f "$wheel" ]; then
+        wget -q -c -O "$wheel.incomplete" "$url" || curl -L -f -s -C - -o "$wheel.incomplete" "$url" || return 1
+        mv "$wheel.incomplete" "$wheel"
+    fi
+    touch "$wheel"
+    echo "$wheel"
+}
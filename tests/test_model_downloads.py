@@ -0,0 +1,24 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "server"))
+
+import server  # noqa: E402
+
+KRITA_SCRIPT = os.path.join(
+    REPO_DIR, "setup", "download-models", "krita_ai_diffusion_installer.sh"
+)
+
+
+def test_pth_destinations_keep_their_extension():
+    dests = {
+        os.path.basename(d["dest"]) for d in server.parse_model_downloads(KRITA_SCRIPT)
+    }
+    for name in [
+        "4x_NMKD-Superscale-SP_178000_G.pth",
+        "HAT_SRx4_ImageNet-pretrain.pth",
+        "Real_HAT_GAN_sharper.pth",
+    ]:
+        assert name in dests
+    assert not any(name.endswith(".pt") for name in dests)